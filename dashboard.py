@@ -14,8 +14,96 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
+import hashlib
+import io
 import json
 import os
+import traceback
+import yaml
+from openai import OpenAI
+
+# Ask AI stock-context section labels and line templates
+_FMT_NEWS = "\nRecent News ({} articles):\n"
+_LBL_EARN = sys.intern("\nEarnings & Fundamentals:\n")
+_LBL_ANALYST = sys.intern("\nAnalyst Ratings:\n")
+_FMT_STOCK = "Stock: {}\n"
+_FMT_DATE = "Analysis Date: {}\n"
+_FMT_MOMENTUM = "12-Month Momentum: {:.2f}%\n"
+_FMT_VS_SPY = "Performance vs SPY: {:+.2f}%\n"
+_FMT_ARTICLE = "{}. {}\n"
+_FMT_EPS = "- Latest EPS: ${:.2f}\n"
+_FMT_EPS_GROWTH = "- YoY EPS Growth: {:+.1f}%\n"
+_FMT_MARGIN = "- Profit Margin: {:.1f}%\n"
+_FMT_CONSENSUS = "- Consensus: {}\n"
+_FMT_TARGET = "- Price Target: ${:.2f}\n"
+_FMT_UPSIDE = "- Upside Potential: {:+.1f}%\n"
+_FMT_SENTIMENT = "\nLLM Sentiment Score: {:.3f}\n"
+_FMT_ANALYSIS = "AI Analysis: {}\n"
+_FMT_RISK = "\nRisk Score: {:.2f}\n"
+_FMT_KEY_RISK = "Key Risk: {}\n"
+_FMT_RECOMMENDATION = "Recommendation: {}\n"
+
+
+@st.cache_data(ttl=3600, max_entries=32)
+def _load_portfolio_csv(path: str, mtime: float) -> pd.DataFrame:
+    """Parse a portfolio CSV once per (path, mtime); a rewritten file gets a new mtime."""
+    return pd.read_csv(path)
+
+
+@st.cache_data(ttl=3600, max_entries=32)
+def _load_uploaded_csv(data: bytes) -> pd.DataFrame:
+    """Parse an uploaded CSV once per distinct file content."""
+    return pd.read_csv(io.BytesIO(data))
+
+
+@st.cache_data(ttl=5)
+def _list_portfolios(dir_str: str, mtime: float) -> list:
+    """Names of the 10 most recent portfolio CSVs; rescanned only when the directory mtime changes."""
+    return [f.name for f in sorted(Path(dir_str).glob("*.csv"), reverse=True)[:10]]
+
+
+@st.cache_data(max_entries=16)
+def _build_orders_csv(sells: tuple, buys: tuple, holds: tuple, portfolio_records: tuple) -> bytes:
+    """Assemble the downloadable order list (sells, buys, then rebalances) as CSV bytes.
+
+    portfolio_records holds (symbol, position_value, weight) rows, so the
+    capital is part of the cache key through the position values.
+    """
+    pf_idx = pd.DataFrame(list(portfolio_records), columns=['symbol', 'position_value', 'weight']).drop_duplicates('symbol').set_index('symbol')
+    buy_rows = pf_idx.loc[list(buys)]
+    hold_rows = pf_idx.loc[list(holds)]
+
+    orders_df = pd.concat([
+        pd.DataFrame({
+            'step': [f'1.{i}' for i in range(1, len(sells) + 1)],
+            'action': 'SELL',
+            'symbol': list(sells),
+            'amount': 'ALL',
+            'notes': 'Sell 100% of position'
+        }),
+        pd.DataFrame({
+            'step': [f'2.{i}' for i in range(1, len(buys) + 1)],
+            'action': 'BUY',
+            'symbol': list(buys),
+            'amount': [f'${v:.2f}' for v in buy_rows['position_value']],
+            'notes': [f'{w * 100:.2f}% of portfolio' for w in buy_rows['weight']]
+        }),
+        pd.DataFrame({
+            'step': [f'3.{i}' for i in range(1, len(holds) + 1)],
+            'action': 'ADJUST',
+            'symbol': list(holds),
+            'amount': [f'${v:.2f}' for v in hold_rows['position_value']],
+            'notes': [f'Target: {w * 100:.2f}%' for w in hold_rows['weight']]
+        }),
+    ], ignore_index=True)
+    return orders_df.to_csv(index=False).encode()
+
+
+@st.cache_data(max_entries=16)
+def _portfolio_csv_bytes(portfolio_df: pd.DataFrame) -> bytes:
+    """Serialize a portfolio for download; cached on the DataFrame contents."""
+    return portfolio_df.to_csv(index=False).encode()
+
 
 # Page configuration
 st.set_page_config(
@@ -2056,10 +2144,6 @@ Recommendation: WAIT FOR MONTHLY REBALANCE ✅
         if portfolio_submit_button and portfolio_question.strip():
             with st.spinner("AI is analyzing your portfolio..."):
                 try:
-                    from openai import OpenAI
-                    import os
-                    import yaml
-
                     # Initialize OpenAI client
                     api_key = None
 
@@ -2226,7 +2310,6 @@ Provide thoughtful, balanced advice using these signals. Reference specific data
 
                 except Exception as e:
                     st.error(f"Error calling AI: {e}")
-                    import traceback
                     with st.expander("View error details"):
                         st.code(traceback.format_exc())
 
@@ -4072,59 +4155,59 @@ elif page == "🔍 Analyze Individual Stock":
                         context_key = f'ai_analysis_context_{ticker}'
                         if context_key not in st.session_state:
                             # Build context from current analysis
-                            context_parts = [
-                                f"Stock: {ticker}",
-                                f"Analysis Date: {datetime.now().strftime('%Y-%m-%d')}",
-                            ]
+                            buf = io.StringIO()
+                            w = buf.write
+                            w(_FMT_STOCK.format(ticker))
+                            w(_FMT_DATE.format(datetime.now().strftime('%Y-%m-%d')))
 
                             # Add momentum data
                             if momentum_return is not None:
-                                context_parts.append(f"12-Month Momentum: {momentum_return*100:.2f}%")
+                                w(_FMT_MOMENTUM.format(momentum_return * 100))
                             if momentum_return is not None and spy_momentum is not None:
                                 relative_perf = (momentum_return - spy_momentum) * 100
-                                context_parts.append(f"Performance vs SPY: {relative_perf:+.2f}%")
+                                w(_FMT_VS_SPY.format(relative_perf))
 
                             # Add news summary
                             if news_articles:
-                                context_parts.append(f"\nRecent News ({len(news_articles)} articles):")
+                                w(_FMT_NEWS.format(len(news_articles)))
                                 # Limit news context to first 5 articles
                                 for i, article in enumerate(news_articles[:5], 1):
                                     article_text = article[:150] + "..." if len(article) > 150 else article
-                                    context_parts.append(f"{i}. {article_text}")
+                                    w(_FMT_ARTICLE.format(i, article_text))
 
                             # Add earnings data
                             if earnings_data:
-                                context_parts.append("\nEarnings & Fundamentals:")
+                                w(_LBL_EARN)
                                 if earnings_data.get('latest_eps') is not None:
-                                    context_parts.append(f"- Latest EPS: ${earnings_data['latest_eps']:.2f}")
+                                    w(_FMT_EPS.format(earnings_data['latest_eps']))
                                 if earnings_data.get('yoy_eps_growth') is not None:
-                                    context_parts.append(f"- YoY EPS Growth: {earnings_data['yoy_eps_growth']*100:+.1f}%")
+                                    w(_FMT_EPS_GROWTH.format(earnings_data['yoy_eps_growth'] * 100))
                                 if earnings_data.get('profit_margin') is not None:
-                                    context_parts.append(f"- Profit Margin: {earnings_data['profit_margin']*100:.1f}%")
+                                    w(_FMT_MARGIN.format(earnings_data['profit_margin'] * 100))
 
                             # Add analyst data
                             if analyst_data:
-                                context_parts.append("\nAnalyst Ratings:")
+                                w(_LBL_ANALYST)
                                 if analyst_data.get('recommendation'):
-                                    context_parts.append(f"- Consensus: {analyst_data['recommendation']}")
+                                    w(_FMT_CONSENSUS.format(analyst_data['recommendation']))
                                 if analyst_data.get('target_mean_price'):
-                                    context_parts.append(f"- Price Target: ${analyst_data['target_mean_price']:.2f}")
+                                    w(_FMT_TARGET.format(analyst_data['target_mean_price']))
                                 if analyst_data.get('upside_potential') is not None:
-                                    context_parts.append(f"- Upside Potential: {analyst_data['upside_potential']*100:+.1f}%")
+                                    w(_FMT_UPSIDE.format(analyst_data['upside_potential'] * 100))
 
                             # Add LLM sentiment if available
                             if run_llm and normalized_score is not None:
-                                context_parts.append(f"\nLLM Sentiment Score: {normalized_score:.3f}")
+                                w(_FMT_SENTIMENT.format(normalized_score))
                                 if use_research_mode and analysis:
-                                    context_parts.append(f"AI Analysis: {analysis}")
+                                    w(_FMT_ANALYSIS.format(analysis))
 
                             # Add risk assessment if available
                             if run_risk and risk_score is not None:
-                                context_parts.append(f"\nRisk Score: {risk_score:.2f}")
-                                context_parts.append(f"Key Risk: {key_risk}")
-                                context_parts.append(f"Recommendation: {risk_result.get('recommendation', 'N/A')}")
+                                w(_FMT_RISK.format(risk_score))
+                                w(_FMT_KEY_RISK.format(key_risk))
+                                w(_FMT_RECOMMENDATION.format(risk_result.get('recommendation', 'N/A')))
 
-                            st.session_state[context_key] = "\n".join(context_parts)
+                            st.session_state[context_key] = buf.getvalue()
 
                         # Display conversation history
                         if st.session_state.ai_conversation_history:
@@ -4154,73 +4237,97 @@ elif page == "🔍 Analyze Individual Stock":
                             with col2:
                                 if st.form_submit_button("Clear History"):
                                     st.session_state.ai_conversation_history = []
+                                    st.session_state.pop('ai_llm_messages', None)
+                                    st.session_state.pop('ai_llm_context_hash', None)
                                     st.rerun()
 
                         # Process question when submitted
                         if submit_button and user_question.strip():
                             with st.spinner("AI is thinking..."):
                                 try:
-                                    from openai import OpenAI
-
-                                    # Initialize OpenAI client (same pattern as LLMScorer)
-                                    api_key = None
-
-                                    # Try Streamlit secrets first
-                                    try:
-                                        if hasattr(st, 'secrets') and 'openai' in st.secrets:
-                                            api_key = st.secrets['openai'].get('api_key')
-                                    except:
-                                        pass
-
-                                    # Try environment variable
-                                    if not api_key:
-                                        import os
-                                        api_key = os.getenv('OPENAI_API_KEY')
-
-                                    # Try config file
-                                    if not api_key:
-                                        import yaml
-                                        try:
-                                            with open('config/api_keys.yaml', 'r') as f:
-                                                config = yaml.safe_load(f)
-                                                api_key = config.get('openai', {}).get('api_key')
-                                        except:
-                                            pass
-
-                                    if not api_key:
-                                        st.error("OpenAI API key not found. Please configure it in Streamlit secrets, environment, or config file.")
-                                    else:
-                                        client = OpenAI(api_key=api_key)
-
-                                        # Build messages for API call
-                                        messages = [
-                                            {
-                                                "role": "system",
-                                                "content": f"""You are a helpful financial advisor assistant. You have access to the following analysis data for {ticker}:
+                                    # Re-asking the same question against the same context
+                                    # (e.g. a re-submitted form) reuses the previous answer
+                                    ctx_hash = hashlib.blake2b(st.session_state[context_key].encode(), digest_size=16).hexdigest()
+                                    answer_key = (ctx_hash, user_question.strip(), model)
+                                    answer_cache = st.session_state.setdefault('ai_answer_cache', {})
+                                    ai_response = answer_cache.get(answer_key)
+
+                                    # Persistent, append-only message list: only the system
+                                    # prompt is refreshed, and only when the analysis context changes
+                                    llm_messages = st.session_state.setdefault('ai_llm_messages', [{"role": "system", "content": ""}])
+                                    if st.session_state.get('ai_llm_context_hash') != ctx_hash or not llm_messages[0]['content']:
+                                        llm_messages[0]['content'] = f"""You are a helpful financial advisor assistant. You have access to the following analysis data for {ticker}:
 
 {st.session_state[context_key]}
 
 Use this information to answer the user's questions. Provide thoughtful, balanced advice considering both opportunities and risks. When discussing buy/hold/sell decisions, always remind the user to consider their own risk tolerance, investment timeline, and financial situation."""
-                                            }
-                                        ]
-
-                                        # Add conversation history
-                                        for msg in st.session_state.ai_conversation_history:
-                                            messages.append({"role": msg["role"], "content": msg["content"]})
-
-                                        # Add current question
-                                        messages.append({"role": "user", "content": user_question})
-
-                                        # Call OpenAI API
-                                        response = client.chat.completions.create(
-                                            model=model if model else "gpt-4o-mini",
-                                            messages=messages,
-                                            temperature=0.7,
-                                            max_tokens=1000
-                                        )
+                                        st.session_state.ai_llm_context_hash = ctx_hash
+
+                                    if ai_response is not None:
+                                        llm_messages.append({"role": "user", "content": user_question})
+                                        llm_messages.append({"role": "assistant", "content": ai_response})
+                                    else:
+                                        # Initialize OpenAI client (same pattern as LLMScorer)
+                                        api_key = None
 
-                                        ai_response = response.choices[0].message.content
+                                        # Try Streamlit secrets first
+                                        try:
+                                            if hasattr(st, 'secrets') and 'openai' in st.secrets:
+                                                api_key = st.secrets['openai'].get('api_key')
+                                        except:
+                                            pass
 
+                                        # Try environment variable
+                                        if not api_key:
+                                            api_key = os.getenv('OPENAI_API_KEY')
+
+                                        # Try config file
+                                        if not api_key:
+                                            try:
+                                                with open('config/api_keys.yaml', 'r') as f:
+                                                    config = yaml.safe_load(f)
+                                                    api_key = config.get('openai', {}).get('api_key')
+                                            except:
+                                                pass
+
+                                        if not api_key:
+                                            st.error("OpenAI API key not found. Please configure it in Streamlit secrets, environment, or config file.")
+                                        else:
+                                            client = OpenAI(api_key=api_key)
+
+                                            # Add current question
+                                            llm_messages.append({"role": "user", "content": user_question})
+
+                                            # Call OpenAI API (streamed; deltas are accumulated once)
+                                            chunks = []
+                                            append_chunk = chunks.append
+                                            try:
+                                                stream = client.chat.completions.create(
+                                                    model=model if model else "gpt-4o-mini",
+                                                    messages=llm_messages,
+                                                    temperature=0.7,
+                                                    max_tokens=1000,
+                                                    stream=True
+                                                )
+                                                for chunk in stream:
+                                                    if chunk.choices:
+                                                        delta = chunk.choices[0].delta.content
+                                                        if delta:
+                                                            append_chunk(delta)
+                                            except Exception:
+                                                # Keep the message list consistent with the displayed history
+                                                llm_messages.pop()
+                                                raise
+
+                                            ai_response = "".join(chunks)
+                                            llm_messages.append({"role": "assistant", "content": ai_response})
+
+                                            # Bounded cache: drop the oldest answer once full
+                                            if len(answer_cache) >= 128:
+                                                answer_cache.pop(next(iter(answer_cache)))
+                                            answer_cache[answer_key] = ai_response
+
+                                    if ai_response is not None:
                                         # Update conversation history
                                         st.session_state.ai_conversation_history.append({
                                             "role": "user",
@@ -4237,7 +4344,6 @@ Use this information to answer the user's questions. Provide thoughtful, balance
 
                                 except Exception as e:
                                     st.error(f"Error calling AI: {e}")
-                                    import traceback
                                     with st.expander("View error details"):
                                         st.code(traceback.format_exc())
 
@@ -4292,176 +4398,179 @@ elif page == "🎯 Robinhood Orders":
     # Input section
     st.subheader("📋 Order Generation Settings")
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**1️⃣ Select Portfolio**")
-
-        # Get list of generated portfolios
-        portfolio_dir = Path("results/portfolios")
-        if portfolio_dir.exists():
-            portfolio_files = sorted(portfolio_dir.glob("*.csv"), reverse=True)
+    # Batch the inputs in a form so editing them doesn't rerun the page
+    with st.form("gen_orders"):
+        col1, col2 = st.columns(2)
 
-            if portfolio_files:
-                # Use session state portfolio if available
-                if 'portfolio_df' in st.session_state and st.session_state.portfolio_df is not None:
-                    st.info("✅ Using portfolio from 'Generate Portfolio' tab")
-                    selected_portfolio = "current_session"
+        with col1:
+            st.markdown("**1️⃣ Select Portfolio**")
+
+            # Get list of generated portfolios
+            portfolio_dir = Path("results/portfolios")
+            if portfolio_dir.exists():
+                portfolio_options = _list_portfolios(str(portfolio_dir), portfolio_dir.stat().st_mtime)
+
+                if portfolio_options:
+                    # Use session state portfolio if available
+                    if 'portfolio_df' in st.session_state and st.session_state.portfolio_df is not None:
+                        st.info("✅ Using portfolio from 'Generate Portfolio' tab")
+                        selected_portfolio = "current_session"
+                    else:
+                        # Show dropdown of saved portfolios (last 10)
+                        selected_file = st.selectbox(
+                            "Choose portfolio file:",
+                            options=portfolio_options,
+                            help="Select a portfolio CSV generated from 'Generate Portfolio' tab"
+                        )
+                        selected_portfolio = portfolio_dir / selected_file
                 else:
-                    # Show dropdown of saved portfolios
-                    portfolio_options = [f.name for f in portfolio_files[:10]]  # Show last 10
-                    selected_file = st.selectbox(
-                        "Choose portfolio file:",
-                        options=portfolio_options,
-                        help="Select a portfolio CSV generated from 'Generate Portfolio' tab"
-                    )
-                    selected_portfolio = portfolio_dir / selected_file
+                    st.warning("⚠️ No portfolios found. Generate one in 'Generate Portfolio' tab first.")
+                    selected_portfolio = None
             else:
                 st.warning("⚠️ No portfolios found. Generate one in 'Generate Portfolio' tab first.")
                 selected_portfolio = None
-        else:
-            st.warning("⚠️ No portfolios found. Generate one in 'Generate Portfolio' tab first.")
-            selected_portfolio = None
 
-        st.markdown("**2️⃣ Enter Capital**")
+            st.markdown("**2️⃣ Enter Capital**")
 
-        # Auto-populate from Robinhood if available
-        default_capital = 10000.0
-        if 'rh_fetcher' in st.session_state and st.session_state.rh_fetcher.logged_in:
-            try:
-                rh_total_value = st.session_state.rh_fetcher.get_portfolio_value()
-                default_capital = rh_total_value
-                st.info(f"✨ Auto-filled from Robinhood: ${rh_total_value:,.2f}")
-            except:
-                pass
+            # Auto-populate from Robinhood if available
+            default_capital = 10000.0
+            if 'rh_fetcher' in st.session_state and st.session_state.rh_fetcher.logged_in:
+                try:
+                    rh_total_value = st.session_state.rh_fetcher.get_portfolio_value()
+                    default_capital = rh_total_value
+                    st.info(f"✨ Auto-filled from Robinhood: ${rh_total_value:,.2f}")
+                except:
+                    pass
 
-        capital = st.number_input(
-            "Total Portfolio Value ($)",
-            min_value=100.0,
-            max_value=10000000.0,
-            value=default_capital,
-            step=100.0,
-            help="Your current Robinhood account balance (+ any new deposits)"
-        )
+            capital = st.number_input(
+                "Total Portfolio Value ($)",
+                min_value=100.0,
+                max_value=10000000.0,
+                value=default_capital,
+                step=100.0,
+                help="Your current Robinhood account balance (+ any new deposits)"
+            )
 
-        st.markdown("💡 **How to determine capital**:")
-        st.markdown("""
-        - **Month 1**: Your initial investment (e.g., $10,000)
-        - **Month 2+**: Current Robinhood balance (check app)
-        - **Adding money**: Current balance + new deposit
-        """)
+            st.markdown("💡 **How to determine capital**:")
+            st.markdown("""
+            - **Month 1**: Your initial investment (e.g., $10,000)
+            - **Month 2+**: Current Robinhood balance (check app)
+            - **Adding money**: Current balance + new deposit
+            """)
 
-    with col2:
-        st.markdown("**3️⃣ Get Current Holdings (Optional)**")
-        st.markdown("*Skip this for Month 1 (initial investment)*")
-
-        # Robinhood API integration is disabled (not implemented)
-        # Use the manual CSV export feature in "Generate Portfolio" page instead
-        if 'rh_holdings' not in st.session_state:
-            st.session_state.rh_holdings = None
-
-        holdings_method = st.radio(
-            "Choose method:",
-            ["📁 Upload CSV (Manual)"],  # API option removed - use export feature in Generate Portfolio page
-            help="Upload your current holdings CSV exported from Robinhood"
-        )
+        with col2:
+            st.markdown("**3️⃣ Get Current Holdings (Optional)**")
+            st.markdown("*Skip this for Month 1 (initial investment)*")
+
+            # Robinhood API integration is disabled (not implemented)
+            # Use the manual CSV export feature in "Generate Portfolio" page instead
+            if 'rh_holdings' not in st.session_state:
+                st.session_state.rh_holdings = None
+
+            holdings_method = st.radio(
+                "Choose method:",
+                ["📁 Upload CSV (Manual)"],  # API option removed - use export feature in Generate Portfolio page
+                help="Upload your current holdings CSV exported from Robinhood"
+            )
 
-        if holdings_method == "🔗 Connect to Robinhood API (Automatic)" and False:  # DISABLED
-            # Robinhood API login
-            if not st.session_state.rh_fetcher.logged_in:
-                st.markdown("**Robinhood Login**")
+            if holdings_method == "🔗 Connect to Robinhood API (Automatic)" and False:  # DISABLED
+                # Robinhood API login
+                if not st.session_state.rh_fetcher.logged_in:
+                    st.markdown("**Robinhood Login**")
 
-                with st.form("rh_login_form"):
-                    rh_username = st.text_input("Email/Username", type="default")
-                    rh_password = st.text_input("Password", type="password")
-                    rh_mfa = st.text_input("2FA Code (if enabled)", help="6-digit code from authenticator app")
+                    with st.form("rh_login_form"):
+                        rh_username = st.text_input("Email/Username", type="default")
+                        rh_password = st.text_input("Password", type="password")
+                        rh_mfa = st.text_input("2FA Code (if enabled)", help="6-digit code from authenticator app")
 
-                    submit = st.form_submit_button("🔐 Connect to Robinhood")
+                        submit = st.form_submit_button("🔐 Connect to Robinhood")
 
-                    if submit:
-                        if not rh_username or not rh_password:
-                            st.error("Please enter username and password")
-                        else:
-                            with st.spinner("Connecting to Robinhood..."):
-                                success, message = st.session_state.rh_fetcher.login(
-                                    rh_username,
-                                    rh_password,
-                                    rh_mfa if rh_mfa else None
-                                )
+                        if submit:
+                            if not rh_username or not rh_password:
+                                st.error("Please enter username and password")
+                            else:
+                                with st.spinner("Connecting to Robinhood..."):
+                                    success, message = st.session_state.rh_fetcher.login(
+                                        rh_username,
+                                        rh_password,
+                                        rh_mfa if rh_mfa else None
+                                    )
 
-                                if success:
-                                    st.success(message)
-                                    st.rerun()
-                                else:
-                                    st.error(message)
+                                    if success:
+                                        st.success(message)
+                                        st.rerun()
+                                    else:
+                                        st.error(message)
 
-                st.info("🔒 **Security**: Credentials are not saved. Connection is read-only (no trades executed).")
-            else:
-                st.success(f"✅ Connected to Robinhood as {st.session_state.rh_fetcher.username}")
+                    st.info("🔒 **Security**: Credentials are not saved. Connection is read-only (no trades executed).")
+                else:
+                    st.success(f"✅ Connected to Robinhood as {st.session_state.rh_fetcher.username}")
 
-                col_a, col_b = st.columns(2)
+                    col_a, col_b = st.columns(2)
 
-                with col_a:
-                    if st.button("📥 Fetch Current Holdings"):
-                        with st.spinner("Fetching positions from Robinhood..."):
-                            try:
-                                holdings_df = st.session_state.rh_fetcher.get_current_positions()
-                                st.session_state.rh_holdings = holdings_df
+                    with col_a:
+                        if st.button("📥 Fetch Current Holdings"):
+                            with st.spinner("Fetching positions from Robinhood..."):
+                                try:
+                                    holdings_df = st.session_state.rh_fetcher.get_current_positions()
+                                    st.session_state.rh_holdings = holdings_df
 
-                                total_value = st.session_state.rh_fetcher.get_portfolio_value()
-                                st.success(f"✅ Fetched {len(holdings_df)} positions (${total_value:,.2f} total)")
+                                    total_value = st.session_state.rh_fetcher.get_portfolio_value()
+                                    st.success(f"✅ Fetched {len(holdings_df)} positions (${total_value:,.2f} total)")
 
-                            except Exception as e:
-                                st.error(f"Error fetching holdings: {e}")
-
-                with col_b:
-                    if st.button("🚪 Disconnect"):
-                        st.session_state.rh_fetcher.logout()
-                        st.session_state.rh_holdings = None
-                        st.rerun()
-
-                # Show fetched holdings
-                if st.session_state.rh_holdings is not None and not st.session_state.rh_holdings.empty:
-                    with st.expander("👀 View Current Holdings", expanded=False):
-                        display_df = st.session_state.rh_holdings[['symbol', 'shares', 'current_price', 'market_value', 'weight']].copy()
-                        display_df['weight'] = display_df['weight'].apply(lambda x: f"{x*100:.2f}%")
-                        display_df['market_value'] = display_df['market_value'].apply(lambda x: f"${x:,.2f}")
-                        display_df['current_price'] = display_df['current_price'].apply(lambda x: f"${x:.2f}")
-                        st.dataframe(display_df, use_container_width=True, hide_index=True)
-
-            # Set holdings for processing
-            current_holdings_df = st.session_state.rh_holdings if st.session_state.rh_holdings is not None else None
-            current_holdings_file = None  # Not using file for API method
-
-        else:  # Manual CSV upload
-            uploaded_file = st.file_uploader(
-                "Upload CSV with current holdings",
-                type=['csv'],
-                help="Upload your portfolio from last month to see only the changes"
-            )
+                                except Exception as e:
+                                    st.error(f"Error fetching holdings: {e}")
+
+                    with col_b:
+                        if st.button("🚪 Disconnect"):
+                            st.session_state.rh_fetcher.logout()
+                            st.session_state.rh_holdings = None
+                            st.rerun()
+
+                    # Show fetched holdings
+                    if st.session_state.rh_holdings is not None and not st.session_state.rh_holdings.empty:
+                        with st.expander("👀 View Current Holdings", expanded=False):
+                            display_df = st.session_state.rh_holdings[['symbol', 'shares', 'current_price', 'market_value', 'weight']].copy()
+                            display_df['weight'] = display_df['weight'] * 100
+                            # Formatting happens in the frontend instead of per-cell Python lambdas
+                            st.dataframe(
+                                display_df,
+                                column_config={
+                                    'weight': st.column_config.NumberColumn(format='%.2f%%'),
+                                    'market_value': st.column_config.NumberColumn(format='$%.2f'),
+                                    'current_price': st.column_config.NumberColumn(format='$%.2f')
+                                },
+                                use_container_width=True,
+                                hide_index=True
+                            )
 
-            if uploaded_file is not None:
-                try:
-                    current_holdings_df = pd.read_csv(uploaded_file)
-                    st.success(f"✅ Loaded {len(current_holdings_df)} current positions")
+                # Set holdings for processing
+                current_holdings_df = st.session_state.rh_holdings if st.session_state.rh_holdings is not None else None
 
-                    # Save to temp file
-                    temp_holdings_path = Path("temp_current_holdings.csv")
-                    current_holdings_df.to_csv(temp_holdings_path, index=False)
-                    current_holdings_file = str(temp_holdings_path)
-                except Exception as e:
-                    st.error(f"Error loading file: {e}")
+            else:  # Manual CSV upload
+                uploaded_file = st.file_uploader(
+                    "Upload CSV with current holdings",
+                    type=['csv'],
+                    help="Upload your portfolio from last month to see only the changes"
+                )
+
+                if uploaded_file is not None:
+                    try:
+                        current_holdings_df = _load_uploaded_csv(uploaded_file.getvalue())
+                        st.success(f"✅ Loaded {len(current_holdings_df)} current positions")
+                    except Exception as e:
+                        st.error(f"Error loading file: {e}")
+                        current_holdings_df = None
+                else:
                     current_holdings_df = None
-                    current_holdings_file = None
-            else:
-                current_holdings_df = None
-                current_holdings_file = None
-                st.info("ℹ️ No current holdings uploaded - will show all positions as new buys")
+                    st.info("ℹ️ No current holdings uploaded - will show all positions as new buys")
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # Generate button
-    if st.button("🎯 Generate Robinhood Order List", type="primary", use_container_width=True):
+        # Generate button
+        submitted = st.form_submit_button("🎯 Generate Robinhood Order List", type="primary", use_container_width=True)
+
+    if submitted:
         if selected_portfolio is None:
             st.error("❌ Please generate a portfolio first in 'Generate Portfolio' tab")
         else:
@@ -4469,39 +4578,29 @@ elif page == "🎯 Robinhood Orders":
                 try:
                     # Load portfolio
                     if selected_portfolio == "current_session":
+                        # Already in memory - no need to round-trip through a file
                         portfolio_df = st.session_state.portfolio_df
-                        # Save to temp file for processing
-                        temp_portfolio_path = Path("temp_generated_portfolio.csv")
-                        portfolio_df.to_csv(temp_portfolio_path, index=False)
-                        portfolio_file = str(temp_portfolio_path)
                     else:
-                        portfolio_file = str(selected_portfolio)
-                        portfolio_df = pd.read_csv(portfolio_file)
+                        portfolio_df = _load_portfolio_csv(str(selected_portfolio), selected_portfolio.stat().st_mtime)
 
                     # Calculate position values
-                    portfolio_df['position_value'] = portfolio_df['weight'] * capital
-                    portfolio_df['position_value'] = portfolio_df['position_value'].round(2)
+                    portfolio_df['position_value'] = np.round(portfolio_df['weight'].to_numpy() * capital, 2)
 
                     # Load current holdings if provided
                     if current_holdings_df is not None and not current_holdings_df.empty:
                         # Use DataFrame directly (from Robinhood API or CSV)
-                        current_symbols = set(current_holdings_df['symbol'].values)
+                        current_symbols = np.unique(current_holdings_df['symbol'].to_numpy(dtype=str))
                         current_holdings_for_display = current_holdings_df
-                    elif current_holdings_file:
-                        # Fallback to file path
-                        current_df = pd.read_csv(current_holdings_file)
-                        current_symbols = set(current_df['symbol'].values)
-                        current_holdings_for_display = current_df
                     else:
-                        current_symbols = set()
+                        current_symbols = np.array([], dtype=str)
                         current_holdings_for_display = None
 
-                    new_symbols = set(portfolio_df['symbol'].values)
+                    new_symbols = np.unique(portfolio_df['symbol'].to_numpy(dtype=str))
 
-                    # Categorize trades
-                    sells = current_symbols - new_symbols
-                    buys = new_symbols - current_symbols
-                    holds = current_symbols & new_symbols
+                    # Categorize trades (sorted unique arrays in, sorted arrays out)
+                    sells = np.setdiff1d(current_symbols, new_symbols, assume_unique=True)
+                    buys = np.setdiff1d(new_symbols, current_symbols, assume_unique=True)
+                    holds = np.intersect1d(current_symbols, new_symbols, assume_unique=True)
 
                     # Store in session state
                     st.session_state.order_data = {
@@ -4510,6 +4609,10 @@ elif page == "🎯 Robinhood Orders":
                         'sells': sells,
                         'buys': buys,
                         'holds': holds,
+                        # setdiff1d/intersect1d already return sorted arrays
+                        'sells_sorted': sells.tolist(),
+                        'buys_sorted': buys.tolist(),
+                        'holds_sorted': holds.tolist(),
                         'current_symbols': current_symbols,
                         'current_holdings': current_holdings_for_display
                     }
@@ -4521,9 +4624,10 @@ elif page == "🎯 Robinhood Orders":
                     import traceback
                     st.code(traceback.format_exc())
 
-    # Display results
-    if 'order_data' in st.session_state:
-        data = st.session_state.order_data
+    # Display results. As a fragment, interactions inside it (e.g. the download
+    # buttons) rerun only this block instead of the whole page.
+    @st.fragment
+    def _render_orders(data):
         portfolio_df = data['portfolio_df']
         capital = data['capital']
         sells = data['sells']
@@ -4531,6 +4635,14 @@ elif page == "🎯 Robinhood Orders":
         holds = data['holds']
         current_symbols = data['current_symbols']
 
+        # Symbol-indexed views for column-wise table construction (first row wins, as with .iloc[0])
+        pf_idx = portfolio_df.drop_duplicates('symbol').set_index('symbol')
+        sells_sorted = data['sells_sorted']
+        buys_sorted = data['buys_sorted']
+        holds_sorted = data['holds_sorted']
+        buy_rows = pf_idx.loc[buys_sorted]
+        hold_rows = pf_idx.loc[holds_sorted]
+
         st.markdown("---")
         st.subheader("📋 STEP-BY-STEP ROBINHOOD ORDERS")
 
@@ -4543,25 +4655,23 @@ elif page == "🎯 Robinhood Orders":
         with col3:
             st.metric("Buys", len(buys))
         with col4:
-            turnover = (len(sells) + len(buys)) / max(len(current_symbols), 1) if current_symbols else 1.0
+            turnover = (len(sells) + len(buys)) / max(len(current_symbols), 1) if len(current_symbols) else 1.0
             st.metric("Turnover", f"{turnover*100:.1f}%")
 
         st.markdown("---")
 
         # STEP 1: SELLS
         st.markdown("### STEP 1: SELL ORDERS (Exit Positions)")
-        if sells:
+        if len(sells):
             st.markdown(f"*Sell these {len(sells)} positions completely*")
-            sell_data = []
-            for i, symbol in enumerate(sorted(sells), 1):
-                sell_data.append({
-                    'Step': f'1.{i}',
-                    'Action': 'SELL',
-                    'Symbol': symbol,
-                    'Amount': 'ALL',
-                    'Instructions': 'Sell 100% of position'
-                })
-            st.dataframe(pd.DataFrame(sell_data), use_container_width=True, hide_index=True)
+            sell_df = pd.DataFrame({
+                'Step': [f'1.{i}' for i in range(1, len(sells_sorted) + 1)],
+                'Action': 'SELL',
+                'Symbol': sells_sorted,
+                'Amount': 'ALL',
+                'Instructions': 'Sell 100% of position'
+            })
+            st.dataframe(sell_df, use_container_width=True, hide_index=True)
         else:
             st.info("✅ No sells needed")
 
@@ -4569,22 +4679,18 @@ elif page == "🎯 Robinhood Orders":
 
         # STEP 2: BUYS
         st.markdown("### STEP 2: BUY NEW POSITIONS")
-        if buys:
+        if len(buys):
             st.markdown(f"*Buy these {len(buys)} new stocks*")
-            buy_data = []
-            for i, symbol in enumerate(sorted(buys), 1):
-                row = portfolio_df[portfolio_df['symbol'] == symbol].iloc[0]
-                amount = row['position_value']
-                weight = row['weight'] * 100
-                buy_data.append({
-                    'Step': f'2.{i}',
-                    'Action': 'BUY',
-                    'Symbol': symbol,
-                    'Amount': f'${amount:.2f}',
-                    'Weight': f'{weight:.2f}%',
-                    'Instructions': f'Buy ${amount:.2f} worth (use "Dollars" not "Shares")'
-                })
-            st.dataframe(pd.DataFrame(buy_data), use_container_width=True, hide_index=True)
+            buy_amounts = [f'${v:.2f}' for v in buy_rows['position_value']]
+            buy_df = pd.DataFrame({
+                'Step': [f'2.{i}' for i in range(1, len(buys_sorted) + 1)],
+                'Action': 'BUY',
+                'Symbol': buys_sorted,
+                'Amount': buy_amounts,
+                'Weight': [f'{w * 100:.2f}%' for w in buy_rows['weight']],
+                'Instructions': [f'Buy {a} worth (use "Dollars" not "Shares")' for a in buy_amounts]
+            })
+            st.dataframe(buy_df, use_container_width=True, hide_index=True)
         else:
             st.info("✅ No new buys needed")
 
@@ -4592,7 +4698,7 @@ elif page == "🎯 Robinhood Orders":
 
         # STEP 3: REBALANCE (Optional)
         st.markdown("### STEP 3: REBALANCE EXISTING POSITIONS (Optional)")
-        if holds:
+        if len(holds):
             st.markdown(f"*Adjust these {len(holds)} positions if weights drifted significantly (>2%)*")
             st.markdown("💡 **Tip**: You can skip this step if you're okay with slight weight differences")
 
@@ -4600,44 +4706,37 @@ elif page == "🎯 Robinhood Orders":
             current_holdings = data.get('current_holdings')
             has_current_data = current_holdings is not None and not current_holdings.empty
 
-            rebalance_data = []
-            for i, symbol in enumerate(sorted(holds), 1):
-                row = portfolio_df[portfolio_df['symbol'] == symbol].iloc[0]
-                target_value = row['position_value']
-                target_weight = row['weight'] * 100
-
-                rebal_row = {
-                    'Step': f'3.{i}',
-                    'Symbol': symbol,
-                    'Target Value': f'${target_value:.2f}',
-                    'Target Weight': f'{target_weight:.2f}%'
-                }
-
-                # Add current values if available
-                if has_current_data and symbol in current_holdings['symbol'].values:
-                    current_row = current_holdings[current_holdings['symbol'] == symbol].iloc[0]
-                    current_value = current_row.get('market_value', 0)
-                    current_weight = current_row.get('weight', 0) * 100
-                    diff_value = target_value - current_value
-
-                    rebal_row['Current Value'] = f'${current_value:.2f}'
-                    rebal_row['Current Weight'] = f'{current_weight:.2f}%'
-                    rebal_row['Difference'] = f'${diff_value:+.2f}'
-
-                    # Only show action if difference > $50 or weight diff > 2%
-                    if abs(diff_value) > 50 or abs(target_weight - current_weight) > 2:
-                        if diff_value > 0:
-                            rebal_row['Action'] = f'BUY ${abs(diff_value):.2f}'
-                        else:
-                            rebal_row['Action'] = f'SELL ${abs(diff_value):.2f}'
-                    else:
-                        rebal_row['Action'] = 'HOLD (close enough)'
-                else:
-                    rebal_row['Instructions'] = 'Check current value, buy/sell to reach target'
+            target_values = hold_rows['position_value'].to_numpy()
+            target_weights = hold_rows['weight'].to_numpy() * 100
+            rebalance_df = pd.DataFrame({
+                'Step': [f'3.{i}' for i in range(1, len(holds_sorted) + 1)],
+                'Symbol': holds_sorted,
+                'Target Value': [f'${v:.2f}' for v in target_values],
+                'Target Weight': [f'{w:.2f}%' for w in target_weights]
+            })
 
-                rebalance_data.append(rebal_row)
+            if has_current_data:
+                # Holds are a subset of the current holdings, so every row has current values
+                current_rows = current_holdings.drop_duplicates('symbol').set_index('symbol').reindex(holds_sorted)
+                n_holds = len(holds_sorted)
+                current_values = current_rows['market_value'].to_numpy(dtype=float) if 'market_value' in current_rows else np.zeros(n_holds)
+                current_weights = current_rows['weight'].to_numpy(dtype=float) * 100 if 'weight' in current_rows else np.zeros(n_holds)
+                diff_values = target_values - current_values
+
+                # Only show action if difference > $50 or weight diff > 2%
+                needs_trade = (np.abs(diff_values) > 50) | (np.abs(target_weights - current_weights) > 2)
+
+                rebalance_df['Current Value'] = [f'${v:.2f}' for v in current_values]
+                rebalance_df['Current Weight'] = [f'{w:.2f}%' for w in current_weights]
+                rebalance_df['Difference'] = [f'${d:+.2f}' for d in diff_values]
+                rebalance_df['Action'] = [
+                    (f'BUY ${abs(d):.2f}' if d > 0 else f'SELL ${abs(d):.2f}') if trade else 'HOLD (close enough)'
+                    for d, trade in zip(diff_values, needs_trade)
+                ]
+            else:
+                rebalance_df['Instructions'] = 'Check current value, buy/sell to reach target'
 
-            st.dataframe(pd.DataFrame(rebalance_data), use_container_width=True, hide_index=True)
+            st.dataframe(rebalance_df, use_container_width=True, hide_index=True)
 
             if has_current_data:
                 st.success("✨ **Live data from Robinhood**: Showing exact current vs target values!")
@@ -4680,47 +4779,13 @@ elif page == "🎯 Robinhood Orders":
         st.markdown("---")
         st.markdown("### 💾 Download Order List")
 
-        # Create downloadable CSV
-        all_orders = []
-
-        # Add sells
-        for i, symbol in enumerate(sorted(sells), 1):
-            all_orders.append({
-                'step': f'1.{i}',
-                'action': 'SELL',
-                'symbol': symbol,
-                'amount': 'ALL',
-                'notes': 'Sell 100% of position'
-            })
-
-        # Add buys
-        for i, symbol in enumerate(sorted(buys), 1):
-            row = portfolio_df[portfolio_df['symbol'] == symbol].iloc[0]
-            amount = row['position_value']
-            weight = row['weight'] * 100
-            all_orders.append({
-                'step': f'2.{i}',
-                'action': 'BUY',
-                'symbol': symbol,
-                'amount': f'${amount:.2f}',
-                'notes': f'{weight:.2f}% of portfolio'
-            })
-
-        # Add rebalances
-        for i, symbol in enumerate(sorted(holds), 1):
-            row = portfolio_df[portfolio_df['symbol'] == symbol].iloc[0]
-            amount = row['position_value']
-            weight = row['weight'] * 100
-            all_orders.append({
-                'step': f'3.{i}',
-                'action': 'ADJUST',
-                'symbol': symbol,
-                'amount': f'${amount:.2f}',
-                'notes': f'Target: {weight:.2f}%'
-            })
-
-        orders_df = pd.DataFrame(all_orders)
-        csv = orders_df.to_csv(index=False)
+        # Create downloadable CSV (serialized once per distinct order signature)
+        csv = _build_orders_csv(
+            tuple(sells_sorted),
+            tuple(buys_sorted),
+            tuple(holds_sorted),
+            tuple(portfolio_df[['symbol', 'position_value', 'weight']].itertuples(index=False, name=None))
+        )
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -4739,7 +4804,7 @@ elif page == "🎯 Robinhood Orders":
         st.markdown("### 💾 Save for Next Month")
         st.markdown("After executing these trades, **save this portfolio** to use as 'Current Holdings' next month:")
 
-        portfolio_csv = portfolio_df.to_csv(index=False)
+        portfolio_csv = _portfolio_csv_bytes(portfolio_df)
         st.download_button(
             label="📥 Download Current Portfolio (for next month's comparison)",
             data=portfolio_csv,
@@ -4747,6 +4812,10 @@ elif page == "🎯 Robinhood Orders":
             mime="text/csv",
             use_container_width=True
         )
+
+    if 'order_data' in st.session_state:
+        _render_orders(st.session_state.order_data)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -6,7 +6,10 @@ This script demonstrates how to integrate volatility protection
 into your LLM momentum strategy portfolio generation.
 """
 
+import math
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to path
@@ -14,11 +17,40 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import pandas as pd
-from datetime import datetime, timedelta
 from loguru import logger
 
 from src.data import DataManager
 from src.strategy import EnhancedSelector, EnhancedPortfolioConstructor, VolatilityProtection
+from src.utils.returns import fast_pct_change
+from src.utils.csv_writer import write_csv
+
+SQRT_252 = math.sqrt(252)
+SEP70, SEP90 = "=" * 70, "=" * 90
+
+# Column formats for the holdings table
+DISPLAY_FORMATS = {
+    'weight': '{:.2%}',
+    'momentum_return': '{:.2%}',
+    'llm_score': '{:.3f}',
+    'original_weight': '{:.2%}',
+}
+
+
+# Heavy components are built once per process so repeated calls (notebook, cron
+# loop) reuse loaded config, caches and API clients.
+@lru_cache(maxsize=1)
+def _data_manager() -> DataManager:
+    return DataManager()
+
+
+@lru_cache(maxsize=1)
+def _selector() -> EnhancedSelector:
+    return EnhancedSelector()
+
+
+@lru_cache(maxsize=2)
+def _constructor(enable_protection: bool) -> EnhancedPortfolioConstructor:
+    return EnhancedPortfolioConstructor(enable_volatility_protection=enable_protection)
 
 
 def generate_protected_portfolio(
@@ -45,20 +77,23 @@ def generate_protected_portfolio(
     Returns:
         Tuple of (portfolio DataFrame, protection adjustments dict)
     """
-    logger.info("="*70)
-    logger.info("PORTFOLIO GENERATION WITH VOLATILITY PROTECTION")
-    logger.info("="*70)
-    logger.info(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    now = pd.Timestamp.now()
+    current_date = now.normalize()
+    today = current_date.strftime('%Y-%m-%d')
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
+
+    logger.info(f"{SEP70}\nPORTFOLIO GENERATION WITH VOLATILITY PROTECTION\n{SEP70}")
+    logger.info(f"Date: {now:%Y-%m-%d %H:%M:%S}")
     logger.info(f"Portfolio size: {portfolio_size}")
     logger.info(f"Base weighting: {base_weighting}")
     logger.info(f"Volatility protection: {enable_protection}")
-    logger.info("="*70 + "\n")
+    logger.info(SEP70 + "\n")
 
     # Initialize components
     logger.info("Initializing data manager and strategy components...")
-    dm = DataManager()
-    selector = EnhancedSelector()
-    constructor = EnhancedPortfolioConstructor(enable_volatility_protection=enable_protection)
+    dm = _data_manager()
+    selector = _selector()
+    constructor = _constructor(enable_protection)
 
     # Initialize volatility protection with custom parameters
     if enable_protection:
@@ -78,20 +113,25 @@ def generate_protected_portfolio(
     universe = dm.get_universe()[:300]
     logger.info(f"Universe: {len(universe)} stocks")
 
-    # Fetch price data
+    # Fetch price data; when protection is on, the SPY series used for regime
+    # detection is fetched on a second thread so its round-trip overlaps
     logger.info("\nFetching price data (this may take a minute)...")
-    price_data = dm.get_prices(
-        universe,
-        use_cache=True,
-        show_progress=True
-    )
-
-    today = datetime.now().strftime('%Y-%m-%d')
+    spy_df = None
+    if enable_protection:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            universe_future = executor.submit(dm.get_prices, universe, use_cache=True, show_progress=True)
+            spy_future = executor.submit(dm.get_prices, ['SPY'], use_cache=True, show_progress=False)
+            price_data, spy_data = universe_future.result(), spy_future.result()
+        spy_df = spy_data.get('SPY')
+    else:
+        price_data = dm.get_prices(
+            universe,
+            use_cache=True,
+            show_progress=True
+        )
 
     # Enhanced selection with LLM
-    logger.info("\n" + "="*70)
-    logger.info("ENHANCED SELECTION (with LLM)")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nENHANCED SELECTION (with LLM)\n{SEP70}")
 
     selected_stocks, metadata = selector.select_for_portfolio_enhanced(
         price_data,
@@ -106,7 +146,9 @@ def generate_protected_portfolio(
         return None, None
 
     logger.info(f"\nSelected {len(selected_stocks)} stocks with LLM scores")
-    logger.info(f"Average LLM score: {selected_stocks['llm_score'].mean():.3f}")
+    logger.opt(lazy=True).info(
+        "Average LLM score: {:.3f}", lambda: selected_stocks['llm_score'].mean()
+    )
 
     # Construct enhanced portfolio
     portfolio = constructor.construct_portfolio_enhanced(
@@ -121,20 +163,18 @@ def generate_protected_portfolio(
     # Apply volatility protection if enabled
     protection_adjustments = None
     if enable_protection and constructor.vol_protect:
-        logger.info("\n" + "="*70)
-        logger.info("APPLYING VOLATILITY PROTECTION")
-        logger.info("="*70)
+        logger.info(f"\n{SEP70}\nAPPLYING VOLATILITY PROTECTION\n{SEP70}")
 
         # Get SPY data for market regime detection
         try:
-            spy_data = dm.get_prices(['SPY'], use_cache=True, show_progress=False)
-            if 'SPY' in spy_data and not spy_data['SPY'].empty:
-                spy_prices = spy_data['SPY']['close']
-                spy_returns = spy_prices.pct_change().fillna(0)
+            if spy_df is not None and not spy_df.empty:
+                spy_prices = spy_df['close']
+                spy_returns_arr = fast_pct_change(spy_prices.to_numpy())
+                spy_returns = pd.Series(spy_returns_arr, index=spy_prices.index)
 
                 # Get VIX data (simplified - in production, fetch from data source)
                 # For now, we'll estimate VIX from SPY volatility
-                recent_vol = spy_returns.tail(21).std() * np.sqrt(252)
+                recent_vol = spy_returns_arr[-21:].std(ddof=1) * SQRT_252
                 estimated_vix = min(recent_vol * 100, 80)  # Scale to VIX-like range
 
                 logger.info(f"Estimated VIX: {estimated_vix:.1f}")
@@ -142,8 +182,6 @@ def generate_protected_portfolio(
                 # Calculate strategy returns (simplified)
                 momentum_returns = spy_returns.copy()  # Use SPY as proxy
 
-                current_date = pd.Timestamp(today)
-
                 # Apply protection
                 portfolio, protection_adjustments = constructor.apply_volatility_protection(
                     portfolio=portfolio,
@@ -163,17 +201,12 @@ def generate_protected_portfolio(
         except Exception as e:
             logger.error(f"Error applying volatility protection: {e}")
 
-    # Sort by weight
-    portfolio = portfolio.sort_values('weight', ascending=False)
-
     # Display results
-    logger.info("\n" + "="*70)
-    logger.info("PORTFOLIO RECOMMENDATIONS")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nPORTFOLIO RECOMMENDATIONS\n{SEP70}")
 
-    print(f"\n{'='*90}")
+    print(f"\n{SEP90}")
     print(f"PORTFOLIO FOR {today}")
-    print(f"{'='*90}\n")
+    print(f"{SEP90}\n")
 
     # Summary stats
     print(f"Total positions: {len(portfolio)}")
@@ -189,9 +222,9 @@ def generate_protected_portfolio(
         print(f"Market regime: {portfolio['protection_regime'].iloc[0]}")
 
     # Display top 20 holdings
-    print(f"\n{'='*90}")
+    print(f"\n{SEP90}")
     print("TOP 20 HOLDINGS")
-    print(f"{'='*90}\n")
+    print(f"{SEP90}\n")
 
     display_cols = ['symbol', 'weight', 'momentum_return']
     if 'llm_score' in portfolio.columns:
@@ -199,27 +232,22 @@ def generate_protected_portfolio(
     if 'original_weight' in portfolio.columns:
         display_cols.append('original_weight')
 
-    top_20 = portfolio.head(20)[display_cols].copy()
+    top_20 = portfolio.nlargest(20, 'weight').loc[:, display_cols]
 
-    # Format for display
-    top_20['weight'] = top_20['weight'].apply(lambda x: f"{x:.2%}")
-    top_20['momentum_return'] = top_20['momentum_return'].apply(lambda x: f"{x:.2%}")
-    if 'llm_score' in top_20.columns:
-        top_20['llm_score'] = top_20['llm_score'].apply(lambda x: f"{x:.3f}")
-    if 'original_weight' in top_20.columns:
-        top_20['original_weight'] = top_20['original_weight'].apply(lambda x: f"{x:.2%}")
+    print(top_20.to_string(
+        index=False,
+        formatters={col: fmt.format for col, fmt in DISPLAY_FORMATS.items() if col in top_20}
+    ))
 
-    print(top_20.to_string(index=False))
-
-    # Export to CSV
+    # Export to CSV (sorted by weight)
+    portfolio = portfolio.sort_values('weight', ascending=False)
     output_dir = Path("results/portfolios")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     strategy_name = f"enhanced_{base_weighting}_{'protected' if enable_protection else 'unprotected'}"
     filename = output_dir / f"portfolio_{strategy_name}_{timestamp}.csv"
 
-    portfolio.to_csv(filename, index=False)
+    write_csv(portfolio, filename)
     logger.info(f"\n✓ Portfolio saved to: {filename}")
 
     return portfolio, protection_adjustments
@@ -228,9 +256,9 @@ def generate_protected_portfolio(
 def print_protection_dashboard(adjustments: dict):
     """Print a dashboard of current protection status"""
 
-    print("\n" + "="*70)
+    print("\n" + SEP70)
     print("VOLATILITY PROTECTION DASHBOARD")
-    print("="*70)
+    print(SEP70)
 
     # Market Regime
     regime = adjustments['regime']
@@ -257,13 +285,12 @@ def print_protection_dashboard(adjustments: dict):
     print(f"  Hedge Ratio: {adjustments['hedge_ratio']:.1%}")
 
     print(f"\n{adjustments['recommendation']}")
-    print("="*70 + "\n")
+    print(SEP70 + "\n")
 
 
 def main():
     """Main entry point."""
     import argparse
-    import numpy as np
 
     parser = argparse.ArgumentParser(
         description="Generate portfolio with volatility protection"
@@ -329,9 +356,9 @@ def main():
         return
 
     # Summary
-    print(f"\n{'='*90}")
+    print(f"\n{SEP90}")
     print("NEXT STEPS")
-    print(f"{'='*90}\n")
+    print(f"{SEP90}\n")
 
     print("1. Review the portfolio recommendations above")
     print("2. Check the volatility protection status")
@@ -340,9 +367,7 @@ def main():
         print("4. ⚠️  IMPORTANT: Protection reduced exposure - consider holding more cash")
     print("5. Execute rebalance during market hours")
 
-    logger.info("\n" + "="*70)
-    logger.info("PORTFOLIO GENERATION COMPLETE")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nPORTFOLIO GENERATION COMPLETE\n{SEP70}")
 
 
 if __name__ == "__main__":
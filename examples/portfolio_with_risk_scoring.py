@@ -7,19 +7,52 @@ to your portfolio using LLM-based news analysis.
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
 from loguru import logger
 
 from src.data import DataManager
 from src.strategy import EnhancedSelector, EnhancedPortfolioConstructor
 from src.llm import LLMRiskScorer
+from src.utils.csv_writer import write_csv
+
+SEP70, SEP90 = "=" * 70, "=" * 90
+
+# Column formats for the holdings table
+DISPLAY_FORMATS = {
+    'weight': '{:.2%}',
+    'llm_score': '{:.3f}',
+    'risk_score': '{:.2f}',
+}
+
+
+# Heavy components are built once per process so repeated calls (notebook, cron
+# loop) reuse loaded config, caches and API clients.
+@lru_cache(maxsize=1)
+def _data_manager() -> DataManager:
+    return DataManager()
+
+
+@lru_cache(maxsize=1)
+def _selector() -> EnhancedSelector:
+    return EnhancedSelector()
+
+
+@lru_cache(maxsize=1)
+def _constructor() -> EnhancedPortfolioConstructor:
+    return EnhancedPortfolioConstructor()
+
+
+@lru_cache(maxsize=1)
+def _risk_scorer() -> LLMRiskScorer:
+    return LLMRiskScorer()
 
 
 def generate_portfolio_with_risk_scoring(
@@ -40,22 +73,20 @@ def generate_portfolio_with_risk_scoring(
     Returns:
         Portfolio DataFrame with risk scores
     """
-    logger.info("="*70)
-    logger.info("PORTFOLIO GENERATION WITH LLM RISK SCORING")
-    logger.info("="*70)
+    logger.info(f"{SEP70}\nPORTFOLIO GENERATION WITH LLM RISK SCORING\n{SEP70}")
     logger.info(f"Portfolio size: {portfolio_size}")
     logger.info(f"Risk adjustment: {apply_risk_adjustment}")
     if apply_risk_adjustment:
         logger.info(f"Risk threshold: {risk_threshold}")
         logger.info(f"Reduction factor: {reduction_factor}")
-    logger.info("="*70 + "\n")
+    logger.info(SEP70 + "\n")
 
     # Initialize components
     logger.info("Initializing components...")
-    dm = DataManager()
-    selector = EnhancedSelector()
-    constructor = EnhancedPortfolioConstructor()
-    risk_scorer = LLMRiskScorer()
+    dm = _data_manager()
+    selector = _selector()
+    constructor = _constructor()
+    risk_scorer = _risk_scorer()
 
     # Get universe
     logger.info("\nFetching S&P 500 universe...")
@@ -70,12 +101,11 @@ def generate_portfolio_with_risk_scoring(
         show_progress=True
     )
 
-    today = datetime.now().strftime('%Y-%m-%d')
+    now = pd.Timestamp.now()
+    today = now.strftime('%Y-%m-%d')
 
     # Enhanced selection with LLM
-    logger.info("\n" + "="*70)
-    logger.info("STEP 1: ENHANCED STOCK SELECTION")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nSTEP 1: ENHANCED STOCK SELECTION\n{SEP70}")
 
     selected_stocks, metadata = selector.select_for_portfolio_enhanced(
         price_data,
@@ -90,12 +120,12 @@ def generate_portfolio_with_risk_scoring(
         return None
 
     logger.info(f"\nSelected {len(selected_stocks)} stocks with LLM scores")
-    logger.info(f"Average LLM score: {selected_stocks['llm_score'].mean():.3f}")
+    logger.opt(lazy=True).info(
+        "Average LLM score: {:.3f}", lambda: selected_stocks['llm_score'].mean()
+    )
 
     # Construct enhanced portfolio
-    logger.info("\n" + "="*70)
-    logger.info("STEP 2: PORTFOLIO CONSTRUCTION")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nSTEP 2: PORTFOLIO CONSTRUCTION\n{SEP70}")
 
     portfolio = constructor.construct_portfolio_enhanced(
         selected_stocks,
@@ -107,37 +137,33 @@ def generate_portfolio_with_risk_scoring(
     )
 
     # Fetch news for risk scoring
-    logger.info("\n" + "="*70)
-    logger.info("STEP 3: FETCH NEWS FOR RISK ASSESSMENT")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nSTEP 3: FETCH NEWS FOR RISK ASSESSMENT\n{SEP70}")
 
-    symbols = portfolio['symbol'].tolist()
+    symbols = portfolio['symbol'].to_numpy()
     logger.info(f"Fetching news for {len(symbols)} stocks...")
 
-    news_data = dm.get_news(
+    news_data = dm.get_news_parallel(
         symbols,
-        days_back=1,
-        use_cache=True
+        lookback_days=1,
+        use_cache=True,
+        max_workers=16
     )
 
     logger.info(f"News fetched for {len(news_data)} stocks")
 
     # Score risk for each stock
-    logger.info("\n" + "="*70)
-    logger.info("STEP 4: LLM RISK SCORING")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nSTEP 4: LLM RISK SCORING\n{SEP70}")
 
-    portfolio_with_risk = risk_scorer.score_portfolio_risks(
-        portfolio,
-        news_data,
-        show_progress=True
-    )
+    scores, recs, key_risks = risk_scorer.score_aligned(symbols, news_data)
+
+    portfolio_with_risk = portfolio.copy()
+    portfolio_with_risk['risk_score'] = scores
+    portfolio_with_risk['risk_recommendation'] = recs
+    portfolio_with_risk['key_risk'] = key_risks
 
     # Apply risk-based adjustment if enabled
     if apply_risk_adjustment:
-        logger.info("\n" + "="*70)
-        logger.info("STEP 5: RISK-BASED WEIGHT ADJUSTMENT")
-        logger.info("="*70)
+        logger.info(f"\n{SEP70}\nSTEP 5: RISK-BASED WEIGHT ADJUSTMENT\n{SEP70}")
 
         portfolio_with_risk = risk_scorer.apply_risk_based_adjustment(
             portfolio_with_risk,
@@ -145,53 +171,57 @@ def generate_portfolio_with_risk_scoring(
             reduction_factor=reduction_factor
         )
 
-    # Sort by weight
-    portfolio_with_risk = portfolio_with_risk.sort_values('weight', ascending=False)
-
     # Display results
-    print("\n" + "="*90)
+    print("\n" + SEP90)
     print(f"PORTFOLIO WITH RISK SCORES - {today}")
-    print("="*90 + "\n")
+    print(SEP90 + "\n")
+
+    # Bucket risk scores once: (-inf, 0.4], (0.4, 0.7], (0.7, inf)
+    risk_counts = pd.cut(
+        portfolio_with_risk['risk_score'],
+        bins=[-np.inf, 0.4, 0.7, np.inf],
+        labels=['low', 'medium', 'high']
+    ).value_counts()
+    low_risk = risk_counts['low']
+    medium_risk = risk_counts['medium']
+    high_risk = risk_counts['high']
 
     # Summary stats
     print(f"Total positions: {len(portfolio_with_risk)}")
     print(f"Portfolio weights sum: {portfolio_with_risk['weight'].sum():.2%}")
     print(f"Average risk score: {portfolio_with_risk['risk_score'].mean():.2f}")
-    print(f"High-risk stocks (>0.7): {(portfolio_with_risk['risk_score'] > 0.7).sum()}")
+    print(f"High-risk stocks (>0.7): {high_risk}")
 
     # Display top 15 holdings with risk scores
-    print(f"\n{'='*90}")
+    print(f"\n{SEP90}")
     print("TOP 15 HOLDINGS WITH RISK ASSESSMENT")
-    print(f"{'='*90}\n")
+    print(f"{SEP90}\n")
 
     display_cols = ['symbol', 'weight', 'llm_score', 'risk_score', 'risk_recommendation', 'key_risk']
-    top_15 = portfolio_with_risk.head(15)[display_cols].copy()
-
-    # Format for display
-    top_15['weight'] = top_15['weight'].apply(lambda x: f"{x:.2%}")
-    top_15['llm_score'] = top_15['llm_score'].apply(lambda x: f"{x:.3f}")
-    top_15['risk_score'] = top_15['risk_score'].apply(lambda x: f"{x:.2f}")
+    top_15 = portfolio_with_risk.nlargest(15, 'weight').loc[:, display_cols]
 
-    print(top_15.to_string(index=False))
+    print(top_15.to_string(
+        index=False,
+        formatters={col: fmt.format for col, fmt in DISPLAY_FORMATS.items() if col in top_15}
+    ))
 
     # Risk distribution
-    print(f"\n{'='*90}")
+    print(f"\n{SEP90}")
     print("RISK DISTRIBUTION")
-    print(f"{'='*90}\n")
-
-    low_risk = (portfolio_with_risk['risk_score'] <= 0.4).sum()
-    medium_risk = ((portfolio_with_risk['risk_score'] > 0.4) & (portfolio_with_risk['risk_score'] <= 0.7)).sum()
-    high_risk = (portfolio_with_risk['risk_score'] > 0.7).sum()
+    print(f"{SEP90}\n")
 
     print(f"Low Risk (0.0-0.4):    {low_risk:2d} stocks ({low_risk/len(portfolio_with_risk)*100:.1f}%)")
     print(f"Medium Risk (0.4-0.7): {medium_risk:2d} stocks ({medium_risk/len(portfolio_with_risk)*100:.1f}%)")
     print(f"High Risk (0.7-1.0):   {high_risk:2d} stocks ({high_risk/len(portfolio_with_risk)*100:.1f}%)")
 
+    # Sort by weight for the warnings list and CSV export
+    portfolio_with_risk = portfolio_with_risk.sort_values('weight', ascending=False)
+
     # High-risk warnings
     if high_risk > 0:
-        print(f"\n{'='*90}")
+        print(f"\n{SEP90}")
         print("⚠️  HIGH-RISK STOCKS")
-        print(f"{'='*90}\n")
+        print(f"{SEP90}\n")
 
         high_risk_stocks = portfolio_with_risk[portfolio_with_risk['risk_score'] > 0.7]
         for _, stock in high_risk_stocks.iterrows():
@@ -201,16 +231,16 @@ def generate_portfolio_with_risk_scoring(
     output_dir = Path("results/portfolios")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
     filename = output_dir / f"portfolio_with_risk_{timestamp}.csv"
 
-    portfolio_with_risk.to_csv(filename, index=False)
+    write_csv(portfolio_with_risk, filename)
     logger.info(f"\n✓ Portfolio saved to: {filename}")
 
     # Action items
-    print(f"\n{'='*90}")
+    print(f"\n{SEP90}")
     print("NEXT STEPS")
-    print(f"{'='*90}\n")
+    print(f"{SEP90}\n")
 
     print("1. Review high-risk stocks and consider:")
     print("   - Reducing position sizes")
@@ -268,9 +298,7 @@ def main():
         logger.error("Failed to generate portfolio")
         return
 
-    logger.info("\n" + "="*70)
-    logger.info("PORTFOLIO GENERATION COMPLETE")
-    logger.info("="*70)
+    logger.info(f"\n{SEP70}\nPORTFOLIO GENERATION COMPLETE\n{SEP70}")
 
 
 if __name__ == "__main__":
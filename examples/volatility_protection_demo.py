@@ -12,9 +12,49 @@ sys.path.append('..')
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from pathlib import Path
 from src.strategy.volatility_protection import VolatilityProtection
 
 
+DOWNLOAD_CACHE_DIR = Path('data/raw/demo_downloads')
+
+
+def cached_download(tickers, start, end):
+    """yf.download with an on-disk parquet cache keyed by (tickers, start, end)
+
+    A list of tickers is fetched in one threaded call, grouped by ticker.
+    """
+    if isinstance(tickers, str):
+        key, kwargs = tickers, {}
+    else:
+        key, kwargs = '_'.join(tickers), {'threads': True, 'group_by': 'ticker'}
+    path = DOWNLOAD_CACHE_DIR / f"{key.replace('^', '')}_{start}_{end}.parquet"
+    try:
+        if path.exists():
+            return pd.read_parquet(path)
+    except ImportError:
+        pass  # No parquet engine installed; always download
+
+    import yfinance as yf
+    df = yf.download(tickers, start=start, end=end, progress=False, **kwargs)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path)
+    except ImportError:
+        pass
+    return df
+
+
+def returns_from_prices(prices):
+    """Daily simple returns computed through log prices (first day is 0)"""
+    log_prices = np.log(prices.to_numpy(dtype=np.float64, copy=False))
+    returns = np.empty_like(log_prices)
+    returns[0] = 0.0
+    # expm1 of the log difference gives the simple return without cancellation
+    np.expm1(np.diff(log_prices), out=returns[1:])
+    return pd.Series(returns, index=prices.index)
+
+
 def example_1_basic_usage():
     """Example 1: Basic usage of volatility protection"""
     
@@ -31,12 +71,14 @@ def example_1_basic_usage():
     
     # Simulate market data
     dates = pd.date_range('2020-01-01', '2020-12-31', freq='B')
-    np.random.seed(42)
-    spy_prices = pd.Series(
-        100 * np.exp(np.random.randn(len(dates)).cumsum() * 0.01),
-        index=dates
-    )
-    spy_returns = spy_prices.pct_change().fillna(0)
+    rng = np.random.default_rng(42)
+    # Log-price path built in place: shocks -> cumulative log price -> price
+    path = rng.normal(0.0, 0.01, size=len(dates))
+    np.cumsum(path, out=path)
+    np.exp(path, out=path)
+    path *= 100
+    spy_prices = pd.Series(path, index=dates)
+    spy_returns = returns_from_prices(spy_prices)
     
     # Test different VIX scenarios
     scenarios = [
@@ -46,14 +88,16 @@ def example_1_basic_usage():
         ("Panic Mode (VIX=50)", 50.0),
     ]
     
+    # Only VIX varies between scenarios, so the market features are computed once
+    features = vol_protect.precompute_market_features(
+        spy_prices=spy_prices,
+        spy_returns=spy_returns,
+        momentum_returns=spy_returns,  # Simplified
+        current_date=dates[-1]
+    )
+
     for scenario_name, vix_level in scenarios:
-        adjustments = vol_protect.calculate_combined_adjustment(
-            spy_prices=spy_prices,
-            spy_returns=spy_returns,
-            vix_level=vix_level,
-            momentum_returns=spy_returns,  # Simplified
-            current_date=dates[-1]
-        )
+        adjustments = vol_protect.calculate_adjustment_from_features(features, vix_level)
         
         print(f"\n{scenario_name}:")
         print(f"  Regime: {adjustments['regime'].state}")
@@ -70,12 +114,11 @@ def example_2_march_2020_covid_crash():
     print("="*70)
     
     try:
-        import yfinance as yf
-        
-        # Download real data
+        # Download real data (cached on disk after the first run)
         print("\nDownloading market data...")
-        spy = yf.download('SPY', start='2020-02-01', end='2020-04-30', progress=False)
-        vix_data = yf.download('^VIX', start='2020-02-01', end='2020-04-30', progress=False)
+        data = cached_download(['SPY', '^VIX'], '2020-02-01', '2020-04-30')
+        spy = data['SPY'].dropna(how='all')
+        vix_data = data['^VIX'].dropna(how='all')
         
         vol_protect = VolatilityProtection()
         
@@ -93,26 +136,22 @@ def example_2_march_2020_covid_crash():
         
         spy_prices = spy['Close']
         spy_returns = spy_prices.pct_change()
+        spy_close = spy_prices.to_numpy(dtype=np.float64, copy=False)
+        vix_close = vix_data['Close'].to_numpy(dtype=np.float64, copy=False)
 
-        for date_str, description in key_dates:
-            date = pd.Timestamp(date_str)
-
-            # Find nearest available date
-            if date not in spy.index:
-                nearest_dates = spy.index[spy.index >= date]
-                if len(nearest_dates) == 0:
-                    continue
-                date = nearest_dates[0]
-
-            if date not in vix_data.index:
-                nearest_vix_dates = vix_data.index[vix_data.index >= date]
-                if len(nearest_vix_dates) == 0:
-                    continue
-                vix_date = nearest_vix_dates[0]
-            else:
-                vix_date = date
+        # Resolve every key date to the next available trading day in one
+        # vectorized lookup per index (-1 means past the end of the data)
+        requested = pd.DatetimeIndex([date_str for date_str, _ in key_dates])
+        spy_pos = spy.index.get_indexer(requested, method='bfill')
+        vix_pos = np.full(len(spy_pos), -1)
+        found = spy_pos >= 0
+        vix_pos[found] = vix_data.index.get_indexer(spy.index[spy_pos[found]], method='bfill')
 
-            vix_level = vix_data['Close'][vix_date]
+        for (date_str, description), i, j in zip(key_dates, spy_pos, vix_pos):
+            if i < 0 or j < 0:
+                continue
+            date = spy.index[i]
+            vix_level = vix_close[j]
             
             adjustments = vol_protect.calculate_combined_adjustment(
                 spy_prices=spy_prices,
@@ -123,7 +162,7 @@ def example_2_march_2020_covid_crash():
             )
             
             print(f"\n{date_str} - {description}:")
-            print(f"  SPY Price: ${spy_prices[date]:.2f}")
+            print(f"  SPY Price: ${spy_close[i]:.2f}")
             print(f"  VIX: {vix_level:.1f}")
             print(f"  Regime: {adjustments['regime'].state}")
             print(f"  Crash Risk Score: {adjustments['crash_risk_score']:.2f}")
@@ -144,17 +183,22 @@ def example_3_portfolio_integration():
     print("="*70)
     
     # Simulate a momentum portfolio
-    tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX']
-    base_weights = {ticker: 1.0/len(tickers) for ticker in tickers}
+    tickers = np.array(['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX'])
+    base_weights = np.full(len(tickers), 1.0 / len(tickers))
     
     print("\nBase Portfolio (Equal-Weighted):")
-    for ticker, weight in base_weights.items():
+    for ticker, weight in zip(tickers, base_weights):
         print(f"  {ticker}: {weight:.2%}")
     
     # Simulate market conditions
     dates = pd.date_range('2023-01-01', '2023-12-31', freq='B')
-    spy_prices = pd.Series(100 * (1 + np.random.randn(len(dates)).cumsum() * 0.01), index=dates)
-    spy_returns = spy_prices.pct_change().fillna(0)
+    rng = np.random.default_rng()
+    path = rng.normal(0.0, 0.01, size=len(dates))
+    np.cumsum(path, out=path)
+    path += 1
+    path *= 100
+    spy_prices = pd.Series(path, index=dates)
+    spy_returns = returns_from_prices(spy_prices)
     
     vol_protect = VolatilityProtection()
     
@@ -165,33 +209,32 @@ def example_3_portfolio_integration():
         ("Crisis Mode", 45.0),
     ]
     
+    features = vol_protect.precompute_market_features(
+        spy_prices=spy_prices,
+        spy_returns=spy_returns,
+        momentum_returns=spy_returns,
+        current_date=dates[-1]
+    )
+
     for condition_name, vix_level in test_conditions:
         print(f"\n{'='*70}")
         print(f"{condition_name} (VIX={vix_level})")
         print(f"{'='*70}")
         
-        adjustments = vol_protect.calculate_combined_adjustment(
-            spy_prices=spy_prices,
-            spy_returns=spy_returns,
-            vix_level=vix_level,
-            momentum_returns=spy_returns,
-            current_date=dates[-1]
-        )
+        adjustments = vol_protect.calculate_adjustment_from_features(features, vix_level)
         
         # Apply adjustment to portfolio
-        adjusted_weights = {
-            ticker: weight * adjustments['final_exposure']
-            for ticker, weight in base_weights.items()
-        }
+        adjusted_weights = base_weights * adjustments['final_exposure']
+        equity_exposure = adjusted_weights.sum()
         
         # Calculate cash position
-        cash_position = 1.0 - sum(adjusted_weights.values())
+        cash_position = 1.0 - equity_exposure
         
         print(f"\nAdjusted Portfolio:")
-        for ticker, weight in adjusted_weights.items():
+        for ticker, weight in zip(tickers, adjusted_weights):
             print(f"  {ticker}: {weight:.2%}")
         print(f"  CASH: {cash_position:.2%}")
-        print(f"\nTotal Equity Exposure: {sum(adjusted_weights.values()):.1%}")
+        print(f"\nTotal Equity Exposure: {equity_exposure:.1%}")
         print(f"Protection Level: {(1-adjustments['final_exposure']):.1%}")
 
 
@@ -203,64 +246,49 @@ def example_4_backtesting_comparison():
     print("="*70)
     
     # Simulate strategy returns
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     dates = pd.date_range('2019-01-01', '2023-12-31', freq='B')
     
     # Create realistic returns with occasional crashes
-    returns = np.random.randn(len(dates)) * 0.01
+    returns = rng.normal(0.0, 0.01, size=len(dates))
     # Add crash periods
-    crash_indices = [250, 251, 252, 600, 601, 900, 901]  # Simulate crashes
+    crash_indices = np.array([250, 251, 252, 600, 601, 900, 901], dtype=np.int64)  # Simulate crashes
     returns[crash_indices] = -0.05  # -5% daily returns during crashes
     
     returns_series = pd.Series(returns, index=dates)
-    spy_prices = pd.Series(100 * np.exp(returns_series.cumsum()), index=dates)
+    spy_prices = pd.Series(100 * np.exp(np.cumsum(returns)), index=dates)
     spy_returns = spy_prices.pct_change().fillna(0)
     
     # Simulate VIX (higher during crashes)
-    vix_series = pd.Series(15 + abs(returns) * 1000, index=dates)
-    vix_series[crash_indices] = 50  # High VIX during crashes
+    vix = 15 + np.abs(returns) * 1000
+    vix[crash_indices] = 50.0  # High VIX during crashes
+    vix_series = pd.Series(vix, index=dates)
     
     # Strategy WITHOUT protection
-    unprotected_returns = returns_series.copy()
-    unprotected_cumulative = (1 + unprotected_returns).cumprod()
+    unprotected_returns = returns
     
-    # Strategy WITH protection
+    # Strategy WITH protection: exposures for every date in one batch call
     vol_protect = VolatilityProtection()
-    protected_returns = []
-    exposures = []
-    
-    for date in dates:
-        if len(protected_returns) < 21:  # Need history
-            protected_returns.append(returns_series[date])
-            exposures.append(1.0)
-            continue
-            
-        adjustments = vol_protect.calculate_combined_adjustment(
-            spy_prices=spy_prices[:date],
-            spy_returns=spy_returns[:date],
-            vix_level=vix_series[date],
-            momentum_returns=pd.Series(protected_returns, index=dates[:len(protected_returns)]),
-            current_date=date
-        )
-        
-        # Apply protection
-        protected_return = returns_series[date] * adjustments['final_exposure']
-        protected_returns.append(protected_return)
-        exposures.append(adjustments['final_exposure'])
-    
-    protected_returns_series = pd.Series(protected_returns, index=dates)
-    protected_cumulative = (1 + protected_returns_series).cumprod()
-    
-    # Calculate metrics
+    adjustments = vol_protect.calculate_combined_adjustment_batch(
+        spy_prices=spy_prices,
+        spy_returns=spy_returns,
+        vix=vix_series,
+        strategy_returns=returns_series
+    )
+    exposures = adjustments['final_exposure'].to_numpy(dtype=np.float64, copy=False)
+    protected_returns = returns * exposures
+
+    # Calculate metrics on plain arrays; the equity curve compounds in log
+    # space (log1p + cumsum), which stays accurate over long horizons
     def calc_metrics(returns):
-        sharpe = returns.mean() / returns.std() * np.sqrt(252)
-        cumulative = (1 + returns).cumprod()
-        max_dd = (cumulative / cumulative.cummax() - 1).min()
-        total_return = cumulative.iloc[-1] - 1
+        sharpe = returns.mean() / returns.std(ddof=1) * np.sqrt(252)
+        cumulative = np.exp(np.log1p(returns).cumsum())
+        max_dd = (cumulative / np.maximum.accumulate(cumulative) - 1).min()
+        total_return = cumulative[-1] - 1
         return sharpe, max_dd, total_return
     
     unp_sharpe, unp_dd, unp_ret = calc_metrics(unprotected_returns)
-    prot_sharpe, prot_dd, prot_ret = calc_metrics(protected_returns_series)
+    prot_sharpe, prot_dd, prot_ret = calc_metrics(protected_returns)
     
     print("\nPerformance Comparison:")
     print("-" * 70)
@@ -269,7 +297,7 @@ def example_4_backtesting_comparison():
     print(f"{'Sharpe Ratio':<25} {unp_sharpe:>8.2f}          {prot_sharpe:>8.2f}          {(prot_sharpe/unp_sharpe-1)*100:>6.1f}%")
     print(f"{'Max Drawdown':<25} {unp_dd:>8.1%}          {prot_dd:>8.1%}          {(1-prot_dd/unp_dd)*100:>6.1f}%")
     print(f"{'Total Return':<25} {unp_ret:>8.1%}          {prot_ret:>8.1%}          {(prot_ret-unp_ret)*100:>6.1f}%")
-    print(f"{'Avg Exposure':<25} {'100.0%':>13}     {np.mean(exposures):>8.1%}")
+    print(f"{'Avg Exposure':<25} {'100.0%':>13}     {exposures.mean():>8.1%}")
     print("-" * 70)
 
 
@@ -5,22 +5,26 @@ Scheduled Daily Portfolio Monitor
 Runs at 4:30 PM ET daily (after market close)
 """
 
+import os
 import schedule
 import time
 from datetime import datetime
 from loguru import logger
 from pathlib import Path
-from src.automation import DailyMonitor
 
 # ============================================================================
 # CONFIGURATION - UPDATE THESE SETTINGS
 # ============================================================================
 
 # Email configuration (REQUIRED for notifications)
+# Credentials come from the environment so they never live in the repo:
+#   export MONITOR_SENDER_EMAIL=you@gmail.com
+#   export MONITOR_SENDER_PASSWORD="xxxx xxxx xxxx xxxx"  # Gmail app password
+#   export MONITOR_RECIPIENT_EMAIL=you@gmail.com          # Can be same as sender
 EMAIL_CONFIG = {
-    'sender_email': 'nguthinhan10@gmail.com',  # YOUR_EMAIL@gmail.com
-    'sender_password': 'qqaz geow iexj tzdh',  # YOUR_GMAIL_APP_PASSWORD
-    'recipient_email': 'binlong09@gmail.com'  # Recipient email (can be same as sender)
+    'sender_email': os.environ.get('MONITOR_SENDER_EMAIL', ''),
+    'sender_password': os.environ.get('MONITOR_SENDER_PASSWORD', ''),
+    'recipient_email': os.environ.get('MONITOR_RECIPIENT_EMAIL', '')
 }
 
 # Robinhood CSV path (optional - will use latest snapshot if not provided)
@@ -39,6 +43,9 @@ SCHEDULE_TIME = "16:30"  # 4:30 PM ET
 
 def run_monitoring():
     """Run daily monitoring task."""
+    # Imported here so the scheduler starts without loading the full monitoring stack
+    from src.automation import DailyMonitor
+
     logger.info("\n" + "="*80)
     logger.info(f"SCHEDULED MONITORING - {datetime.now().strftime('%Y-%m-%d %I:%M %p')}")
     logger.info("="*80)
@@ -46,12 +53,13 @@ def run_monitoring():
     # Check if email is configured
     email_enabled = all([
         EMAIL_CONFIG.get('sender_email'),
-        EMAIL_CONFIG.get('sender_password')
+        EMAIL_CONFIG.get('sender_password'),
+        EMAIL_CONFIG.get('recipient_email')
     ])
 
     if not email_enabled:
         logger.warning("⚠️ Email not configured! Running in DRY-RUN mode.")
-        logger.warning("  Update EMAIL_CONFIG in run_daily_monitor.py")
+        logger.warning("  Set MONITOR_SENDER_EMAIL, MONITOR_SENDER_PASSWORD and MONITOR_RECIPIENT_EMAIL")
 
     # Initialize monitor
     monitor = DailyMonitor(
@@ -81,17 +89,19 @@ def main():
     logger.info("DAILY PORTFOLIO MONITOR - SCHEDULER")
     logger.info("="*80)
     logger.info(f"Scheduled time: {SCHEDULE_TIME} daily")
-    logger.info(f"Email notifications: {'Enabled' if EMAIL_CONFIG.get('sender_email') else 'DISABLED - Update config!'}")
+    email_enabled = all(EMAIL_CONFIG.values())
+    logger.info(f"Email notifications: {'Enabled' if email_enabled else 'DISABLED - Update config!'}")
     logger.info(f"LLM news analysis: {'Enabled' if USE_LLM_FOR_NEWS else 'Disabled'}")
     logger.info("="*80)
 
     # Check configuration
-    if not EMAIL_CONFIG.get('sender_email'):
+    if not email_enabled:
         logger.warning("\n⚠️ EMAIL NOT CONFIGURED")
         logger.warning("To enable email notifications:")
-        logger.warning("  1. Edit run_daily_monitor.py")
-        logger.warning("  2. Update EMAIL_CONFIG with your email/password")
-        logger.warning("  3. For Gmail: Create App Password at https://myaccount.google.com/apppasswords")
+        logger.warning("  1. export MONITOR_SENDER_EMAIL=your-email@gmail.com")
+        logger.warning("  2. export MONITOR_SENDER_PASSWORD=your-app-password")
+        logger.warning("  3. export MONITOR_RECIPIENT_EMAIL=your-email@gmail.com")
+        logger.warning("  4. For Gmail: Create App Password at https://myaccount.google.com/apppasswords")
         logger.warning("")
 
     # Schedule the task
@@ -107,8 +117,13 @@ def main():
     # Keep running
     try:
         while True:
+            # Sleep straight through to the next job instead of polling every minute
+            idle = schedule.idle_seconds()
+            if idle is None:
+                break  # No jobs scheduled
+            if idle > 0:
+                time.sleep(idle)
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
     except KeyboardInterrupt:
         logger.info("\n\n👋 Scheduler stopped by user")
 
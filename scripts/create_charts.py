@@ -3,6 +3,7 @@ Create Performance Charts
 Simple script to visualize backtest results.
 """
 
+import os
 import sys
 from pathlib import Path
 project_root = Path(__file__).parent.parent
@@ -10,6 +11,8 @@ sys.path.insert(0, str(project_root))
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Files only; never initialize a GUI backend
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -17,6 +20,13 @@ import seaborn as sns
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 8)
 
+# Full 300 DPI only for release charts (CHARTS_RELEASE=1); PNG encoding dominates otherwise
+RELEASE = os.environ.get('CHARTS_RELEASE')
+DPI = 300 if RELEASE else 120
+
+# Charts go into one 2x2 summary.png; CHARTS_INDIVIDUAL=1 also writes the four separate PNGs
+INDIVIDUAL = os.environ.get('CHARTS_INDIVIDUAL')
+
 # Paths
 results_dir = Path("results/backtests/20251105_122351")
 output_dir = Path("results/visualizations")
@@ -24,151 +34,113 @@ output_dir.mkdir(parents=True, exist_ok=True)
 
 print("Loading backtest data...")
 
+def load_portfolio_value(path):
+    """Load a portfolio value CSV, parsing the ISO date index in one C-level pass."""
+    df = pd.read_csv(path, index_col=0)
+    df.index = pd.to_datetime(df.index, format='ISO8601', cache=True)
+    return df
+
 # Load validation period data
-val_baseline_pv = pd.read_csv(results_dir / "baseline/validation_portfolio_value.csv",
-                               index_col=0, parse_dates=True)
-val_enhanced_pv = pd.read_csv(results_dir / "enhanced/validation_portfolio_value.csv",
-                               index_col=0, parse_dates=True)
+val_baseline_pv = load_portfolio_value(results_dir / "baseline/validation_portfolio_value.csv")
+val_enhanced_pv = load_portfolio_value(results_dir / "enhanced/validation_portfolio_value.csv")
 
 # Load test period data
-test_baseline_pv = pd.read_csv(results_dir / "baseline/test_portfolio_value.csv",
-                                index_col=0, parse_dates=True)
-test_enhanced_pv = pd.read_csv(results_dir / "enhanced/test_portfolio_value.csv",
-                                index_col=0, parse_dates=True)
+test_baseline_pv = load_portfolio_value(results_dir / "baseline/test_portfolio_value.csv")
+test_enhanced_pv = load_portfolio_value(results_dir / "enhanced/test_portfolio_value.csv")
 
 print(f"Validation period: {val_baseline_pv.index[0]} to {val_baseline_pv.index[-1]}")
 print(f"Test period: {test_baseline_pv.index[0]} to {test_baseline_pv.index[-1]}")
 
-# ========== Chart 1: Validation Equity Curve ==========
-print("\nCreating validation equity curve...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-ax.plot(val_baseline_pv.index, val_baseline_pv.values / 1_000_000,
-        label='Baseline', linewidth=2.5, color='#2E86AB')
-ax.plot(val_enhanced_pv.index, val_enhanced_pv.values / 1_000_000,
-        label='Enhanced (LLM)', linewidth=2.5, color='#A23B72')
+def plot_equity(ax, baseline_pv, enhanced_pv, title):
+    """Draw baseline vs enhanced portfolio value with a total-return stats box."""
+    ax.clear()
+    ax.plot(baseline_pv.index, baseline_pv.to_numpy(dtype=np.float64, copy=False) / 1_000_000,
+            label='Baseline', linewidth=2.5, color='#2E86AB', rasterized=True)
+    ax.plot(enhanced_pv.index, enhanced_pv.to_numpy(dtype=np.float64, copy=False) / 1_000_000,
+            label='Enhanced (LLM)', linewidth=2.5, color='#A23B72', rasterized=True)
+
+    ax.set_title(title, fontsize=18, fontweight='bold', pad=20)
+    ax.set_xlabel('Date', fontsize=13, fontweight='bold')
+    ax.set_ylabel('Portfolio Value ($M)', fontsize=13, fontweight='bold')
+    ax.legend(fontsize=13, loc='upper left')
+    ax.grid(True, alpha=0.3)
+
+    # Stats box
+    baseline_ret = (baseline_pv.iloc[-1, 0] / baseline_pv.iloc[0, 0] - 1) * 100
+    enhanced_ret = (enhanced_pv.iloc[-1, 0] / enhanced_pv.iloc[0, 0] - 1) * 100
+    improvement = enhanced_ret - baseline_ret
+
+    stats_text = (f'Total Return:\n'
+                  f'  Baseline: {baseline_ret:.1f}%\n'
+                  f'  Enhanced: {enhanced_ret:.1f}%\n'
+                  f'  Improvement: +{improvement:.1f}%')
+    ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
+            fontsize=12, verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+
+def plot_drawdown(ax, index, drawdown, color, label=None):
+    """Draw one drawdown series as a filled area under zero."""
+    ax.fill_between(index, drawdown, 0, alpha=0.3, color=color, rasterized=True)
+    ax.plot(index, drawdown, color=color, linewidth=1.5, label=label, rasterized=True)
+    ax.set_ylabel('Drawdown (%)', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+
+
+def plot_returns_comparison(ax):
+    """Draw annualized baseline vs enhanced returns for both periods."""
+    ax.clear()
+    x = np.arange(len(categories))
+    width = 0.35
+
+    bars1 = ax.bar(x - width/2, baseline_values, width,
+                    label='Baseline', color='#2E86AB', alpha=0.9)
+    bars2 = ax.bar(x + width/2, enhanced_values, width,
+                    label='Enhanced (LLM)', color='#A23B72', alpha=0.9)
+
+    ax.set_title('Annual Returns Comparison', fontsize=18, fontweight='bold', pad=20)
+    ax.set_ylabel('Annualized Return (%)', fontsize=13, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(categories, fontsize=12)
+    ax.legend(fontsize=13, loc='upper left')
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Add value labels
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                    f'{height:.1f}%', ha='center', va='bottom',
+                    fontsize=11, fontweight='bold')
+
+    # Add improvements
+    improvements = [enhanced_values[i] - baseline_values[i] for i in range(len(categories))]
+    for i, imp in enumerate(improvements):
+        ax.text(i, max(baseline_values[i], enhanced_values[i]) + 1,
+                f'+{imp:.1f}%', ha='center', va='bottom',
+                fontsize=10, color='green', fontweight='bold',
+                bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.3))
 
-ax.set_title('Portfolio Value - Validation Period (2019-2023)',
-             fontsize=18, fontweight='bold', pad=20)
-ax.set_xlabel('Date', fontsize=13, fontweight='bold')
-ax.set_ylabel('Portfolio Value ($M)', fontsize=13, fontweight='bold')
-ax.legend(fontsize=13, loc='upper left')
-ax.grid(True, alpha=0.3)
-
-# Stats box
-baseline_ret = (val_baseline_pv.iloc[-1, 0] / val_baseline_pv.iloc[0, 0] - 1) * 100
-enhanced_ret = (val_enhanced_pv.iloc[-1, 0] / val_enhanced_pv.iloc[0, 0] - 1) * 100
-improvement = enhanced_ret - baseline_ret
-
-stats_text = (f'Total Return:\n'
-              f'  Baseline: {baseline_ret:.1f}%\n'
-              f'  Enhanced: {enhanced_ret:.1f}%\n'
-              f'  Improvement: +{improvement:.1f}%')
-ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
-        fontsize=12, verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-
-plt.tight_layout()
-plt.savefig(output_dir / 'validation_equity_curve.png', dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {output_dir / 'validation_equity_curve.png'}")
-plt.close()
-
-# ========== Chart 2: Test Equity Curve ==========
-print("Creating test equity curve...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-ax.plot(test_baseline_pv.index, test_baseline_pv.values / 1_000_000,
-        label='Baseline', linewidth=2.5, color='#2E86AB')
-ax.plot(test_enhanced_pv.index, test_enhanced_pv.values / 1_000_000,
-        label='Enhanced (LLM)', linewidth=2.5, color='#A23B72')
-
-ax.set_title('Portfolio Value - Test Period (2024)',
-             fontsize=18, fontweight='bold', pad=20)
-ax.set_xlabel('Date', fontsize=13, fontweight='bold')
-ax.set_ylabel('Portfolio Value ($M)', fontsize=13, fontweight='bold')
-ax.legend(fontsize=13, loc='upper left')
-ax.grid(True, alpha=0.3)
-
-# Stats box
-baseline_ret = (test_baseline_pv.iloc[-1, 0] / test_baseline_pv.iloc[0, 0] - 1) * 100
-enhanced_ret = (test_enhanced_pv.iloc[-1, 0] / test_enhanced_pv.iloc[0, 0] - 1) * 100
-improvement = enhanced_ret - baseline_ret
-
-stats_text = (f'Total Return:\n'
-              f'  Baseline: {baseline_ret:.1f}%\n'
-              f'  Enhanced: {enhanced_ret:.1f}%\n'
-              f'  Improvement: +{improvement:.1f}%')
-ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
-        fontsize=12, verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-
-plt.tight_layout()
-plt.savefig(output_dir / 'test_equity_curve.png', dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {output_dir / 'test_equity_curve.png'}")
-plt.close()
-
-# ========== Chart 3: Drawdowns ==========
-print("Creating drawdown charts...")
 
 # Calculate drawdowns
-def calculate_drawdown(pv_series):
-    """Calculate drawdown from portfolio value series."""
-    values = pv_series.values.flatten()
-    running_max = np.maximum.accumulate(values)
-    drawdown = (values / running_max - 1) * 100
-    return drawdown
-
-val_baseline_dd = calculate_drawdown(val_baseline_pv)
-val_enhanced_dd = calculate_drawdown(val_enhanced_pv)
-
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-
-# Baseline
-ax1.fill_between(val_baseline_pv.index, val_baseline_dd, 0,
-                  alpha=0.3, color='#2E86AB')
-ax1.plot(val_baseline_pv.index, val_baseline_dd,
-          color='#2E86AB', linewidth=1.5)
-ax1.set_title('Baseline Strategy - Drawdown (2019-2023)',
-              fontsize=14, fontweight='bold')
-ax1.set_ylabel('Drawdown (%)', fontsize=12, fontweight='bold')
-ax1.grid(True, alpha=0.3)
-ax1.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-
+def calculate_drawdowns(arr2d):
+    """Calculate percentage drawdown for each column of a 2-D value array."""
+    running_max = np.maximum.accumulate(arr2d, axis=0)
+    return (arr2d / running_max - 1.0) * 100.0
+
+# Align baseline and enhanced on their common dates (a run may have skipped a
+# day), then one pass covers both columns
+val_pv = pd.concat([val_baseline_pv.iloc[:, 0], val_enhanced_pv.iloc[:, 0]], axis=1, join='inner')
+val_dd_index = val_pv.index
+val_dd = calculate_drawdowns(val_pv.to_numpy(dtype=np.float64))
+val_baseline_dd = val_dd[:, 0]
+val_enhanced_dd = val_dd[:, 1]
 max_dd = val_baseline_dd.min()
-ax1.text(0.02, 0.05, f'Max Drawdown: {max_dd:.2f}%',
-         transform=ax1.transAxes, fontsize=11,
-         bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
-
-# Enhanced
-ax2.fill_between(val_enhanced_pv.index, val_enhanced_dd, 0,
-                  alpha=0.3, color='#A23B72')
-ax2.plot(val_enhanced_pv.index, val_enhanced_dd,
-          color='#A23B72', linewidth=1.5)
-ax2.set_title('Enhanced Strategy - Drawdown (2019-2023)',
-              fontsize=14, fontweight='bold')
-ax2.set_xlabel('Date', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Drawdown (%)', fontsize=12, fontweight='bold')
-ax2.grid(True, alpha=0.3)
-ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-
 max_dd_enh = val_enhanced_dd.min()
-improvement = max_dd_enh - max_dd
-ax2.text(0.02, 0.05,
-         f'Max Drawdown: {max_dd_enh:.2f}% ({improvement:+.2f}% vs baseline)',
-         transform=ax2.transAxes, fontsize=11,
-         bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
+dd_improvement = max_dd_enh - max_dd
 
-plt.tight_layout()
-plt.savefig(output_dir / 'validation_drawdowns.png', dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {output_dir / 'validation_drawdowns.png'}")
-plt.close()
-
-# ========== Chart 4: Performance Comparison ==========
-print("Creating performance comparison...")
-
-fig, ax = plt.subplots(figsize=(12, 7))
-
-# Calculate metrics
+# Calculate annualized returns
 val_baseline_ann = (val_baseline_pv.iloc[-1, 0] / val_baseline_pv.iloc[0, 0]) ** (1/5) - 1
 val_enhanced_ann = (val_enhanced_pv.iloc[-1, 0] / val_enhanced_pv.iloc[0, 0]) ** (1/5) - 1
 test_baseline_ann = (test_baseline_pv.iloc[-1, 0] / test_baseline_pv.iloc[0, 0]) ** (252/len(test_baseline_pv)) - 1
@@ -178,41 +150,100 @@ categories = ['Validation\n(2019-2023)', 'Test\n(2024)']
 baseline_values = [val_baseline_ann * 100, test_baseline_ann * 100]
 enhanced_values = [val_enhanced_ann * 100, test_enhanced_ann * 100]
 
-x = np.arange(len(categories))
-width = 0.35
-
-bars1 = ax.bar(x - width/2, baseline_values, width,
-                label='Baseline', color='#2E86AB', alpha=0.9)
-bars2 = ax.bar(x + width/2, enhanced_values, width,
-                label='Enhanced (LLM)', color='#A23B72', alpha=0.9)
-
-ax.set_title('Annual Returns Comparison', fontsize=18, fontweight='bold', pad=20)
-ax.set_ylabel('Annualized Return (%)', fontsize=13, fontweight='bold')
-ax.set_xticks(x)
-ax.set_xticklabels(categories, fontsize=12)
-ax.legend(fontsize=13, loc='upper left')
-ax.grid(True, alpha=0.3, axis='y')
-
-# Add value labels
-for bars in [bars1, bars2]:
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.1f}%', ha='center', va='bottom',
-                fontsize=11, fontweight='bold')
-
-# Add improvements
-improvements = [enhanced_values[i] - baseline_values[i] for i in range(len(categories))]
-for i, imp in enumerate(improvements):
-    ax.text(i, max(baseline_values[i], enhanced_values[i]) + 1,
-            f'+{imp:.1f}%', ha='center', va='bottom',
-            fontsize=10, color='green', fontweight='bold',
-            bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.3))
-
-plt.tight_layout()
-plt.savefig(output_dir / 'annual_returns_comparison.png', dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {output_dir / 'annual_returns_comparison.png'}")
-plt.close()
+generated = []
+
+# ========== Summary: all four charts on one 2x2 figure ==========
+print("\nCreating summary figure...")
+fig, axes = plt.subplots(2, 2, figsize=(20, 14))
+
+plot_equity(axes[0, 0], val_baseline_pv, val_enhanced_pv,
+            'Portfolio Value - Validation Period (2019-2023)')
+plot_equity(axes[0, 1], test_baseline_pv, test_enhanced_pv,
+            'Portfolio Value - Test Period (2024)')
+
+ax = axes[1, 0]
+plot_drawdown(ax, val_dd_index, val_baseline_dd, '#2E86AB', label='Baseline')
+plot_drawdown(ax, val_dd_index, val_enhanced_dd, '#A23B72', label='Enhanced (LLM)')
+ax.set_title('Drawdown - Validation Period (2019-2023)', fontsize=18, fontweight='bold', pad=20)
+ax.set_xlabel('Date', fontsize=13, fontweight='bold')
+ax.legend(fontsize=13, loc='lower right')
+ax.text(0.02, 0.05,
+        f'Max Drawdown:\n  Baseline: {max_dd:.2f}%\n'
+        f'  Enhanced: {max_dd_enh:.2f}% ({dd_improvement:+.2f}%)',
+        transform=ax.transAxes, fontsize=11,
+        bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
+
+plot_returns_comparison(axes[1, 1])
+
+fig.tight_layout()
+fig.savefig(output_dir / 'summary.png', dpi=DPI, bbox_inches='tight')
+print(f"✓ Saved: {output_dir / 'summary.png'}")
+plt.close(fig)
+generated.append('summary.png')
+
+if INDIVIDUAL:
+    # One canvas is reused for the single-panel charts; each chart clears the axes first
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    # ========== Chart 1: Validation Equity Curve ==========
+    print("Creating validation equity curve...")
+    plot_equity(ax, val_baseline_pv, val_enhanced_pv,
+                'Portfolio Value - Validation Period (2019-2023)')
+
+    fig.tight_layout()
+    fig.savefig(output_dir / 'validation_equity_curve.png', dpi=DPI, bbox_inches='tight')
+    print(f"✓ Saved: {output_dir / 'validation_equity_curve.png'}")
+
+    # ========== Chart 2: Test Equity Curve ==========
+    print("Creating test equity curve...")
+    plot_equity(ax, test_baseline_pv, test_enhanced_pv,
+                'Portfolio Value - Test Period (2024)')
+
+    fig.tight_layout()
+    fig.savefig(output_dir / 'test_equity_curve.png', dpi=DPI, bbox_inches='tight')
+    print(f"✓ Saved: {output_dir / 'test_equity_curve.png'}")
+
+    # ========== Chart 3: Drawdowns ==========
+    print("Creating drawdown charts...")
+
+    # The two-panel layout gets its own figure
+    dd_fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+
+    # Baseline
+    plot_drawdown(ax1, val_dd_index, val_baseline_dd, '#2E86AB')
+    ax1.set_title('Baseline Strategy - Drawdown (2019-2023)',
+                  fontsize=14, fontweight='bold')
+    ax1.text(0.02, 0.05, f'Max Drawdown: {max_dd:.2f}%',
+             transform=ax1.transAxes, fontsize=11,
+             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
+
+    # Enhanced
+    plot_drawdown(ax2, val_dd_index, val_enhanced_dd, '#A23B72')
+    ax2.set_title('Enhanced Strategy - Drawdown (2019-2023)',
+                  fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax2.text(0.02, 0.05,
+             f'Max Drawdown: {max_dd_enh:.2f}% ({dd_improvement:+.2f}% vs baseline)',
+             transform=ax2.transAxes, fontsize=11,
+             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
+
+    dd_fig.tight_layout()
+    dd_fig.savefig(output_dir / 'validation_drawdowns.png', dpi=DPI, bbox_inches='tight')
+    print(f"✓ Saved: {output_dir / 'validation_drawdowns.png'}")
+    plt.close(dd_fig)
+
+    # ========== Chart 4: Performance Comparison ==========
+    print("Creating performance comparison...")
+    fig.set_size_inches(12, 7)
+    plot_returns_comparison(ax)
+
+    fig.tight_layout()
+    fig.savefig(output_dir / 'annual_returns_comparison.png', dpi=DPI, bbox_inches='tight')
+    print(f"✓ Saved: {output_dir / 'annual_returns_comparison.png'}")
+    plt.close(fig)
+
+    generated += ['validation_equity_curve.png', 'test_equity_curve.png',
+                  'validation_drawdowns.png', 'annual_returns_comparison.png']
 
 # ========== Summary ==========
 print("\n" + "="*70)
@@ -220,9 +251,9 @@ print("VISUALIZATION COMPLETE")
 print("="*70)
 print(f"\nAll charts saved to: {output_dir}/")
 print("\nGenerated files:")
-print("  1. validation_equity_curve.png")
-print("  2. test_equity_curve.png")
-print("  3. validation_drawdowns.png")
-print("  4. annual_returns_comparison.png")
+for i, name in enumerate(generated, 1):
+    print(f"  {i}. {name}")
+if not INDIVIDUAL:
+    print("\nSet CHARTS_INDIVIDUAL=1 to also write each chart as its own PNG.")
 print("\nYou can view these in any image viewer or include in reports.")
 print("="*70)
@@ -8,111 +8,186 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data.news_data import NewsDataFetcher
-from src.data.universe import UniverseManager
 from loguru import logger
 import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from operator import itemgetter
 
+# Report divider line
+SEP80 = "=" * 80
 
-def fetch_for_symbol(fetcher, symbol, lookback_days=1, show_details=True):
+# Longest article summary shown in the listing before it is cut off
+MAX_SUMMARY = 200
+
+# Keys every source (RSS, NewsAPI, Alpha Vantage) sets on an article dict
+_ARTICLE_FIELDS = itemgetter('published', 'title', 'source', 'feed', 'url')
+
+# Default symbol list for --prewarm-watchlist (one ticker per line, '#' comments)
+WATCHLIST_PATH = Path(__file__).parent.parent / "config" / "watchlist.txt"
+
+# How long a command waits for an unfinished pre-warm before exiting
+PREWARM_JOIN_TIMEOUT = 60
+
+
+def fetch_for_symbol(fetcher, symbol, lookback_days=1, show_details=True, use_cache=True):
     """Fetch and display news for a single symbol."""
     logger.info(f"Fetching news for {symbol} (last {lookback_days} days)...")
 
     articles = fetcher.get_news(
         symbol=symbol,
         lookback_days=lookback_days,
-        use_cache=True
+        use_cache=use_cache
     )
 
-    print("\n" + "=" * 80)
+    print("\n" + SEP80)
     print(f"📰 News for {symbol}")
-    print("=" * 80)
+    print(SEP80)
 
     if not articles:
         print(f"No news found for {symbol} in the last {lookback_days} day(s)")
         return
 
-    print(f"Found {len(articles)} articles:\n")
+    # Build the whole listing first and write it in one call instead of ~5 prints per article
+    lines = [f"Found {len(articles)} articles:\n"]
+    append = lines.append
+    date_fmt = '%Y-%m-%d %H:%M'
 
     for i, article in enumerate(articles, 1):
-        pub_date = article.get('published')
-        date_str = pub_date.strftime('%Y-%m-%d %H:%M') if pub_date else 'Unknown'
+        pub_date, title, source, feed, url = _ARTICLE_FIELDS(article)
+        date_str = pub_date.strftime(date_fmt) if pub_date else 'Unknown'
 
-        print(f"{i}. [{date_str}] {article.get('title')}")
-        print(f"   Source: {article.get('source')} | Feed: {article.get('feed', 'N/A')}")
+        append(f"{i}. [{date_str}] {title}")
+        append(f"   Source: {source} | Feed: {feed}")
 
         if show_details:
             summary = article.get('summary', '')
             if summary:
                 # Truncate long summaries
-                summary_clean = summary[:200] + "..." if len(summary) > 200 else summary
-                print(f"   {summary_clean}")
+                if len(summary) > MAX_SUMMARY:
+                    summary = f"{summary[:MAX_SUMMARY]}..."
+                append(f"   {summary}")
+
+        append(f"   URL: {url}")
 
-        print(f"   URL: {article.get('url')}")
+        # Show sentiment if available (Alpha Vantage only)
+        sent = article.get('sentiment')
+        if sent:
+            append(f"   Sentiment: {sent.get('label')} ({sent.get('score'):.3f})")
 
-        # Show sentiment if available
-        if 'sentiment' in article and article['sentiment']:
-            sent = article['sentiment']
-            print(f"   Sentiment: {sent.get('label')} ({sent.get('score'):.3f})")
+        append("")
 
-        print()
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def fetch_summary(fetcher, symbol, lookback_days=1):
     """Fetch and display formatted summary for LLM."""
     summary = fetcher.get_news_summary(symbol, lookback_days=lookback_days)
 
-    print("\n" + "=" * 80)
+    print("\n" + SEP80)
     print(f"📝 News Summary for {symbol} (for LLM)")
-    print("=" * 80)
+    print(SEP80)
     print(summary)
-    print("=" * 80)
+    print(SEP80)
 
 
-def fetch_for_multiple_stocks(fetcher, symbols, lookback_days=1):
-    """Fetch news for multiple stocks."""
-    results = {}
+def fetch_for_multiple_stocks(fetcher, symbols, lookback_days=1, max_workers=8, as_json=False,
+                              use_cache=True):
+    """Fetch news for multiple stocks (network-bound, so symbols are fetched concurrently)."""
+    counts = {}
 
-    for symbol in symbols:
-        try:
-            articles = fetcher.get_news(
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                fetcher.get_news,
                 symbol=symbol,
                 lookback_days=lookback_days,
-                use_cache=True
-            )
-            results[symbol] = len(articles)
-        except Exception as e:
-            logger.error(f"Error fetching news for {symbol}: {e}")
-            results[symbol] = 0
+                use_cache=use_cache
+            ): symbol
+            for symbol in symbols
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                counts[symbol] = len(future.result())
+            except Exception as e:
+                logger.error(f"Error fetching news for {symbol}: {e}")
+                counts[symbol] = 0
+
+    # Report in the order the symbols were requested
+    results = [(symbol, counts.get(symbol, 0)) for symbol in symbols]
+
+    if as_json:
+        payload = {symbol: {'count': count} for symbol, count in results}
+        sys.stdout.write(json.dumps(payload) + "\n")
+        return
 
     # Show summary
-    print("\n" + "=" * 80)
-    print("📊 News Fetch Summary")
-    print("=" * 80)
-
-    for symbol, count in results.items():
-        print(f"{symbol:6s}: {count:3d} articles")
-
-    total = sum(results.values())
-    print(f"\nTotal: {total} articles across {len(symbols)} stocks")
+    lines = ["", SEP80, "📊 News Fetch Summary", SEP80]
+
+    total = 0
+    for symbol, count in results:
+        lines.append(f"{symbol:6s}: {count:3d} articles")
+        total += count
+
+    lines.append(f"\nTotal: {total} articles across {len(symbols)} stocks")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def load_watchlist(path):
+    """Read ticker symbols from a watchlist file, skipping blank lines and comments."""
+    try:
+        with open(path) as f:
+            lines = [line.split('#', 1)[0].strip().upper() for line in f]
+    except OSError as e:
+        logger.warning(f"Could not read watchlist {path}: {e}")
+        return []
+    return [symbol for symbol in lines if symbol]
+
+
+def prewarm_watchlist(fetcher, symbols, lookback_days=1, max_workers=16):
+    """
+    Warm the news cache for the watchlist on a background daemon thread.
+
+    Returns the thread so callers with nothing else to do can join it.
+    """
+    def warm():
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(fetcher.get_news, symbol=symbol, lookback_days=lookback_days, use_cache=True)
+                for symbol in symbols
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Watchlist pre-warm failed: {e}")
+        logger.info(f"Pre-warmed news for {len(symbols)} watchlist symbols in {time.perf_counter() - start:.1f}s")
+
+    thread = threading.Thread(target=warm, name="news-prewarm", daemon=True)
+    thread.start()
+    return thread
 
 
 def show_cache_stats(fetcher):
     """Display cache statistics."""
     stats = fetcher.get_cache_stats()
 
-    print("\n" + "=" * 80)
-    print("💾 News Cache Statistics")
-    print("=" * 80)
+    lines = ["", SEP80, "💾 News Cache Statistics", SEP80]
 
     if stats['num_cached'] == 0:
-        print("📂 Cache is empty")
-        print(f"   Location: {stats['cache_dir']}")
+        lines.append("📂 Cache is empty")
+        lines.append(f"   Location: {stats['cache_dir']}")
     else:
-        print(f"📂 Cache directory: {stats['cache_dir']}")
-        print(f"📊 Cached queries: {stats['num_cached']}")
-        print(f"💽 Total size: {stats['total_size_mb']:.2f} MB")
+        lines.append(f"📂 Cache directory: {stats['cache_dir']}")
+        lines.append(f"📊 Cached queries: {stats['num_cached']}")
+        lines.append(f"💽 Total size: {stats['total_size_mb']:.2f} MB")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def clear_cache(fetcher):
@@ -128,32 +203,39 @@ def clear_cache(fetcher):
 
 def test_sources(fetcher, symbol):
     """Test each news source individually."""
-    print("\n" + "=" * 80)
+    print("\n" + SEP80)
     print(f"🧪 Testing News Sources for {symbol}")
-    print("=" * 80)
+    print(SEP80)
+
+    # The enabled sources are independent HTTP round-trips, so probe them concurrently
+    tasks = [("rss", fetcher.fetch_from_rss)]
+    if fetcher.newsapi_enabled:
+        tasks.append(("newsapi", fetcher.fetch_from_newsapi))
+    if fetcher.av_enabled:
+        tasks.append(("alpha_vantage", fetcher.fetch_from_alpha_vantage))
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(fn, symbol, lookback_days=1) for name, fn in tasks}
 
     # Test RSS
     print("\n📡 Testing RSS Feeds...")
-    rss_articles = fetcher.fetch_from_rss(symbol, lookback_days=1)
-    print(f"   Found {len(rss_articles)} articles from RSS")
+    print(f"   Found {len(futures['rss'].result())} articles from RSS")
 
     # Test NewsAPI
     if fetcher.newsapi_enabled:
         print("\n📰 Testing NewsAPI...")
-        newsapi_articles = fetcher.fetch_from_newsapi(symbol, lookback_days=1)
-        print(f"   Found {len(newsapi_articles)} articles from NewsAPI")
+        print(f"   Found {len(futures['newsapi'].result())} articles from NewsAPI")
     else:
         print("\n📰 NewsAPI: Disabled")
 
     # Test Alpha Vantage
     if fetcher.av_enabled:
         print("\n📈 Testing Alpha Vantage News Sentiment...")
-        av_articles = fetcher.fetch_from_alpha_vantage(symbol, lookback_days=1)
-        print(f"   Found {len(av_articles)} articles from Alpha Vantage")
+        print(f"   Found {len(futures['alpha_vantage'].result())} articles from Alpha Vantage")
     else:
         print("\n📈 Alpha Vantage: API key not configured")
 
-    print("\n" + "=" * 80)
+    print("\n" + SEP80)
 
 
 def main():
@@ -183,6 +265,9 @@ Examples:
 
   # Clear cache
   python scripts/fetch_news.py --clear-cache
+
+  # Warm the cache for config/watchlist.txt
+  python scripts/fetch_news.py --prewarm-watchlist
         """
     )
 
@@ -202,11 +287,39 @@ Examples:
                        help='Show cache statistics')
     parser.add_argument('--clear-cache', action='store_true',
                        help='Clear news cache')
+    parser.add_argument('--cache-ttl', type=int,
+                       help='Seconds before cached news is refetched (default: 6 hours)')
+    parser.add_argument('--json', action='store_true',
+                       help='Print --symbols results as JSON instead of a formatted report')
+    parser.add_argument('--revalidate', action='store_true',
+                       help='Ignore the article cache TTL and recheck feeds (unchanged RSS feeds return 304)')
+    parser.add_argument('--prewarm-watchlist', nargs='?', const=str(WATCHLIST_PATH), metavar='PATH',
+                       help='Warm the news cache for a watchlist in the background '
+                            '(default file: config/watchlist.txt)')
 
     args = parser.parse_args()
 
+    # The warm-up would race the deletion
+    if args.prewarm_watchlist and args.clear_cache:
+        parser.error("--prewarm-watchlist cannot be combined with --clear-cache")
+
+    # Reports are written in blocks; don't flush on every newline when stdout is a TTY
+    sys.stdout.reconfigure(line_buffering=False)
+
+    # Deferred so --help doesn't pay for pandas/feedparser/newsapi
+    from src.data.news_data import NewsDataFetcher
+
     # Initialize fetcher
-    fetcher = NewsDataFetcher()
+    if args.cache_ttl is not None:
+        fetcher = NewsDataFetcher(cache_hours=args.cache_ttl / 3600)
+    else:
+        fetcher = NewsDataFetcher()
+
+    prewarm_thread = None
+    if args.prewarm_watchlist:
+        watchlist = load_watchlist(args.prewarm_watchlist)
+        if watchlist:
+            prewarm_thread = prewarm_watchlist(fetcher, watchlist, args.days)
 
     # Execute commands
     if args.stats:
@@ -222,15 +335,30 @@ Examples:
         fetch_summary(fetcher, args.symbol, args.days)
 
     elif args.symbol:
-        fetch_for_symbol(fetcher, args.symbol, args.days, not args.no_details)
+        fetch_for_symbol(fetcher, args.symbol, args.days, not args.no_details,
+                         use_cache=not args.revalidate)
 
     elif args.symbols:
-        fetch_for_multiple_stocks(fetcher, args.symbols, args.days)
+        fetch_for_multiple_stocks(fetcher, args.symbols, args.days, as_json=args.json,
+                                  use_cache=not args.revalidate)
+
+    elif prewarm_thread is not None:
+        # Nothing else to do: run as a plain cache warm-up (e.g. from cron)
+        prewarm_thread.join()
 
     else:
         parser.print_help()
         print("\n💡 Use --help for usage examples")
 
+    # Give a warm-up running alongside another command a bounded chance to
+    # finish instead of killing the daemon thread at interpreter exit
+    if prewarm_thread is not None and prewarm_thread.is_alive():
+        prewarm_thread.join(PREWARM_JOIN_TIMEOUT)
+        if prewarm_thread.is_alive():
+            logger.warning(f"Watchlist pre-warm still running after {PREWARM_JOIN_TIMEOUT}s; exiting without it")
+
+    sys.stdout.flush()
+
 
 if __name__ == "__main__":
     main()
@@ -8,26 +8,52 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data.price_data import PriceDataFetcher
-from src.data.universe import UniverseManager
 from loguru import logger
 import argparse
+import asyncio
+import json
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+
+
+# Report divider line
+SEP60 = "=" * 60
+
+
+@lru_cache(maxsize=1)
+def _universe():
+    """Shared UniverseManager, so the S&P 500 table is loaded once per process."""
+    from src.data.universe import UniverseManager
+    return UniverseManager()
+
+
+@lru_cache(maxsize=None)
+def _tickers(sector=None):
+    """Ticker symbols for a sector (or the whole universe), as an immutable tuple."""
+    universe = _universe()
+    return tuple(universe.get_tickers_by_sector(sector) if sector else universe.get_ticker_symbols())
+
+
+def _prewarm(fetcher, symbols):
+    """Fill the on-disk cache concurrently so the sequential fetch that follows only hits cache."""
+    before = fetcher.get_cache_stats()['num_cached']
+    asyncio.run(_fetch_all(fetcher, symbols, concurrency=min(16, max(8, len(symbols) // 4))))
+    after = fetcher.get_cache_stats()['num_cached']
+    logger.info(f"Pre-warmed price cache: {before} -> {after} cached stocks")
 
 
 def fetch_sample_stocks(fetcher, num_stocks=10):
     """Fetch data for a sample of S&P 500 stocks."""
     logger.info(f"Fetching sample of {num_stocks} stocks...")
 
-    # Get S&P 500 tickers
-    universe = UniverseManager()
-    all_tickers = universe.get_ticker_symbols()
-
-    # Take first N stocks
-    sample_tickers = all_tickers[:num_stocks]
+    # Take first N S&P 500 stocks without materializing the full symbol list
+    sample_tickers = list(islice(_universe().iter_tickers(), num_stocks))
 
     logger.info(f"Sample tickers: {sample_tickers}")
 
+    _prewarm(fetcher, sample_tickers)
+
     # Fetch data
     results = fetcher.get_multiple_stocks(
         symbols=sample_tickers,
@@ -37,9 +63,9 @@ def fetch_sample_stocks(fetcher, num_stocks=10):
     )
 
     # Show summary
-    print("\n" + "=" * 60)
+    print("\n" + SEP60)
     print("📊 Fetch Summary")
-    print("=" * 60)
+    print(SEP60)
 
     for symbol, df in results.items():
         if df is not None and not df.empty:
@@ -54,8 +80,7 @@ def fetch_by_sector(fetcher, sector_name, max_stocks=None):
     logger.info(f"Fetching stocks from sector: {sector_name}")
 
     # Get tickers for sector
-    universe = UniverseManager()
-    tickers = universe.get_tickers_by_sector(sector_name)
+    tickers = list(_tickers(sector_name))
 
     if not tickers:
         logger.error(f"No tickers found for sector: {sector_name}")
@@ -66,6 +91,8 @@ def fetch_by_sector(fetcher, sector_name, max_stocks=None):
 
     logger.info(f"Fetching {len(tickers)} stocks from {sector_name}")
 
+    _prewarm(fetcher, tickers)
+
     # Fetch data
     results = fetcher.get_multiple_stocks(
         symbols=tickers,
@@ -77,33 +104,63 @@ def fetch_by_sector(fetcher, sector_name, max_stocks=None):
     print(f"\n✅ Fetched {len(results)}/{len(tickers)} stocks from {sector_name}")
 
 
-def fetch_specific_stocks(fetcher, symbols, start_date=None, end_date=None):
+async def _fetch_all(fetcher, symbols, start_date=None, end_date=None, concurrency=16):
+    """Fetch price data for all symbols concurrently; results keep the input order."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(symbol):
+        async with semaphore:
+            return await fetcher.aget_price_data(
+                symbol=symbol,
+                use_cache=True,
+                source='auto',
+                start_date=start_date,
+                end_date=end_date
+            )
+
+    return await asyncio.gather(*(fetch_one(symbol) for symbol in symbols))
+
+
+def fetch_specific_stocks(fetcher, symbols, start_date=None, end_date=None, as_json=False):
     """Fetch data for specific stock symbols."""
     logger.info(f"Fetching {len(symbols)} specific stocks...")
 
-    results = fetcher.get_multiple_stocks(
-        symbols=symbols,
-        use_cache=True,
-        source='auto',
-        start_date=start_date,
-        end_date=end_date,
-        show_progress=True
-    )
+    frames = asyncio.run(_fetch_all(fetcher, symbols, start_date, end_date))
+    results = {
+        symbol: df for symbol, df in zip(symbols, frames)
+        if df is not None and not df.empty
+    }
+    logger.info(f"Successfully fetched data for {len(results)}/{len(symbols)} stocks")
+
+    if as_json:
+        payload = {}
+        for symbol in symbols:
+            df = results.get(symbol)
+            payload[symbol] = None if df is None else {
+                'range': [df.index[0].date(), df.index[-1].date()],
+                'days': len(df),
+                'latest_price': float(df['adjusted_close'].iloc[-1])
+            }
+        print(json.dumps(payload, default=str))
+        return
 
     # Show detailed info
-    print("\n" + "=" * 60)
+    print("\n" + SEP60)
     print("📊 Detailed Results")
-    print("=" * 60)
+    print(SEP60)
+
+    cols = ['open', 'high', 'low', 'close', 'adjusted_close', 'volume']
 
     for symbol in symbols:
         if symbol in results:
             df = results[symbol]
+            # Price frames are sorted by date, so the ends of the index are the range
             print(f"\n{symbol}:")
-            print(f"  Date range: {df.index.min().date()} to {df.index.max().date()}")
+            print(f"  Date range: {df.index[0].date()} to {df.index[-1].date()}")
             print(f"  Total days: {len(df)}")
             print(f"  Latest price: ${df['adjusted_close'].iloc[-1]:.2f}")
             print(f"  Recent data:")
-            print(df[['open', 'high', 'low', 'close', 'adjusted_close', 'volume']].tail(3).to_string())
+            print(df.iloc[-3:][cols].to_string())
         else:
             print(f"\n{symbol}: ❌ Failed to fetch")
 
@@ -112,9 +169,9 @@ def show_cache_stats(fetcher):
     """Display cache statistics."""
     stats = fetcher.get_cache_stats()
 
-    print("\n" + "=" * 60)
+    print("\n" + SEP60)
     print("💾 Cache Statistics")
-    print("=" * 60)
+    print(SEP60)
 
     if stats['num_cached'] == 0:
         print("📂 Cache is empty")
@@ -170,7 +227,7 @@ Examples:
     )
 
     parser.add_argument('--sample', type=int,
-                       help='Fetch a random sample of N stocks')
+                       help='Fetch the first N S&P 500 stocks')
     parser.add_argument('--symbols', nargs='+',
                        help='Specific stock symbols to fetch')
     parser.add_argument('--sector', type=str,
@@ -190,11 +247,21 @@ Examples:
     parser.add_argument('--source', type=str, default='auto',
                        choices=['auto', 'alpha_vantage', 'yfinance'],
                        help='Data source (default: auto)')
+    parser.add_argument('--cache-ttl', type=int,
+                       help='Seconds before cached prices are refetched (default: 1 day)')
+    parser.add_argument('--json', action='store_true',
+                       help='Print --symbols results as JSON instead of a formatted report')
 
     args = parser.parse_args()
 
+    # Deferred so --help doesn't pay for pandas/yfinance/alpha_vantage
+    from src.data.price_data import PriceDataFetcher
+
     # Initialize fetcher
-    fetcher = PriceDataFetcher()
+    if args.cache_ttl is not None:
+        fetcher = PriceDataFetcher(cache_days=args.cache_ttl / 86400)
+    else:
+        fetcher = PriceDataFetcher()
 
     # Execute commands
     if args.stats:
@@ -215,8 +282,9 @@ Examples:
         show_cache_stats(fetcher)
 
     elif args.symbols:
-        fetch_specific_stocks(fetcher, args.symbols, args.start, args.end)
-        show_cache_stats(fetcher)
+        fetch_specific_stocks(fetcher, args.symbols, args.start, args.end, as_json=args.json)
+        if not args.json:
+            show_cache_stats(fetcher)
 
     else:
         parser.print_help()
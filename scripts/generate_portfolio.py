@@ -10,13 +10,44 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import pandas as pd
-from datetime import datetime
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from loguru import logger
 
-from src.data import DataManager
-from src.strategy import EnhancedSelector, EnhancedPortfolioConstructor, VolatilityProtection
-from src.llm import LLMRiskScorer
+# pandas/numpy and the src.* packages are imported inside the functions that
+# use them, so `--help` and argument errors return without loading them
+
+
+# SPY market inputs per as-of date, so repeated runs in one process fetch once
+_SPY_CACHE = {}
+
+
+def _get_spy_cached(dm, asof_date: str):
+    """
+    SPY closes, daily returns and annualized 21-day volatility as of a date.
+
+    Returns:
+        Tuple of (spy_prices, spy_returns, recent_vol), or None if SPY is unavailable
+    """
+    import numpy as np
+    import pandas as pd
+
+    if asof_date not in _SPY_CACHE:
+        spy_data = dm.get_prices(['SPY'], use_cache=True, show_progress=False)
+        spy = spy_data.get('SPY')
+        if spy is None or spy.empty:
+            return None
+
+        spy_prices = spy['close']
+        spy_arr = spy_prices.to_numpy(dtype=np.float64)
+        rets = np.zeros(len(spy_arr))
+        rets[1:] = np.diff(spy_arr) / spy_arr[:-1]
+        spy_returns = pd.Series(rets, index=spy_prices.index)
+
+        recent_vol = rets[-21:].std(ddof=1) * np.sqrt(252)
+        _SPY_CACHE[asof_date] = (spy_prices, spy_returns, recent_vol)
+
+    return _SPY_CACHE[asof_date]
 
 
 def generate_current_portfolio(
@@ -36,7 +67,10 @@ def generate_current_portfolio(
     risk_reduction_factor: float = 0.5,
     store_prompts: bool = False,
     enable_research_mode: bool = False,
-    num_research_stocks: int = 10
+    num_research_stocks: int = 10,
+    max_concurrency: int = 10,
+    universe_size: int = 300,
+    use_batch_api: bool = False
 ):
     """
     Generate portfolio recommendations for current date.
@@ -57,14 +91,27 @@ def generate_current_portfolio(
         apply_risk_adjustment: Whether to reduce weights for high-risk stocks
         risk_threshold: Risk score above which to reduce weights
         risk_reduction_factor: How much to reduce high-risk weights
+        max_concurrency: Maximum number of LLM requests in flight at once
+        universe_size: Number of S&P 500 names to download prices for and rank
+        use_batch_api: Send risk-scoring and research-mode prompts through the
+                       OpenAI Batch API (half price, may take hours to finish)
 
     Returns:
         DataFrame with portfolio recommendations
     """
+    import pandas as pd
+    from src.data import DataManager
+    from src.strategy import EnhancedSelector, EnhancedPortfolioConstructor, VolatilityProtection
+    from src.llm import LLMRiskScorer
+
+    # One clock read for the whole run, so the portfolio date and export filename agree
+    now = pd.Timestamp.now()
+    today = now.strftime('%Y-%m-%d')
+
     logger.info("="*70)
     logger.info("PORTFOLIO GENERATION")
     logger.info("="*70)
-    logger.info(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info(f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info(f"Portfolio size: {portfolio_size}")
     logger.info(f"Base weighting: {base_weighting}")
     logger.info(f"LLM enhancement: {use_llm}")
@@ -102,7 +149,7 @@ def generate_current_portfolio(
 
     # Get universe
     logger.info("Fetching S&P 500 universe...")
-    universe = dm.get_universe()[:300]  # Top 300 for coverage
+    universe = dm.get_universe()[:universe_size]
     logger.info(f"Universe: {len(universe)} stocks")
 
     # Fetch price data
@@ -113,8 +160,6 @@ def generate_current_portfolio(
         show_progress=True
     )
 
-    today = datetime.now().strftime('%Y-%m-%d')
-
     # Enhanced selection with LLM
     if use_llm and selector:
         logger.info("\n" + "="*70)
@@ -183,15 +228,12 @@ def generate_current_portfolio(
         logger.info("="*70)
 
         try:
-            import numpy as np
             # Get SPY data for market regime detection
-            spy_data = dm.get_prices(['SPY'], use_cache=True, show_progress=False)
-            if 'SPY' in spy_data and not spy_data['SPY'].empty:
-                spy_prices = spy_data['SPY']['close']
-                spy_returns = spy_prices.pct_change().fillna(0)
+            spy = _get_spy_cached(dm, today)
+            if spy is not None:
+                spy_prices, spy_returns, recent_vol = spy
 
                 # Estimate VIX from SPY volatility (simplified)
-                recent_vol = spy_returns.tail(21).std() * np.sqrt(252)
                 estimated_vix = min(recent_vol * 100, 80)  # Scale to VIX-like range
 
                 logger.info(f"Estimated VIX: {estimated_vix:.1f}")
@@ -199,7 +241,7 @@ def generate_current_portfolio(
                 # Calculate strategy returns (use SPY as proxy)
                 momentum_returns = spy_returns.copy()
 
-                current_date = pd.Timestamp(today)
+                current_date = now.normalize()
 
                 # Apply protection
                 portfolio, protection_adjustments = constructor.apply_volatility_protection(
@@ -225,6 +267,9 @@ def generate_current_portfolio(
             import traceback
             traceback.print_exc()
 
+    # Portfolio news (5-day lookback), shared by risk scoring and research mode
+    news_data = None
+
     # Apply LLM risk scoring if enabled
     if enable_risk_scoring and use_llm:
         logger.info("\n" + "="*70)
@@ -253,7 +298,9 @@ def generate_current_portfolio(
                 news_data,
                 show_progress=False,
                 store_prompts=store_prompts,
-                prompt_store=prompt_store
+                prompt_store=prompt_store,
+                max_concurrency=max_concurrency,
+                use_batch_api=use_batch_api
             )
 
             logger.info(f"Average risk score: {portfolio['risk_score'].mean():.2f}")
@@ -276,6 +323,9 @@ def generate_current_portfolio(
             traceback.print_exc()
             logger.warning("Continuing without risk scores...")
 
+    # Weights are final from here on: sort once for research mode and display
+    portfolio = portfolio.sort_values('weight', ascending=False, ignore_index=True)
+
     # Generate research mode explanations for top holdings (Hybrid Approach)
     if enable_research_mode and use_llm:
         logger.info("\n" + "="*70)
@@ -284,9 +334,7 @@ def generate_current_portfolio(
         logger.info(f"Generating AI analysis for top {num_research_stocks} holdings...")
 
         try:
-            # Sort to get current top holdings
-            portfolio_sorted = portfolio.sort_values('weight', ascending=False)
-            top_holdings = portfolio_sorted.head(num_research_stocks)
+            top_holdings = portfolio.head(num_research_stocks)
 
             # Import scorer
             from src.llm import LLMScorer
@@ -296,65 +344,91 @@ def generate_current_portfolio(
             # Fetch data for top holdings
             symbols = top_holdings['symbol'].tolist()
 
-            # Get news
-            logger.info(f"Fetching news for {len(symbols)} stocks...")
-            news_data = dm.get_news(symbols, lookback_days=5, use_cache=True)
+            # Risk scoring already fetched news for the whole portfolio; reuse it
+            fetch_news = news_data is None or any(symbol not in news_data for symbol in symbols)
 
-            # Get earnings
-            logger.info(f"Fetching earnings for {len(symbols)} stocks...")
-            earnings_dict = dm.get_earnings(symbols, use_cache=True, show_progress=False)
+            # News, earnings and analyst data are independent I/O batches, so fetch them together
+            logger.info(
+                f"Fetching {'news, ' if fetch_news else ''}earnings and analyst data for {len(symbols)} stocks..."
+            )
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                if fetch_news:
+                    news_future = executor.submit(dm.get_news_parallel, symbols, lookback_days=5, use_cache=True)
+                earnings_future = executor.submit(dm.get_earnings, symbols, use_cache=True, show_progress=False)
+                analyst_future = executor.submit(dm.get_analyst_data, symbols, use_cache=True, show_progress=False)
 
-            # Get analyst data
-            logger.info(f"Fetching analyst data for {len(symbols)} stocks...")
-            analyst_dict = dm.get_analyst_data(symbols, use_cache=True, show_progress=False)
+                if fetch_news:
+                    news_data = news_future.result()
+                earnings_dict = earnings_future.result()
+                analyst_dict = analyst_future.result()
 
             # Score with research mode
-            logger.info(f"Scoring with research mode (this may take 30-60 seconds)...")
+            logger.info(f"Scoring with research mode...")
+
+            from src.llm.prompts import PromptTemplate
+
+            momentum_by_symbol = top_holdings.set_index('symbol')['momentum_return'].to_dict()
+            news_summaries = {
+                symbol: PromptTemplate.format_news_for_prompt(news_data.get(symbol, []))
+                for symbol in symbols
+            }
+
+            def research_request(symbol):
+                return {
+                    'symbol': symbol,
+                    'news_summary': news_summaries[symbol],
+                    'momentum_return': momentum_by_symbol[symbol],
+                    'earnings_data': earnings_dict.get(symbol),
+                    'analyst_data': analyst_dict.get(symbol)
+                }
+
+            if use_batch_api:
+                results = research_scorer.score_research_batch(
+                    [research_request(symbol) for symbol in symbols],
+                    return_prompt=store_prompts
+                )
+            else:
+                # Each call is an independent network-bound request, so run them concurrently;
+                # results (and prompt storage) are handled below on the main thread
+                results = {}
+                with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(symbols)))) as executor:
+                    futures = {
+                        executor.submit(
+                            research_scorer.score_stock_with_research,
+                            **research_request(symbol),
+                            return_prompt=store_prompts
+                        ): symbol
+                        for symbol in symbols
+                    }
+
+                    for future in as_completed(futures):
+                        symbol = futures[future]
+                        try:
+                            results[symbol] = future.result()
+                        except Exception as e:
+                            logger.warning(f"Failed to generate analysis for {symbol}: {e}")
 
             analyses = {}
-            for symbol in symbols:
-                try:
-                    # Get news summary
-                    from src.llm.prompts import PromptTemplate
-                    news_articles = news_data.get(symbol, [])
-                    news_summary = PromptTemplate.format_news_for_prompt(news_articles)
-
-                    # Get momentum
-                    momentum = portfolio_sorted[portfolio_sorted['symbol'] == symbol]['momentum_return'].iloc[0]
-
-                    # Score with research mode
-                    result = research_scorer.score_stock_with_research(
-                        symbol=symbol,
-                        news_summary=news_summary,
-                        momentum_return=momentum,
-                        earnings_data=earnings_dict.get(symbol),
-                        analyst_data=analyst_dict.get(symbol),
-                        return_prompt=store_prompts
-                    )
-
-                    if result:
-                        if store_prompts and len(result) == 4:
-                            raw_score, norm_score, analysis, prompt = result
-                            if prompt_store:
-                                prompt_store.store_prompt(
-                                    symbol=symbol,
-                                    prompt=prompt,
-                                    prompt_type='research_mode',
-                                    metadata={
-                                        'model': model or 'gpt-4o-mini',
-                                        'analysis': analysis,
-                                        'score': norm_score
-                                    }
-                                )
-                        else:
-                            raw_score, norm_score, analysis = result
-
-                        analyses[symbol] = analysis
-                        logger.info(f"  ✓ {symbol}: {len(analysis)} chars")
-
-                except Exception as e:
-                    logger.warning(f"Failed to generate analysis for {symbol}: {e}")
-                    continue
+            for symbol, result in results.items():
+                if result:
+                    if store_prompts and len(result) == 4:
+                        raw_score, norm_score, analysis, prompt = result
+                        if prompt_store:
+                            prompt_store.store_prompt(
+                                symbol=symbol,
+                                prompt=prompt,
+                                prompt_type='research_mode',
+                                metadata={
+                                    'model': model or 'gpt-4o-mini',
+                                    'analysis': analysis,
+                                    'score': norm_score
+                                }
+                            )
+                    else:
+                        raw_score, norm_score, analysis = result
+
+                    analyses[symbol] = analysis
+                    logger.info(f"  ✓ {symbol}: {len(analysis)} chars")
 
             # Add analyses to portfolio
             portfolio['ai_analysis'] = portfolio['symbol'].map(lambda s: analyses.get(s, None))
@@ -367,9 +441,6 @@ def generate_current_portfolio(
             traceback.print_exc()
             logger.warning("Continuing without research analyses...")
 
-    # Sort by weight
-    portfolio = portfolio.sort_values('weight', ascending=False)
-
     # Display results
     logger.info("\n" + "="*70)
     logger.info("PORTFOLIO RECOMMENDATIONS")
@@ -397,28 +468,34 @@ def generate_current_portfolio(
     if 'llm_score' in portfolio.columns:
         display_cols.append('llm_score')
 
-    top_20 = portfolio.head(20)[display_cols].copy()
-
-    # Format for display
-    top_20['weight'] = top_20['weight'].apply(lambda x: f"{x:.2%}")
-    top_20['momentum_return'] = top_20['momentum_return'].apply(lambda x: f"{x:.2%}")
-    if 'llm_score' in top_20.columns:
-        top_20['llm_score'] = top_20['llm_score'].apply(lambda x: f"{x:.3f}")
+    top_20 = portfolio.head(20)[display_cols]
 
-    print(top_20.to_string(index=False))
+    # Format at print time so top_20 keeps its numeric dtypes
+    print(top_20.to_string(index=False, formatters={
+        'weight': '{:.2%}'.format,
+        'momentum_return': '{:.2%}'.format,
+        'llm_score': '{:.3f}'.format
+    }))
 
     # Export to CSV
     if export_csv:
         output_dir = Path("results/portfolios")
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         strategy_name = f"{'enhanced' if use_llm else 'baseline'}_{base_weighting}"
         filename = output_dir / f"portfolio_{strategy_name}_{timestamp}.csv"
 
         portfolio.to_csv(filename, index=False)
         logger.info(f"\n✓ Portfolio saved to: {filename}")
 
+        # Binary copy for programmatic reloads: exact floats, column-selective reads
+        # (skipped when pyarrow isn't installed; the CSV is still written)
+        if importlib.util.find_spec('pyarrow') is not None:
+            parquet_file = filename.with_suffix('.parquet')
+            portfolio.to_parquet(parquet_file, compression='zstd', index=False)
+            logger.info(f"✓ Portfolio saved to: {parquet_file}")
+
     # Action items
     print(f"\n{'='*90}")
     print("NEXT STEPS FOR TRADING")
@@ -437,9 +514,9 @@ def generate_current_portfolio(
 
     example_capital = 100000
     print(f"Top 5 positions:\n")
-    for idx, row in portfolio.head(5).iterrows():
-        position_value = example_capital * row['weight']
-        print(f"  {row['symbol']:6} - {row['weight']:>6.2%} = ${position_value:>10,.2f}")
+    for row in portfolio.head(5).itertuples(index=False):
+        position_value = example_capital * row.weight
+        print(f"  {row.symbol:6} - {row.weight:>6.2%} = ${position_value:>10,.2f}")
 
     # Return portfolio and optional prompt store
     if store_prompts and prompt_store:
@@ -449,7 +526,7 @@ def generate_current_portfolio(
 
 
 def compare_with_current(
-    new_portfolio: pd.DataFrame,
+    new_portfolio: 'pd.DataFrame',
     current_holdings_csv: str = None
 ):
     """
@@ -457,28 +534,33 @@ def compare_with_current(
 
     Args:
         new_portfolio: New portfolio DataFrame
-        current_holdings_csv: Path to CSV with current holdings
+        current_holdings_csv: Path to CSV (or .parquet) with current holdings
     """
+    import pandas as pd
+
     if current_holdings_csv is None:
         logger.info("\nNo current holdings file provided. Skipping trade comparison.")
         logger.info("To compare with current holdings, pass current_holdings_csv parameter")
         return
 
     try:
-        current = pd.read_csv(current_holdings_csv)
+        if str(current_holdings_csv).endswith('.parquet'):
+            current = pd.read_parquet(current_holdings_csv, columns=['symbol'])
+        else:
+            current = pd.read_csv(current_holdings_csv)
 
         print(f"\n{'='*90}")
         print("TRADE COMPARISON")
         print(f"{'='*90}\n")
 
-        # Get symbols
-        current_symbols = set(current['symbol'].values)
-        new_symbols = set(new_portfolio['symbol'].values)
+        # Get symbols (Index set-ops run in C and return sorted, de-duplicated results)
+        current_symbols = pd.Index(current['symbol']).unique()
+        new_symbols = pd.Index(new_portfolio['symbol']).unique()
 
         # Calculate changes
-        sells = current_symbols - new_symbols
-        buys = new_symbols - current_symbols
-        holds = current_symbols & new_symbols
+        sells = current_symbols.difference(new_symbols)
+        buys = new_symbols.difference(current_symbols)
+        holds = current_symbols.intersection(new_symbols)
 
         print(f"Current positions: {len(current_symbols)}")
         print(f"New positions: {len(new_symbols)}")
@@ -487,16 +569,16 @@ def compare_with_current(
         print(f"  Buys: {len(buys)} positions")
         print(f"  Holds (rebalance): {len(holds)} positions")
 
-        if sells:
+        if len(sells):
             print(f"\nPositions to SELL:")
-            for symbol in sorted(sells):
+            for symbol in sells:
                 print(f"  - {symbol}")
 
-        if buys:
+        if len(buys):
             print(f"\nPositions to BUY:")
-            for symbol in sorted(buys):
-                weight = new_portfolio[new_portfolio['symbol'] == symbol]['weight'].values[0]
-                print(f"  + {symbol} ({weight:.2%})")
+            new_weights = new_portfolio.drop_duplicates('symbol').set_index('symbol')['weight']
+            for symbol in buys:
+                print(f"  + {symbol} ({new_weights[symbol]:.2%})")
 
         # Turnover calculation
         turnover = (len(sells) + len(buys)) / len(current_symbols)
@@ -546,11 +628,17 @@ def main():
         choices=['gpt-4o-mini', 'gpt-4o', 'gpt-4-turbo', 'gpt-4o-2024-11-20', 'o1-mini'],
         help='LLM model to use (default: gpt-4o-mini from config)'
     )
+    parser.add_argument(
+        '--universe-size',
+        type=int,
+        default=300,
+        help='Number of S&P 500 stocks to rank (default: 300)'
+    )
     parser.add_argument(
         '--current-holdings',
         type=str,
         default=None,
-        help='Path to CSV with current holdings for trade comparison'
+        help='Path to CSV or .parquet with current holdings for trade comparison'
     )
 
     args = parser.parse_args()
@@ -562,7 +650,8 @@ def main():
         use_llm=not args.no_llm,
         tilt_factor=args.tilt_factor,
         model=args.model,
-        export_csv=True
+        export_csv=True,
+        universe_size=args.universe_size
     )
 
     if portfolio is None:
@@ -5,12 +5,16 @@ Consolidates all data fetchers into a single interface for easy access.
 
 import pandas as pd
 import numpy as np
+import hashlib
+import json
+import os
 from pathlib import Path
 from datetime import datetime, timedelta
 from loguru import logger
 from typing import List, Dict, Optional, Tuple
 import yaml
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .universe import UniverseManager
 from .price_data import PriceDataFetcher
@@ -18,6 +22,16 @@ from .news_data import NewsDataFetcher
 from .earnings_data import EarningsDataFetcher
 from .analyst_data import AnalystDataFetcher
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None  # Price snapshots and research store disabled; per-symbol caches still apply
+
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None  # Universe lookups go to UniverseManager every time
+
 
 class DataManager:
     """
@@ -48,12 +62,15 @@ class DataManager:
             cache_dir=cache_dir,
             cache_days=7  # Universe changes infrequently
         )
+        self._universe_cache = TTLCache(maxsize=1, ttl=86400) if TTLCache else None
 
         self.price_fetcher = PriceDataFetcher(
             api_keys_path=api_keys_path,
             cache_dir=f"{cache_dir}/prices",
             cache_days=cache_config.get('price_cache_days', 1)
         )
+        self.price_snapshot_dir = Path(cache_dir) / "price_snapshots"
+        self.research_store_dir = Path(cache_dir) / "research_store"
 
         self.news_fetcher = NewsDataFetcher(
             api_keys_path=api_keys_path,
@@ -91,7 +108,16 @@ class DataManager:
         Returns:
             List of ticker symbols
         """
-        return self.universe_manager.get_ticker_symbols()
+        if self._universe_cache is None:
+            return self.universe_manager.get_ticker_symbols()
+
+        symbols = self._universe_cache.get('symbols')
+        if symbols is None:
+            symbols = self.universe_manager.get_ticker_symbols()
+            self._universe_cache['symbols'] = symbols
+
+        # Copy so callers can't mutate the cached list
+        return list(symbols)
 
     def get_universe_info(self) -> pd.DataFrame:
         """
@@ -139,7 +165,16 @@ class DataManager:
         """
         source = self.config.get('data_sources', {}).get('price_data', 'auto')
 
-        return self.price_fetcher.get_multiple_stocks(
+        snapshot_path = None
+        if use_cache and pq is not None:
+            snapshot_path = self._price_snapshot_path(symbols, source, start_date, end_date)
+            if snapshot_path.exists():
+                try:
+                    return self._load_price_snapshot(snapshot_path)
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable price snapshot {snapshot_path.name}: {e}")
+
+        price_data = self.price_fetcher.get_multiple_stocks(
             symbols=symbols,
             use_cache=use_cache,
             source=source,
@@ -148,6 +183,50 @@ class DataManager:
             show_progress=show_progress
         )
 
+        # Only snapshot complete fetches; symbols that failed (rate limit, timeout)
+        # would otherwise stay missing until tomorrow's snapshot key
+        if snapshot_path is not None and price_data and all(symbol in price_data for symbol in symbols):
+            self._save_price_snapshot(snapshot_path, price_data)
+
+        return price_data
+
+    def _price_snapshot_path(
+        self,
+        symbols: List[str],
+        source: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Path:
+        """Snapshot file for a symbol set / date range, valid for the current day."""
+        key_src = ",".join(sorted(symbols)) + f"|{source}|{start_date}|{end_date}"
+        key = hashlib.sha1(key_src.encode()).hexdigest()[:12]
+        today = datetime.now().strftime('%Y%m%d')
+        return self.price_snapshot_dir / f"{key}_{today}.parquet"
+
+    def _load_price_snapshot(self, path: Path) -> Dict[str, pd.DataFrame]:
+        """Load a combined price snapshot back into a symbol -> DataFrame dict."""
+        combined = pq.read_table(path, memory_map=True).to_pandas()
+        logger.info(f"Loaded price snapshot {path.name}")
+
+        return {
+            symbol: df.droplevel(0).dropna(axis=1, how='all')
+            for symbol, df in combined.groupby(level=0, sort=False)
+        }
+
+    def _save_price_snapshot(self, path: Path, price_data: Dict[str, pd.DataFrame]):
+        """Write all fetched frames to one parquet file and drop older snapshots."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            combined = pd.concat(price_data, names=['_symbol'])
+            combined.to_parquet(path, compression='zstd')
+
+            today_suffix = path.stem.rsplit('_', 1)[1]
+            for old in path.parent.glob("*.parquet"):
+                if not old.stem.endswith(today_suffix):
+                    old.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not write price snapshot: {e}")
+
     def get_prices_for_universe(
         self,
         start_date: Optional[str] = None,
@@ -221,7 +300,50 @@ class DataManager:
             Dictionary mapping symbols to lists of articles
         """
         results = {}
+        sources = self._news_sources()
+
+        for symbol in tqdm(symbols, desc="Fetching news"):
+            results[symbol] = self._fetch_news_one(symbol, lookback_days, sources, use_cache)
+
+        return results
+
+    def get_news_parallel(
+        self,
+        symbols: List[str],
+        lookback_days: int = 5,
+        use_cache: bool = True,
+        max_workers: int = 16
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get news for multiple symbols using a thread pool.
+
+        News fetching is network-bound, so overlapping the per-symbol
+        requests cuts wall-clock time roughly by the number of workers.
+
+        Args:
+            symbols: List of ticker symbols
+            lookback_days: Number of days to look back
+            use_cache: Whether to use cached data
+            max_workers: Number of concurrent fetch threads
 
+        Returns:
+            Dictionary mapping symbols to lists of articles (in input order)
+        """
+        sources = self._news_sources()
+        fetched = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_news_one, symbol, lookback_days, sources, use_cache): symbol
+                for symbol in symbols
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Fetching news"):
+                fetched[futures[future]] = future.result()
+
+        return {symbol: fetched[symbol] for symbol in symbols}
+
+    def _news_sources(self) -> List[str]:
+        """Map enabled news sources in config to NewsDataFetcher source names."""
         news_sources = self.config.get('data_sources', {}).get('news_sources', {})
         enabled_sources = [
             source for source, enabled in news_sources.items()
@@ -234,22 +356,26 @@ class DataManager:
             'newsapi': 'newsapi',
             'alpha_vantage_sentiment': 'alpha_vantage'
         }
-        sources = [source_mapping.get(s, s) for s in enabled_sources]
-
-        for symbol in tqdm(symbols, desc="Fetching news"):
-            try:
-                articles = self.news_fetcher.get_news(
-                    symbol=symbol,
-                    lookback_days=lookback_days,
-                    sources=sources,
-                    use_cache=use_cache
-                )
-                results[symbol] = articles
-            except Exception as e:
-                logger.error(f"Error fetching news for {symbol}: {e}")
-                results[symbol] = []
+        return [source_mapping.get(s, s) for s in enabled_sources]
 
-        return results
+    def _fetch_news_one(
+        self,
+        symbol: str,
+        lookback_days: int,
+        sources: List[str],
+        use_cache: bool
+    ) -> List[Dict]:
+        """Fetch news for one symbol, returning [] on error."""
+        try:
+            return self.news_fetcher.get_news(
+                symbol=symbol,
+                lookback_days=lookback_days,
+                sources=sources,
+                use_cache=use_cache
+            )
+        except Exception as e:
+            logger.error(f"Error fetching news for {symbol}: {e}")
+            return []
 
     def get_news_summary(
         self,
@@ -287,10 +413,13 @@ class DataManager:
         Returns:
             Dictionary mapping symbol -> earnings data
         """
-        return self.earnings_fetcher.get_earnings(
+        return self._get_with_store(
+            'earnings',
+            self.earnings_fetcher.get_earnings,
+            self.earnings_fetcher.cache_hours,
             symbols,
-            use_cache=use_cache,
-            show_progress=show_progress
+            use_cache,
+            show_progress
         )
 
     def get_earnings_for_symbol(
@@ -330,10 +459,13 @@ class DataManager:
         Returns:
             Dictionary mapping symbol -> analyst data
         """
-        return self.analyst_fetcher.get_analyst_data(
+        return self._get_with_store(
+            'analyst',
+            self.analyst_fetcher.get_analyst_data,
+            self.analyst_fetcher.cache_hours,
             symbols,
-            use_cache=use_cache,
-            show_progress=show_progress
+            use_cache,
+            show_progress
         )
 
     def get_analyst_data_for_symbol(
@@ -356,6 +488,93 @@ class DataManager:
             use_cache=use_cache
         )
 
+    def _get_with_store(
+        self,
+        kind: str,
+        fetch_fn,
+        cache_hours: int,
+        symbols: List[str],
+        use_cache: bool,
+        show_progress: bool
+    ) -> Dict[str, Dict]:
+        """
+        Serve a multi-symbol earnings/analyst request from the research store,
+        fetching only the symbols that are missing or stale.
+        """
+        cached = self._load_research_store(kind, symbols, cache_hours) if use_cache else {}
+        missing = [symbol for symbol in symbols if symbol not in cached]
+
+        fetched = {}
+        if missing:
+            fetched = fetch_fn(missing, use_cache=use_cache, show_progress=show_progress)
+            if use_cache and fetched:
+                self._save_research_store(kind, fetched)
+
+        return {
+            symbol: cached[symbol] if symbol in cached else fetched[symbol]
+            for symbol in symbols
+            if symbol in cached or symbol in fetched
+        }
+
+    def _research_store_path(self, kind: str) -> Path:
+        """One parquet file per data kind, one row per symbol."""
+        return self.research_store_dir / f"{kind}.parquet"
+
+    def _load_research_store(
+        self,
+        kind: str,
+        symbols: List[str],
+        cache_hours: int
+    ) -> Dict[str, Dict]:
+        """Read all fresh rows for the requested symbols in a single filtered scan."""
+        path = self._research_store_path(kind)
+        if pq is None or not path.exists():
+            return {}
+
+        cutoff = pd.Timestamp.now() - pd.Timedelta(hours=cache_hours)
+        try:
+            table = pq.read_table(
+                path,
+                columns=['symbol', 'payload'],
+                filters=[('symbol', 'in', list(symbols)), ('fetched_at', '>', cutoff)],
+                memory_map=True
+            )
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {kind} store: {e}")
+            return {}
+
+        cols = table.to_pydict()
+        logger.debug(f"Loaded {len(cols['symbol'])} {kind} rows from research store")
+        return {
+            symbol: json.loads(payload)
+            for symbol, payload in zip(cols['symbol'], cols['payload'])
+        }
+
+    def _save_research_store(self, kind: str, records: Dict[str, Dict]):
+        """Upsert freshly fetched rows; the store keeps one row (the latest fetch) per symbol."""
+        if pq is None:
+            return
+
+        path = self._research_store_path(kind)
+        new_rows = pd.DataFrame({
+            'symbol': list(records),
+            'fetched_at': pd.Timestamp.now(),
+            'payload': [json.dumps(data) for data in records.values()]
+        })
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                existing = pq.read_table(path, columns=list(new_rows.columns)).to_pandas()
+                existing = existing[~existing['symbol'].isin(new_rows['symbol'])]
+                new_rows = pd.concat([existing, new_rows], ignore_index=True)
+
+            tmp_path = path.with_suffix('.tmp')
+            new_rows.to_parquet(tmp_path, compression='zstd', index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write {kind} store: {e}")
+
     # ========== Combined Data Methods ==========
 
     def get_stock_data(
@@ -9,16 +9,24 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from loguru import logger
 from typing import List, Dict, Optional, Tuple
+import os
 import pickle
 import time
 import yaml
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from newsapi import NewsApiClient
 from bs4 import BeautifulSoup
 from urllib.parse import quote
 import hashlib
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class NewsDataFetcher:
     """Fetches news articles from multiple sources with caching."""
@@ -41,6 +49,21 @@ class NewsDataFetcher:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_hours = cache_hours
 
+        # One pooled session for all HTTP fetches so repeated symbols reuse
+        # keep-alive connections instead of a new TCP+TLS handshake each time
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = feedparser.USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Last RSS response per feed URL (validators + body) for conditional GETs
+        self._feeds = {}
+
         # Load API keys
         self.api_keys = self._load_api_keys(api_keys_path)
 
@@ -144,12 +167,77 @@ class NewsDataFetcher:
         """Save news data to cache."""
         cache_file = self._get_cache_path(cache_key)
 
+        # Write-then-rename so an interrupted write (e.g. a killed pre-warm
+        # thread) never leaves a truncated pickle behind
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{id(articles)}.tmp")
         try:
-            with open(cache_file, 'wb') as f:
+            with open(tmp_file, 'wb') as f:
                 pickle.dump(articles, f)
+            os.replace(tmp_file, cache_file)
             logger.debug(f"Saved {len(articles)} articles to cache")
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
+            tmp_file.unlink(missing_ok=True)
+
+    def _get_feed(self, feed_url: str) -> bytes:
+        """
+        Download an RSS feed, revalidating against the last stored copy.
+
+        Sends If-None-Match / If-Modified-Since from the previous response so
+        an unchanged feed comes back as a bodyless 304. The stored copy is kept
+        on disk next to the article cache so revalidation also works across runs.
+
+        Args:
+            feed_url: RSS feed URL
+
+        Returns:
+            Raw feed body
+        """
+        feed_file = self.cache_dir / f"feed_{hashlib.md5(feed_url.encode()).hexdigest()}.pkl"
+
+        stored = self._feeds.get(feed_url)
+        if stored is None and feed_file.exists():
+            try:
+                with open(feed_file, 'rb') as f:
+                    stored = pickle.load(f)
+            except Exception as e:
+                logger.debug(f"Ignoring unreadable feed cache {feed_file}: {e}")
+
+        headers = {}
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+
+        response = self.session.get(feed_url, headers=headers, timeout=30)
+
+        if response.status_code == 304 and stored:
+            logger.debug(f"RSS feed not modified: {feed_url}")
+            self._feeds[feed_url] = stored
+            return stored['content']
+
+        if not response.ok:
+            return response.content
+
+        stored = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content': response.content
+        }
+        self._feeds[feed_url] = stored
+
+        if stored['etag'] or stored['last_modified']:
+            # Write-then-rename so concurrent symbol fetches never see a partial file
+            tmp_file = feed_file.with_suffix(f".{os.getpid()}.{id(stored)}.tmp")
+            try:
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump(stored, f)
+                os.replace(tmp_file, feed_file)
+            except Exception as e:
+                logger.debug(f"Could not save feed cache {feed_file}: {e}")
+
+        return stored['content']
 
     def fetch_from_rss(
         self,
@@ -177,7 +265,7 @@ class NewsDataFetcher:
         for feed_url in feeds_to_check:
             try:
                 logger.debug(f"Fetching RSS feed: {feed_url}")
-                feed = feedparser.parse(feed_url)
+                feed = feedparser.parse(self._get_feed(feed_url))
 
                 for entry in feed.entries:
                     # Parse publication date
@@ -333,8 +421,8 @@ class NewsDataFetcher:
             )
 
             logger.debug(f"Fetching Alpha Vantage news for {symbol}")
-            response = requests.get(url, timeout=30)
-            data = response.json()
+            response = self.session.get(url, timeout=30)
+            data = orjson.loads(response.content) if orjson else response.json()
 
             if 'feed' in data:
                 for item in data['feed']:
@@ -525,19 +613,25 @@ class NewsDataFetcher:
 
     def get_cache_stats(self) -> Dict:
         """Get statistics about cached news data."""
-        cache_files = list(self.cache_dir.glob("news_*.pkl"))
-
-        if not cache_files:
+        # One directory scan; DirEntry caches the stat result per file
+        with os.scandir(self.cache_dir) as it:
+            sizes = [
+                entry.stat().st_size
+                for entry in it
+                if entry.name.startswith('news_') and entry.name.endswith('.pkl') and entry.is_file()
+            ]
+
+        if not sizes:
             return {
                 'num_cached': 0,
                 'cache_dir': str(self.cache_dir),
                 'total_size_mb': 0
             }
 
-        total_size = sum(f.stat().st_size for f in cache_files)
+        total_size = sum(sizes)
 
         return {
-            'num_cached': len(cache_files),
+            'num_cached': len(sizes),
             'cache_dir': str(self.cache_dir),
             'total_size_mb': total_size / (1024 * 1024)
         }
@@ -547,6 +641,9 @@ class NewsDataFetcher:
         cache_files = list(self.cache_dir.glob("news_*.pkl"))
         for f in cache_files:
             f.unlink()
+        for f in self.cache_dir.glob("feed_*.pkl"):
+            f.unlink()
+        self._feeds.clear()
         logger.info(f"Cleared {len(cache_files)} cached news files")
 
 
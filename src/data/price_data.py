@@ -3,6 +3,9 @@ Stock Price Data Fetcher
 Fetches historical stock prices from Alpha Vantage and yfinance with caching.
 """
 
+import asyncio
+import os
+import threading
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -51,8 +54,9 @@ class PriceDataFetcher:
             self.av_enabled = False
             logger.warning("Alpha Vantage API key not configured, using yfinance only")
 
-        # Rate limiting
+        # Rate limiting (the lock keeps concurrent fetches spaced out)
         self.last_av_call = 0
+        self._av_lock = threading.Lock()
         self.av_calls_per_minute = self.api_keys.get('rate_limits', {}).get('alpha_vantage_calls_per_minute', 5)
         self.min_call_interval = 60.0 / self.av_calls_per_minute
 
@@ -97,12 +101,12 @@ class PriceDataFetcher:
         if not cache_file.exists():
             return False
 
-        # Check file age
+        # Check file age (fractional days, so sub-day TTLs work)
         file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        age_days = (datetime.now() - file_time).days
+        age_days = (datetime.now() - file_time).total_seconds() / 86400
 
         if age_days > self.cache_days:
-            logger.debug(f"Cache for {symbol} is {age_days} days old (max: {self.cache_days})")
+            logger.debug(f"Cache for {symbol} is {age_days:.1f} days old (max: {self.cache_days})")
             return False
 
         return True
@@ -136,13 +140,14 @@ class PriceDataFetcher:
         if not self.av_enabled:
             return
 
-        elapsed = time.time() - self.last_av_call
-        if elapsed < self.min_call_interval:
-            wait_time = self.min_call_interval - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.1f}s")
-            time.sleep(wait_time)
+        with self._av_lock:
+            elapsed = time.time() - self.last_av_call
+            if elapsed < self.min_call_interval:
+                wait_time = self.min_call_interval - elapsed
+                logger.debug(f"Rate limiting: waiting {wait_time:.1f}s")
+                time.sleep(wait_time)
 
-        self.last_av_call = time.time()
+            self.last_av_call = time.time()
 
     def fetch_from_alpha_vantage(
         self,
@@ -310,6 +315,30 @@ class PriceDataFetcher:
 
         return data
 
+    async def aget_price_data(
+        self,
+        symbol: str,
+        use_cache: bool = True,
+        source: str = 'auto',
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Async version of get_price_data.
+
+        yfinance and the Alpha Vantage client are blocking, so the fetch runs
+        in a worker thread; gathering many of these overlaps the network waits.
+        Alpha Vantage calls stay rate limited across threads.
+        """
+        return await asyncio.to_thread(
+            self.get_price_data,
+            symbol=symbol,
+            use_cache=use_cache,
+            source=source,
+            start_date=start_date,
+            end_date=end_date
+        )
+
     def get_multiple_stocks(
         self,
         symbols: List[str],
@@ -381,7 +410,13 @@ class PriceDataFetcher:
 
     def get_cache_stats(self) -> Dict:
         """Get statistics about cached data."""
-        cache_files = list(self.cache_dir.glob("*.pkl"))
+        # One directory scan; each DirEntry stats once and caches the result
+        with os.scandir(self.cache_dir) as it:
+            cache_files = [
+                (entry.name[:-4], entry.stat())
+                for entry in it
+                if entry.name.endswith('.pkl') and entry.is_file()
+            ]
 
         if not cache_files:
             return {
@@ -390,21 +425,20 @@ class PriceDataFetcher:
                 'total_size_mb': 0
             }
 
-        total_size = sum(f.stat().st_size for f in cache_files)
+        total_size = sum(st.st_size for _, st in cache_files)
 
         # Find oldest and newest
-        file_times = [(f, datetime.fromtimestamp(f.stat().st_mtime)) for f in cache_files]
-        oldest = min(file_times, key=lambda x: x[1])
-        newest = max(file_times, key=lambda x: x[1])
+        oldest = min(cache_files, key=lambda x: x[1].st_mtime)
+        newest = max(cache_files, key=lambda x: x[1].st_mtime)
 
         return {
             'num_cached': len(cache_files),
             'cache_dir': str(self.cache_dir),
             'total_size_mb': total_size / (1024 * 1024),
-            'oldest_file': oldest[0].stem,
-            'oldest_date': oldest[1].strftime('%Y-%m-%d %H:%M:%S'),
-            'newest_file': newest[0].stem,
-            'newest_date': newest[1].strftime('%Y-%m-%d %H:%M:%S')
+            'oldest_file': oldest[0],
+            'oldest_date': datetime.fromtimestamp(oldest[1].st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            'newest_file': newest[0],
+            'newest_date': datetime.fromtimestamp(newest[1].st_mtime).strftime('%Y-%m-%d %H:%M:%S')
         }
 
     def clear_cache(self, symbol: Optional[str] = None):
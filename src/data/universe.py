@@ -8,7 +8,7 @@ import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 from loguru import logger
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 import pickle
 
 
@@ -230,6 +230,21 @@ class UniverseManager:
 
         return df['symbol'].tolist()
 
+    def iter_tickers(self) -> Iterator[str]:
+        """
+        Iterate over S&P 500 ticker symbols without building a list.
+
+        Yields:
+            Ticker symbols in universe order
+        """
+        df = self.get_sp500_tickers()
+
+        if 'symbol' not in df.columns:
+            logger.error("Symbol column not found")
+            return
+
+        yield from df['symbol']
+
     def refresh_cache(self):
         """Force refresh of cached ticker data."""
         logger.info("Forcing cache refresh")
@@ -0,0 +1,98 @@
+"""
+OpenAI Batch API Helper
+
+Submits many chat completions as one batch job and waits for the results.
+Batch jobs are billed at half the synchronous rate and are not subject to
+the per-minute request limits, at the cost of latency (up to the 24h
+completion window). Suited to scheduled, non-interactive runs.
+"""
+
+import io
+import json
+import time
+from typing import Dict, Optional
+from loguru import logger
+
+
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+def run_chat_batch(
+    client,
+    requests: Dict[str, Dict],
+    poll_interval: float = 30.0,
+    max_wait: float = 24 * 3600
+) -> Dict[str, Optional[str]]:
+    """
+    Run chat completion requests through the Batch API.
+
+    Args:
+        client: OpenAI client
+        requests: Mapping of custom_id -> chat completion request body
+                  (model, messages, temperature, ...)
+        poll_interval: Seconds between status checks
+        max_wait: Give up (and cancel the batch) after this many seconds
+
+    Returns:
+        Dictionary mapping custom_id -> response text, or None for requests
+        that failed or did not finish
+    """
+    results = {custom_id: None for custom_id in requests}
+    if not requests:
+        return results
+
+    lines = [
+        json.dumps({
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': body
+        })
+        for custom_id, body in requests.items()
+    ]
+    payload = io.BytesIO(("\n".join(lines) + "\n").encode())
+    payload.name = "requests.jsonl"
+
+    input_file = client.files.create(file=payload, purpose='batch')
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h'
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+
+    deadline = time.monotonic() + max_wait
+    while batch.status not in TERMINAL_STATUSES:
+        if time.monotonic() > deadline:
+            logger.warning(f"Batch {batch.id} still {batch.status} after {max_wait:.0f}s, cancelling")
+            client.batches.cancel(batch.id)
+            return results
+
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        if counts is not None:
+            logger.info(f"Batch {batch.id}: {batch.status} ({counts.completed}/{counts.total} done)")
+
+    if batch.status != 'completed':
+        logger.error(f"Batch {batch.id} ended with status {batch.status}")
+
+    # Expired batches can still have partial output
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            response = entry.get('response') or {}
+            if response.get('status_code') != 200:
+                continue
+            try:
+                results[entry['custom_id']] = response['body']['choices'][0]['message']['content'].strip()
+            except (KeyError, IndexError, TypeError):
+                continue
+
+    failed = sum(1 for text in results.values() if text is None)
+    if failed:
+        logger.warning(f"Batch {batch.id}: {failed}/{len(results)} requests returned no result")
+
+    return results
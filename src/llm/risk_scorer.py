@@ -5,12 +5,30 @@ Analyzes news sentiment to detect risk signals for individual stocks.
 Complements the portfolio-level volatility protection with stock-level risk assessment.
 """
 
+import asyncio
+import json
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import os
 
+from .batch_api import run_chat_batch
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2)
+
 
 class LLMRiskScorer:
     """
@@ -61,6 +79,43 @@ Respond in JSON format:
 }}
 
 If news is insufficient or mostly positive, score should be low (0.0-0.3).
+"""
+
+    NO_NEWS_PROMPT = """You are a financial risk analyst. Analyze the following recent news for {symbol} and assess risk signals.
+
+Recent News:
+No recent news available.
+
+Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
+
+    BATCH_RISK_PROMPT = """You are a financial risk analyst. For each of the following stocks, analyze its recent news and assess risk signals.
+
+Evaluate each stock on financial, operational, regulatory, competitive and market risk (LOW, MEDIUM or HIGH),
+then give an overall risk score from 0.0 (very safe) to 1.0 (very risky), the key risk, and a recommendation:
+HOLD (safe), REDUCE (moderate risk), or SELL (high risk).
+
+If news is insufficient or mostly positive, score should be low (0.0-0.3).
+
+Stocks:
+{stocks}
+
+Respond in JSON format with one entry per stock:
+{{
+    "stocks": [
+        {{
+            "symbol": "TICKER",
+            "financial_risk": "LOW/MEDIUM/HIGH",
+            "operational_risk": "LOW/MEDIUM/HIGH",
+            "regulatory_risk": "LOW/MEDIUM/HIGH",
+            "competitive_risk": "LOW/MEDIUM/HIGH",
+            "market_risk": "LOW/MEDIUM/HIGH",
+            "overall_risk_score": 0.0-1.0,
+            "key_risk": "Brief description or 'None'",
+            "recommendation": "HOLD/REDUCE/SELL",
+            "reasoning": "Brief explanation"
+        }}
+    ]
+}}
 """
 
     def __init__(self, model: str = "gpt-4o-mini", api_keys_path: str = "config/api_keys.yaml"):
@@ -111,9 +166,41 @@ If news is insufficient or mostly positive, score should be low (0.0-0.3).
                 "  3. Config file: config/api_keys.yaml"
             )
 
+        self._api_key = api_key
         self.client = OpenAI(api_key=api_key)
         logger.info(f"LLMRiskScorer initialized with model: {model}")
 
+    def _default_risk(self, symbol: str, key_risk: str, reasoning: str) -> Dict:
+        """Neutral (0.5) assessment used when news is missing or the call fails."""
+        return {
+            'symbol': symbol,
+            'overall_risk_score': 0.5,
+            'key_risk': key_risk,
+            'recommendation': 'HOLD',
+            'financial_risk': 'MEDIUM',
+            'operational_risk': 'MEDIUM',
+            'regulatory_risk': 'MEDIUM',
+            'competitive_risk': 'MEDIUM',
+            'market_risk': 'MEDIUM',
+            'reasoning': reasoning
+        }
+
+    def _build_risk_prompt(self, symbol: str, news_articles: List[str], max_articles: int) -> str:
+        """Format the risk assessment prompt for one symbol."""
+        news_sample = news_articles[:max_articles]
+        news_text = "\n\n".join([f"Article {i+1}: {article}" for i, article in enumerate(news_sample)])
+
+        return self.RISK_ASSESSMENT_PROMPT.format(
+            symbol=symbol,
+            news=news_text
+        )
+
+    def _risk_messages(self, prompt: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": "You are a financial risk analyst providing objective risk assessments."},
+            {"role": "user", "content": prompt}
+        ]
+
     def score_stock_risk(
         self,
         symbol: str,
@@ -134,55 +221,31 @@ If news is insufficient or mostly positive, score should be low (0.0-0.3).
         """
         if not news_articles or len(news_articles) == 0:
             # No news - assume neutral risk
-            result = {
-                'symbol': symbol,
-                'overall_risk_score': 0.5,
-                'key_risk': 'Insufficient news data',
-                'recommendation': 'HOLD',
-                'financial_risk': 'MEDIUM',
-                'operational_risk': 'MEDIUM',
-                'regulatory_risk': 'MEDIUM',
-                'competitive_risk': 'MEDIUM',
-                'market_risk': 'MEDIUM',
-                'reasoning': 'No recent news available for analysis'
-            }
+            result = self._default_risk(symbol, 'Insufficient news data', 'No recent news available for analysis')
 
             # Include placeholder prompt if requested
             if return_prompt:
-                result['risk_prompt'] = f"""You are a financial risk analyst. Analyze the following recent news for {symbol} and assess risk signals.
-
-Recent News:
-No recent news available.
-
-Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
+                result['risk_prompt'] = self.NO_NEWS_PROMPT.format(symbol=symbol)
 
             return result
 
-        # Limit number of articles
-        news_sample = news_articles[:max_articles]
-        news_text = "\n\n".join([f"Article {i+1}: {article}" for i, article in enumerate(news_sample)])
-
-        prompt = self.RISK_ASSESSMENT_PROMPT.format(
-            symbol=symbol,
-            news=news_text
-        )
+        prompt = self._build_risk_prompt(symbol, news_articles, max_articles)
 
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a financial risk analyst providing objective risk assessments."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._risk_messages(prompt),
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
 
-            import json
-            result = json.loads(response.choices[0].message.content)
+            result = _json_loads(response.choices[0].message.content)
             result['symbol'] = symbol
 
-            logger.info(f"{symbol}: Risk Score = {result['overall_risk_score']:.2f}, Recommendation = {result['recommendation']}")
+            logger.info(
+                "{}: Risk Score = {:.2f}, Recommendation = {}",
+                symbol, result['overall_risk_score'], result['recommendation']
+            )
 
             if return_prompt:
                 result['risk_prompt'] = prompt
@@ -191,18 +254,7 @@ Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
 
         except Exception as e:
             logger.error(f"Error scoring risk for {symbol}: {e}")
-            result = {
-                'symbol': symbol,
-                'overall_risk_score': 0.5,
-                'key_risk': f'Error: {str(e)}',
-                'recommendation': 'HOLD',
-                'financial_risk': 'MEDIUM',
-                'operational_risk': 'MEDIUM',
-                'regulatory_risk': 'MEDIUM',
-                'competitive_risk': 'MEDIUM',
-                'market_risk': 'MEDIUM',
-                'reasoning': 'Error during analysis'
-            }
+            result = self._default_risk(symbol, f'Error: {str(e)}', 'Error during analysis')
 
             # Include prompt even for errors if requested
             if return_prompt:
@@ -210,13 +262,75 @@ Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
 
             return result
 
+    async def ascore_stock_risk(
+        self,
+        symbol: str,
+        news_articles: List[str],
+        max_articles: int = 5,
+        return_prompt: bool = False,
+        client: Optional[AsyncOpenAI] = None
+    ) -> Dict:
+        """
+        Async version of score_stock_risk using the AsyncOpenAI client.
+
+        Args:
+            symbol: Stock ticker symbol
+            news_articles: List of recent news article texts
+            max_articles: Maximum number of articles to analyze
+            client: AsyncOpenAI client to use; if None, one is opened
+                    (and closed) just for this call
+
+        Returns:
+            Dictionary with risk scores and assessment
+        """
+        if not news_articles:
+            result = self._default_risk(symbol, 'Insufficient news data', 'No recent news available for analysis')
+            if return_prompt:
+                result['risk_prompt'] = self.NO_NEWS_PROMPT.format(symbol=symbol)
+            return result
+
+        if client is None:
+            async with AsyncOpenAI(api_key=self._api_key) as client:
+                return await self.ascore_stock_risk(
+                    symbol, news_articles, max_articles, return_prompt, client=client
+                )
+
+        prompt = self._build_risk_prompt(symbol, news_articles, max_articles)
+
+        try:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=self._risk_messages(prompt),
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+
+            result = _json_loads(response.choices[0].message.content)
+            result['symbol'] = symbol
+
+            logger.info(
+                "{}: Risk Score = {:.2f}, Recommendation = {}",
+                symbol, result['overall_risk_score'], result['recommendation']
+            )
+
+        except Exception as e:
+            logger.error(f"Error scoring risk for {symbol}: {e}")
+            result = self._default_risk(symbol, f'Error: {str(e)}', 'Error during analysis')
+
+        if return_prompt:
+            result['risk_prompt'] = prompt
+
+        return result
+
     def score_portfolio_risks(
         self,
         portfolio: pd.DataFrame,
         news_data: Dict[str, List[str]],
         show_progress: bool = True,
         store_prompts: bool = False,
-        prompt_store = None
+        prompt_store = None,
+        max_concurrency: int = 1,
+        use_batch_api: bool = False
     ) -> pd.DataFrame:
         """
         Score risk for all stocks in a portfolio.
@@ -225,6 +339,10 @@ Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
             portfolio: Portfolio DataFrame with 'symbol' column
             news_data: Dictionary mapping symbol -> list of news articles
             show_progress: Whether to show progress
+            max_concurrency: Number of requests in flight at once; values
+                above 1 score symbols concurrently via the async client
+            use_batch_api: Submit all requests as one OpenAI batch job
+                (half price, but can take up to 24h to complete)
 
         Returns:
             Portfolio DataFrame with risk scores added
@@ -236,34 +354,266 @@ Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
             from .prompt_store import get_prompt_store
             prompt_store = get_prompt_store()
 
-        risk_scores = []
+        if use_batch_api:
+            risk_scores = self._score_symbols_batch_api(
+                portfolio['symbol'], news_data, return_prompt=store_prompts
+            )
+        elif max_concurrency > 1:
+            risk_scores = asyncio.run(self._ascore_symbols(
+                portfolio['symbol'], news_data, max_concurrency, return_prompt=store_prompts
+            ))
+        else:
+            risk_scores = []
+
+            for idx, row in portfolio.iterrows():
+                symbol = row['symbol']
+
+                if show_progress:
+                    logger.info("Analyzing risk for {} ({}/{})", symbol, idx + 1, len(portfolio))
+
+                # Get news for this stock
+                news = news_data.get(symbol, [])
+
+                # Score risk (with prompt return if storing)
+                risk_scores.append(self.score_stock_risk(symbol, news, return_prompt=store_prompts))
+
+        # Store prompts if requested (serially; the store is not thread-safe)
+        if store_prompts and prompt_store:
+            for risk_assessment in risk_scores:
+                if 'risk_prompt' in risk_assessment:
+                    prompt_store.store_prompt(
+                        symbol=risk_assessment['symbol'],
+                        prompt=risk_assessment['risk_prompt'],
+                        prompt_type='risk_scoring',
+                        metadata={
+                            'model': self.model,
+                            'risk_score': risk_assessment['overall_risk_score']
+                        }
+                    )
+
+        return self._attach_risk_scores(portfolio, risk_scores)
+
+    def score_portfolio_risks_batched(
+        self,
+        portfolio: pd.DataFrame,
+        news_data: Dict[str, List[str]],
+        batch_size: int = 8,
+        max_articles: int = 5
+    ) -> pd.DataFrame:
+        """
+        Score risk for all stocks, sending several symbols per LLM call.
+
+        The shared instructions are sent once per batch instead of once per
+        symbol. Symbols missing from (or unparseable in) a batch response are
+        retried individually with score_stock_risk.
+
+        Args:
+            portfolio: Portfolio DataFrame with 'symbol' column
+            news_data: Dictionary mapping symbol -> list of news articles
+            batch_size: Number of symbols per request
+            max_articles: Maximum number of articles per symbol
 
-        for idx, row in portfolio.iterrows():
-            symbol = row['symbol']
+        Returns:
+            Portfolio DataFrame with risk scores added
+        """
+        symbols = portfolio['symbol'].tolist()
+        logger.info(f"Scoring risk for {len(symbols)} stocks in batches of {batch_size}...")
+
+        results = {}
+        with_news = []
+        for symbol in symbols:
+            if news_data.get(symbol):
+                with_news.append(symbol)
+            else:
+                results[symbol] = self._default_risk(
+                    symbol, 'Insufficient news data', 'No recent news available for analysis'
+                )
 
-            if show_progress:
-                logger.info(f"Analyzing risk for {symbol} ({idx+1}/{len(portfolio)})")
+        for start in range(0, len(with_news), batch_size):
+            batch = with_news[start:start + batch_size]
+            results.update(self._score_risk_batch(batch, news_data, max_articles))
 
-            # Get news for this stock
-            news = news_data.get(symbol, [])
+            # Fall back to one call per symbol for anything the batch missed
+            for symbol in batch:
+                if symbol not in results:
+                    results[symbol] = self.score_stock_risk(symbol, news_data[symbol], max_articles)
 
-            # Score risk (with prompt return if storing)
-            risk_assessment = self.score_stock_risk(symbol, news, return_prompt=store_prompts)
+        return self._attach_risk_scores(portfolio, [results[symbol] for symbol in symbols])
 
-            # Store prompt if requested
-            if store_prompts and prompt_store and 'risk_prompt' in risk_assessment:
-                prompt_store.store_prompt(
-                    symbol=symbol,
-                    prompt=risk_assessment['risk_prompt'],
-                    prompt_type='risk_scoring',
-                    metadata={
-                        'model': self.model,
-                        'risk_score': risk_assessment['overall_risk_score']
-                    }
+    def _score_risk_batch(
+        self,
+        batch: List[str],
+        news_data: Dict[str, List[str]],
+        max_articles: int
+    ) -> Dict[str, Dict]:
+        """Score one batch of symbols in a single call; returns only valid results."""
+        stocks = [
+            {'symbol': symbol, 'news': [str(article) for article in news_data[symbol][:max_articles]]}
+            for symbol in batch
+        ]
+        prompt = self.BATCH_RISK_PROMPT.format(stocks=_json_dumps(stocks))
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._risk_messages(prompt),
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            entries = _json_loads(response.choices[0].message.content).get('stocks', [])
+        except Exception as e:
+            logger.warning(f"Batch risk scoring failed for {batch}, retrying individually: {e}")
+            return {}
+
+        required = ('overall_risk_score', 'recommendation', 'key_risk',
+                    'financial_risk', 'operational_risk', 'regulatory_risk')
+        wanted = set(batch)
+        results = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            symbol = entry.get('symbol')
+            if symbol in wanted and all(key in entry for key in required):
+                try:
+                    entry['overall_risk_score'] = float(entry['overall_risk_score'])
+                except (TypeError, ValueError):
+                    continue
+                results[symbol] = entry
+                logger.info(
+                    "{}: Risk Score = {:.2f}, Recommendation = {}",
+                    symbol, entry['overall_risk_score'], entry['recommendation']
                 )
 
-            risk_scores.append(risk_assessment)
+        return results
+
+    async def ascore_portfolio_risks(
+        self,
+        portfolio: pd.DataFrame,
+        news_data: Dict[str, List[str]],
+        concurrency: int = 16
+    ) -> pd.DataFrame:
+        """
+        Score risk for all stocks in a portfolio with concurrent LLM requests.
+
+        Same output as score_portfolio_risks, but the per-symbol calls are
+        issued together (at most `concurrency` in flight) instead of one
+        round-trip at a time.
+
+        Args:
+            portfolio: Portfolio DataFrame with 'symbol' column
+            news_data: Dictionary mapping symbol -> list of news articles
+            concurrency: Maximum number of in-flight requests
+
+        Returns:
+            Portfolio DataFrame with risk scores added
+        """
+        logger.info(f"Scoring risk for {len(portfolio)} stocks (concurrency={concurrency})...")
+
+        risk_scores = await self._ascore_symbols(portfolio['symbol'], news_data, concurrency)
+
+        return self._attach_risk_scores(portfolio, risk_scores)
+
+    def score_aligned(
+        self,
+        symbols: np.ndarray,
+        news_data: Dict[str, List[str]],
+        concurrency: int = 16
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score risk for an array of symbols, returning arrays aligned to it.
+
+        Lets callers assign risk columns positionally without building an
+        intermediate DataFrame. Runs its own event loop, so call
+        ascore_portfolio_risks instead from async code.
+
+        Args:
+            symbols: Array of ticker symbols (e.g. portfolio['symbol'].to_numpy())
+            news_data: Dictionary mapping symbol -> list of news articles
+            concurrency: Maximum number of in-flight requests
+
+        Returns:
+            Tuple of (risk_scores float array, recommendations, key_risks)
+        """
+        risk_scores = asyncio.run(self._ascore_symbols(symbols, news_data, concurrency))
+
+        scores = np.fromiter((r['overall_risk_score'] for r in risk_scores), dtype=float, count=len(risk_scores))
+        recs = np.array([r['recommendation'] for r in risk_scores], dtype=object)
+        key_risks = np.array([r['key_risk'] for r in risk_scores], dtype=object)
+
+        return scores, recs, key_risks
+
+    async def _ascore_symbols(
+        self,
+        symbols,
+        news_data: Dict[str, List[str]],
+        concurrency: int,
+        return_prompt: bool = False
+    ) -> List[Dict]:
+        """Score symbols concurrently; results are in the same order as symbols."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # The async client's connection pool is tied to the running event loop,
+        # so open a fresh one per call (each asyncio.run() has its own loop).
+        # It stays local so overlapping calls on one scorer never share it.
+        async with AsyncOpenAI(api_key=self._api_key) as client:
+
+            async def score_one(symbol: str) -> Dict:
+                async with semaphore:
+                    return await self.ascore_stock_risk(
+                        symbol, news_data.get(symbol, []),
+                        return_prompt=return_prompt, client=client
+                    )
+
+            # gather preserves input order
+            return await asyncio.gather(*(score_one(symbol) for symbol in symbols))
+
+    def _score_symbols_batch_api(
+        self,
+        symbols,
+        news_data: Dict[str, List[str]],
+        max_articles: int = 5,
+        return_prompt: bool = False
+    ) -> List[Dict]:
+        """Score symbols through one Batch API job; results are in the same order as symbols."""
+        prompts = {}
+        for symbol in symbols:
+            if news_data.get(symbol):
+                prompts[symbol] = self._build_risk_prompt(symbol, news_data[symbol], max_articles)
+
+        responses = run_chat_batch(self.client, {
+            f"{symbol}:risk": {
+                'model': self.model,
+                'messages': self._risk_messages(prompt),
+                'temperature': 0.3,
+                'response_format': {'type': 'json_object'}
+            }
+            for symbol, prompt in prompts.items()
+        })
+
+        risk_scores = []
+        for symbol in symbols:
+            if symbol not in prompts:
+                result = self._default_risk(symbol, 'Insufficient news data', 'No recent news available for analysis')
+                if return_prompt:
+                    result['risk_prompt'] = self.NO_NEWS_PROMPT.format(symbol=symbol)
+                risk_scores.append(result)
+                continue
+
+            try:
+                result = _json_loads(responses[f"{symbol}:risk"])
+                result['symbol'] = symbol
+            except Exception as e:
+                logger.error(f"Error scoring risk for {symbol}: {e}")
+                result = self._default_risk(symbol, f'Error: {str(e)}', 'Error during analysis')
+
+            if return_prompt:
+                result['risk_prompt'] = prompts[symbol]
+            risk_scores.append(result)
+
+        return risk_scores
 
+    def _attach_risk_scores(self, portfolio: pd.DataFrame, risk_scores: List[Dict]) -> pd.DataFrame:
+        """Add risk columns (aligned with portfolio rows) and log high-risk names."""
         # Add risk scores to portfolio
         portfolio_with_risk = portfolio.copy()
         portfolio_with_risk['risk_score'] = [r['overall_risk_score'] for r in risk_scores]
@@ -282,7 +632,7 @@ Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
         if len(high_risk) > 0:
             logger.warning(f"⚠️  {len(high_risk)} high-risk stocks detected:")
             for _, stock in high_risk.iterrows():
-                logger.warning(f"  {stock['symbol']}: {stock['risk_score']:.2f} - {stock['key_risk']}")
+                logger.warning("  {}: {:.2f} - {}", stock['symbol'], stock['risk_score'], stock['key_risk'])
 
         return portfolio_with_risk
 
@@ -333,9 +683,8 @@ Note: Risk assessment defaulted to neutral (0.5) due to insufficient data."""
             old_weight = stock['original_weight_before_risk_adj']
             new_weight = stock['weight']
             logger.info(
-                f"  {stock['symbol']}: "
-                f"{old_weight:.2%} → {new_weight:.2%} "
-                f"(risk: {stock['risk_score']:.2f})"
+                "  {}: {:.2%} → {:.2%} (risk: {:.2f})",
+                stock['symbol'], old_weight, new_weight, stock['risk_score']
             )
 
         return adjusted
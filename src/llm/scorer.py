@@ -6,6 +6,7 @@ Uses LLM to score stocks based on news and momentum signals.
 import os
 import time
 import re
+import threading
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
@@ -13,6 +14,7 @@ from openai import OpenAI
 import yaml
 
 from .prompts import PromptTemplate
+from .batch_api import run_chat_batch
 
 
 class LLMScorer:
@@ -94,9 +96,10 @@ class LLMScorer:
         # Prompt template
         self.prompt_template = PromptTemplate()
 
-        # Rate limiting
+        # Rate limiting (locked so concurrent callers are still spaced out)
         self.last_request_time = 0
         self.min_request_interval = 0.1  # 100ms between requests
+        self._rate_lock = threading.Lock()
 
         logger.info(
             f"LLMScorer initialized: model={self.model}, "
@@ -114,17 +117,19 @@ class LLMScorer:
 
     def _rate_limit(self):
         """Enforce rate limiting between API calls."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.min_request_interval:
+                time.sleep(self.min_request_interval - elapsed)
+            self.last_request_time = time.time()
 
     def _call_llm(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.3,
-        max_tokens: int = 150
+        max_tokens: int = 150,
+        timeout: Optional[float] = None
     ) -> Optional[str]:
         """
         Call LLM API with retry logic.
@@ -134,12 +139,15 @@ class LLMScorer:
             system_prompt: System prompt (optional)
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            timeout: Request timeout in seconds (default: self.timeout)
 
         Returns:
             LLM response text or None on failure
         """
         if system_prompt is None:
             system_prompt = self.prompt_template.get_system_prompt()
+        if timeout is None:
+            timeout = self.timeout
 
         for attempt in range(self.max_retries):
             try:
@@ -155,7 +163,7 @@ class LLMScorer:
                     ],
                     temperature=temperature,
                     max_tokens=max_tokens,
-                    timeout=self.timeout
+                    timeout=timeout
                 )
 
                 # Extract response
@@ -299,7 +307,81 @@ class LLMScorer:
             Tuple of (raw_score, normalized_score, analysis_text)
             If return_prompt=True: (raw_score, normalized_score, analysis_text, prompt)
         """
-        # Format data
+        prompt = self._build_research_prompt(
+            symbol, news_summary, momentum_return, earnings_data, analyst_data
+        )
+
+        # Call LLM with higher max_tokens for analysis
+        logger.debug(f"Scoring {symbol} with research mode...")
+
+        # Longer timeout for research mode (passed per call so concurrent
+        # research requests don't race on self.timeout)
+        response = self._call_llm(prompt, temperature=0.3, max_tokens=500, timeout=60)
+
+        return self._research_result(symbol, response, prompt if return_prompt else None)
+
+    def score_research_batch(
+        self,
+        requests: List[Dict],
+        return_prompt: bool = False
+    ) -> Dict[str, Optional[Tuple[float, float, str]]]:
+        """
+        Score several stocks in research mode through one Batch API job.
+
+        Batch jobs cost half as much as synchronous calls but can take up
+        to 24h, so this is meant for scheduled runs.
+
+        Args:
+            requests: List of dicts with score_stock_with_research's keyword
+                      arguments (symbol, news_summary, momentum_return,
+                      earnings_data, analyst_data)
+            return_prompt: If True, also return the prompt in each result
+
+        Returns:
+            Dictionary mapping symbol -> same tuple as score_stock_with_research
+            (or None on failure)
+        """
+        prompts = {
+            request['symbol']: self._build_research_prompt(
+                request['symbol'],
+                request['news_summary'],
+                request.get('momentum_return'),
+                request.get('earnings_data'),
+                request.get('analyst_data')
+            )
+            for request in requests
+        }
+        system_prompt = self.prompt_template.get_system_prompt()
+
+        responses = run_chat_batch(self.client, {
+            f"{symbol}:research": {
+                'model': self.model,
+                'messages': [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                'temperature': 0.3,
+                'max_tokens': 500
+            }
+            for symbol, prompt in prompts.items()
+        })
+
+        return {
+            symbol: self._research_result(
+                symbol, responses[f"{symbol}:research"], prompt if return_prompt else None
+            )
+            for symbol, prompt in prompts.items()
+        }
+
+    def _build_research_prompt(
+        self,
+        symbol: str,
+        news_summary: str,
+        momentum_return: Optional[float],
+        earnings_data: Optional[Dict],
+        analyst_data: Optional[Dict]
+    ) -> str:
+        """Format earnings/analyst data and build the research prompt."""
         earnings_summary = None
         if earnings_data:
             earnings_summary = self.prompt_template.format_earnings_for_prompt(earnings_data)
@@ -308,8 +390,7 @@ class LLMScorer:
         if analyst_data:
             analyst_summary = self.prompt_template.format_analyst_data_for_prompt(analyst_data)
 
-        # Generate research prompt
-        prompt = self.prompt_template.research_prompt(
+        return self.prompt_template.research_prompt(
             symbol=symbol,
             news_summary=news_summary,
             momentum_return=momentum_return,
@@ -318,18 +399,13 @@ class LLMScorer:
             forecast_days=self.forecast_days
         )
 
-        # Call LLM with higher max_tokens for analysis
-        logger.debug(f"Scoring {symbol} with research mode...")
-
-        # Store original timeout and increase for research mode
-        original_timeout = self.timeout
-        self.timeout = 60  # Longer timeout for research mode
-
-        response = self._call_llm(prompt, temperature=0.3, max_tokens=500)
-
-        # Restore original timeout
-        self.timeout = original_timeout
-
+    def _research_result(
+        self,
+        symbol: str,
+        response: Optional[str],
+        prompt: Optional[str] = None
+    ) -> Optional[Tuple]:
+        """Parse a research response into (raw, normalized, analysis[, prompt])."""
         if response is None:
             logger.error(f"Failed to get LLM response for {symbol}")
             return None
@@ -350,7 +426,7 @@ class LLMScorer:
             f"analysis_length={len(analysis)} chars"
         )
 
-        if return_prompt:
+        if prompt is not None:
             return (raw_score, normalized_score, analysis, prompt)
         else:
             return (raw_score, normalized_score, analysis)
@@ -278,38 +278,44 @@ class EnhancedPortfolioConstructor(PortfolioConstructor):
             enable_hedging=enable_hedging
         )
 
-        # Apply exposure adjustment
-        adjusted_portfolio = portfolio.copy()
-        adjusted_portfolio['original_weight'] = adjusted_portfolio['weight']
+        exposure = adjustments['final_exposure']
+        regime_state = adjustments['regime'].state
 
         # Check if we should apply risk-weighted protection
-        has_risk_scores = 'risk_score' in adjusted_portfolio.columns
+        has_risk_scores = 'risk_score' in portfolio.columns
 
         if use_risk_weighting and has_risk_scores:
             logger.info("Applying risk-weighted protection (Option 3)...")
+            adjusted_portfolio = portfolio.copy()
+            adjusted_portfolio['original_weight'] = adjusted_portfolio['weight']
             adjusted_portfolio = self.calculate_risk_weighted_adjustment(
                 adjusted_portfolio,
-                market_exposure=adjustments['final_exposure']
+                market_exposure=exposure
             )
             protection_type = "Risk-Weighted"
         else:
-            # Standard uniform protection
-            adjusted_portfolio['weight'] = adjusted_portfolio['weight'] * adjustments['final_exposure']
+            # Standard uniform protection: a single scalar on the weight vector,
+            # so build the result in one assign instead of copy + column writes
+            weights = portfolio['weight'].to_numpy()
             protection_type = "Uniform"
+            adjusted_portfolio = portfolio.assign(
+                original_weight=weights,
+                weight=weights * exposure
+            )
 
         # Calculate cash position
         cash_position = 1.0 - adjusted_portfolio['weight'].sum()
 
         logger.info(
             f"Volatility protection applied ({protection_type}): "
-            f"regime={adjustments['regime'].state}, "
-            f"base_exposure={adjustments['final_exposure']:.1%}, "
+            f"regime={regime_state}, "
+            f"base_exposure={exposure:.1%}, "
             f"cash={cash_position:.1%}"
         )
 
         # Add protection metadata
-        adjusted_portfolio['protection_regime'] = adjustments['regime'].state
-        adjusted_portfolio['protection_exposure'] = adjustments['final_exposure']
+        adjusted_portfolio['protection_regime'] = regime_state
+        adjusted_portfolio['protection_exposure'] = exposure
         adjusted_portfolio['protection_type'] = protection_type
 
         return adjusted_portfolio, adjustments
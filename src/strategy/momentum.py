@@ -88,55 +88,54 @@ class MomentumCalculator:
                 price_df.index = pd.to_datetime(price_df.index)
 
             # Sort by date
-            price_df = price_df.sort_index()
+            if not price_df.index.is_monotonic_increasing:
+                price_df = price_df.sort_index()
 
-            # Determine end date
+            dates = price_df.index
+
+            # Determine end date (n = number of rows on or before end_date)
             if end_date is None:
-                end_date = price_df.index[-1]
+                n = len(dates)
             else:
                 # Ensure end_date is timezone-aware if price_df.index is timezone-aware
-                if price_df.index.tz is not None:
+                if dates.tz is not None:
                     # Make end_date timezone-aware to match price_df.index
                     if not hasattr(end_date, 'tz') or end_date.tz is None:
-                        end_date = pd.to_datetime(end_date).tz_localize(price_df.index.tz)
+                        end_date = pd.to_datetime(end_date).tz_localize(dates.tz)
                     else:
-                        end_date = end_date.tz_convert(price_df.index.tz)
+                        end_date = end_date.tz_convert(dates.tz)
 
                 # Get data up to end_date
-                price_df = price_df[price_df.index <= end_date]
+                n = dates.searchsorted(end_date, side='right')
 
-            if len(price_df) == 0:
+            if n == 0:
                 return None
 
-            # Calculate momentum end date (exclude recent month if configured)
+            # Calculate momentum end position (exclude recent month if configured)
             if exclude_recent_month:
                 # Skip most recent month (~21 trading days)
-                # Get the date 21 trading days before end_date
-                if len(price_df) < 22:
+                if n < 22:
                     return None
-                momentum_end_idx = -22
-                momentum_end = price_df.index[momentum_end_idx]
+                n_before_end = n - 21
             else:
-                momentum_end = price_df.index[-1]
+                n_before_end = n
 
-            # Calculate momentum start date (lookback_months before momentum_end)
+            # Calculate momentum start (lookback_months before momentum_end)
             # Approximate: 21 trading days per month
             lookback_days = lookback_months * 21
 
-            # Get data before momentum_end
-            data_before_end = price_df[price_df.index <= momentum_end]
+            closes = price_df['adjusted_close'].to_numpy()
 
-            if len(data_before_end) < lookback_days:
+            if n_before_end < lookback_days:
                 # Not enough history, use what we have
-                if len(data_before_end) < 21:  # Need at least 1 month
+                if n_before_end < 21:  # Need at least 1 month
                     return None
-                start_price = data_before_end['adjusted_close'].iloc[0]
+                start_price = closes[0]
             else:
                 # Get price from lookback_days ago
-                start_idx = len(data_before_end) - lookback_days
-                start_price = data_before_end['adjusted_close'].iloc[start_idx]
+                start_price = closes[n_before_end - lookback_days]
 
-            end_price = data_before_end['adjusted_close'].iloc[-1]
+            end_price = closes[n_before_end - 1]
 
             # Calculate return
             if start_price <= 0 or end_price <= 0:
@@ -20,6 +20,46 @@ from typing import Dict, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+try:
+    import numba  # noqa: F401  (only needed as the pandas rolling engine)
+    _ROLLING_ENGINE = 'numba'
+except ImportError:
+    _ROLLING_ENGINE = None  # pandas' default Cython kernels
+
+
+def _rolling_std(series: pd.Series, window: int) -> pd.Series:
+    """Rolling sample std, JIT-compiled by numba when it is installed"""
+    if _ROLLING_ENGINE is None:
+        return series.rolling(window).std()
+    # First call pays a one-time compile; pandas caches the kernel afterwards
+    return series.rolling(window).std(engine=_ROLLING_ENGINE, engine_kwargs={'nopython': True})
+
+
+def _step_above(value: float, steps, default: float = 0.0) -> float:
+    """Value of the first (threshold, value) step with value > threshold"""
+    for threshold, step_value in steps:
+        if value > threshold:
+            return step_value
+    return default
+
+
+def _step_below(value: float, steps, default: float = 0.0) -> float:
+    """Value of the first (threshold, value) step with value < threshold"""
+    for threshold, step_value in steps:
+        if value < threshold:
+            return step_value
+    return default
+
+
+def _steps_above_array(values: np.ndarray, steps, default: float = 0.0) -> np.ndarray:
+    """Vectorized _step_above"""
+    return np.select([values > t for t, _ in steps], [v for _, v in steps], default=default)
+
+
+def _steps_below_array(values: np.ndarray, steps, default: float = 0.0) -> np.ndarray:
+    """Vectorized _step_below"""
+    return np.select([values < t for t, _ in steps], [v for _, v in steps], default=default)
+
 
 @dataclass
 class MarketRegime:
@@ -41,6 +81,36 @@ class VolatilityProtection:
     - Crash risk indicators
     - Adaptive rebalancing frequency
     """
+
+    # Thresholds shared by the per-date methods and calculate_combined_adjustment_batch.
+    # Step tables are (threshold, value) pairs checked in order; the first match wins.
+
+    # Volatility scalar: realized vol floor and (min, max) cap on the scalar
+    MIN_REALIZED_VOL = 0.01
+    VOL_SCALAR_BOUNDS = (0.25, 2.0)
+
+    # Trend vs the 200-day MA, and the VIX ceiling for a bull regime
+    TREND_UP_RATIO = 1.02
+    TREND_DOWN_RATIO = 0.98
+    BULL_VIX_MAX = 20
+
+    # Exposure multiplier per regime (bull keeps full exposure)
+    REGIME_MULTIPLIERS = {"panic": 0.25, "bear": 0.50, "volatile": 0.60, "normal": 0.85}
+
+    # Crash score points: drawdowns below / VIX and vol above the threshold
+    CRASH_DRAWDOWN_STEPS = ((-0.15, 0.30), (-0.10, 0.15))
+    CRASH_VIX_STEPS = ((40, 0.30), (35, 0.20), (30, 0.10))
+    CRASH_MOM_DRAWDOWN_STEPS = ((-0.10, 0.25), (-0.05, 0.15))
+    CRASH_VOL_STEPS = ((0.40, 0.15),)  # 40% annualized vol
+    CRASH_RISK_THRESHOLD = 0.50
+
+    # Position multiplier for crash scores above each threshold
+    CRASH_ADJUSTMENT_TIERS = ((0.75, 0.10), (0.60, 0.25), (0.50, 0.50), (0.35, 0.70))
+
+    # Rebalance daily above this crash score or VIX, weekly above this VIX
+    DAILY_REBALANCE_CRASH_SCORE = 0.60
+    DAILY_REBALANCE_VIX = 40
+    WEEKLY_REBALANCE_VIX = 30
     
     def __init__(
         self,
@@ -117,14 +187,14 @@ class VolatilityProtection:
         realized_vol = recent_returns.std() * np.sqrt(252)
         
         # Avoid division by zero
-        if realized_vol < 0.01:
-            realized_vol = 0.01
+        if realized_vol < self.MIN_REALIZED_VOL:
+            realized_vol = self.MIN_REALIZED_VOL
             
         # Calculate scalar
         scalar = self.target_volatility / realized_vol
         
         # Cap scalar between 0.25 and 2.0
-        scalar = np.clip(scalar, 0.25, 2.0)
+        scalar = np.clip(scalar, *self.VOL_SCALAR_BOUNDS)
         
         return scalar
     
@@ -155,6 +225,15 @@ class VolatilityProtection:
         Returns:
             MarketRegime object with classification
         """
+        trend, recent_vol = self._market_trend(spy_prices, current_date)
+        return self._classify_regime(trend, vix_level, recent_vol)
+
+    def _market_trend(
+        self,
+        spy_prices: pd.Series,
+        current_date: datetime
+    ) -> Tuple[str, float]:
+        """Trend vs the 200-day MA and recent realized volatility (VIX-independent)"""
         # Calculate 200-day moving average
         ma_200 = spy_prices.rolling(window=200).mean()
         current_price = spy_prices[current_date]
@@ -165,15 +244,17 @@ class VolatilityProtection:
         recent_vol = returns.tail(21).std() * np.sqrt(252)
         
         # Determine trend
-        if current_price > current_ma * 1.02:
+        if current_price > current_ma * self.TREND_UP_RATIO:
             trend = "up"
-        elif current_price < current_ma * 0.98:
+        elif current_price < current_ma * self.TREND_DOWN_RATIO:
             trend = "down"
         else:
             trend = "neutral"
-            
+        return trend, recent_vol
+
+    def _classify_regime(self, trend: str, vix_level: float, recent_vol: float) -> MarketRegime:
+        """Classify the regime from the market trend and VIX level"""
         # Calculate momentum beta (simplified)
-        market_returns = returns.tail(60)
         momentum_beta = 1.0  # Simplified; in practice, calculate from portfolio
         
         # Classify regime
@@ -181,7 +262,7 @@ class VolatilityProtection:
             state = "panic"
         elif vix_level > self.vix_threshold_high:
             state = "bear" if trend == "down" else "volatile"
-        elif trend == "up" and vix_level < 20:
+        elif trend == "up" and vix_level < self.BULL_VIX_MAX:
             state = "bull"
         elif trend == "down":
             state = "bear"
@@ -206,16 +287,8 @@ class VolatilityProtection:
         Returns:
             Exposure multiplier (0.0 to 1.0)
         """
-        if regime.state == "panic":
-            return 0.25  # 75% reduction
-        elif regime.state == "bear":
-            return 0.50  # 50% reduction
-        elif regime.state == "volatile":
-            return 0.60  # 40% reduction
-        elif regime.state == "normal":
-            return 0.85  # 15% reduction
-        else:  # bull
-            return 1.00  # Full exposure
+        # panic -75%, bear -50%, volatile -40%, normal -15%, bull full exposure
+        return self.REGIME_MULTIPLIERS.get(regime.state, 1.00)
     
     # ========================================================================
     # ENHANCEMENT 3: CRASH INDICATOR
@@ -246,45 +319,59 @@ class VolatilityProtection:
         Returns:
             Tuple of (is_crash_risk: bool, risk_score: float [0-1])
         """
-        risk_score = 0.0
-        
-        # Signal 1: Market drawdown from recent high
+        drawdown, mom_drawdown, recent_vol = self._crash_features(
+            spy_returns, momentum_returns, current_date
+        )
+        return self._score_crash_risk(drawdown, vix_level, mom_drawdown, recent_vol)
+
+    def _crash_features(
+        self,
+        spy_returns: pd.Series,
+        momentum_returns: pd.Series,
+        current_date: datetime
+    ) -> Tuple[float, float, float]:
+        """Market drawdown, momentum drawdown and recent vol (VIX-independent)"""
+        # Signal 1 input: Market drawdown from recent high
         spy_prices = (1 + spy_returns).cumprod()
         recent_high = spy_prices.tail(60).max()
         current_price = spy_prices[current_date]
         drawdown = (current_price - recent_high) / recent_high
+
+        # Signal 3 input: Momentum strategy drawdown
+        mom_cumulative = (1 + momentum_returns).cumprod()
+        mom_recent_high = mom_cumulative.tail(60).max()
+        # Strategy returns may only run through the prior session
+        mom_current = mom_cumulative.asof(current_date)
+        mom_drawdown = (mom_current - mom_recent_high) / mom_recent_high
+
+        # Signal 4 input: Recent market volatility
+        recent_vol = spy_returns.tail(21).std() * np.sqrt(252)
+        return drawdown, mom_drawdown, recent_vol
+
+    def _score_crash_risk(
+        self,
+        drawdown: float,
+        vix_level: float,
+        mom_drawdown: float,
+        recent_vol: float
+    ) -> Tuple[bool, float]:
+        """Combine the crash signals into (is_crash_risk, risk_score)"""
+        risk_score = 0.0
         
-        if drawdown < -0.15:
-            risk_score += 0.30
-        elif drawdown < -0.10:
-            risk_score += 0.15
+        # Signal 1: Market drawdown from recent high
+        risk_score += _step_below(drawdown, self.CRASH_DRAWDOWN_STEPS)
             
         # Signal 2: VIX spike
-        if vix_level > 40:
-            risk_score += 0.30
-        elif vix_level > 35:
-            risk_score += 0.20
-        elif vix_level > 30:
-            risk_score += 0.10
+        risk_score += _step_above(vix_level, self.CRASH_VIX_STEPS)
             
         # Signal 3: Momentum strategy drawdown
-        mom_cumulative = (1 + momentum_returns).cumprod()
-        mom_recent_high = mom_cumulative.tail(60).max()
-        mom_current = mom_cumulative[current_date]
-        mom_drawdown = (mom_current - mom_recent_high) / mom_recent_high
-        
-        if mom_drawdown < -0.10:
-            risk_score += 0.25
-        elif mom_drawdown < -0.05:
-            risk_score += 0.15
+        risk_score += _step_below(mom_drawdown, self.CRASH_MOM_DRAWDOWN_STEPS)
             
         # Signal 4: Volatility spike
-        recent_vol = spy_returns.tail(21).std() * np.sqrt(252)
-        if recent_vol > 0.40:  # 40% annualized vol
-            risk_score += 0.15
+        risk_score += _step_above(recent_vol, self.CRASH_VOL_STEPS)
             
         # Determine if crash risk is elevated
-        is_crash_risk = risk_score > 0.50
+        is_crash_risk = risk_score > self.CRASH_RISK_THRESHOLD
         
         return is_crash_risk, min(risk_score, 1.0)
     
@@ -298,16 +385,8 @@ class VolatilityProtection:
         Returns:
             Position multiplier (0.0 to 1.0)
         """
-        if risk_score > 0.75:
-            return 0.10  # Exit almost completely
-        elif risk_score > 0.60:
-            return 0.25  # Reduce to 25%
-        elif risk_score > 0.50:
-            return 0.50  # Reduce to 50%
-        elif risk_score > 0.35:
-            return 0.70  # Reduce to 70%
-        else:
-            return 1.00  # No adjustment
+        # From "exit almost completely" (0.10) down to no adjustment (1.00)
+        return _step_above(risk_score, self.CRASH_ADJUSTMENT_TIERS, default=1.00)
     
     # ========================================================================
     # ENHANCEMENT 4: DYNAMIC REBALANCING FREQUENCY
@@ -336,11 +415,11 @@ class VolatilityProtection:
             Rebalancing frequency: "daily", "weekly", or "monthly"
         """
         # Panic conditions: Daily rebalancing
-        if crash_risk_score > 0.60 or vix_level > 40:
+        if crash_risk_score > self.DAILY_REBALANCE_CRASH_SCORE or vix_level > self.DAILY_REBALANCE_VIX:
             return "daily"
         
         # High volatility: Weekly rebalancing
-        elif regime.state in ["panic", "volatile"] or vix_level > 30:
+        elif regime.state in ["panic", "volatile"] or vix_level > self.WEEKLY_REBALANCE_VIX:
             return "weekly"
         
         # Normal conditions: Monthly rebalancing
@@ -428,16 +507,77 @@ class VolatilityProtection:
                 'recommendation': str
             }
         """
+        features = self.precompute_market_features(
+            spy_prices, spy_returns, momentum_returns, current_date
+        )
+        return self.calculate_adjustment_from_features(features, vix_level, enable_hedging)
+
+    def precompute_market_features(
+        self,
+        spy_prices: pd.Series,
+        spy_returns: pd.Series,
+        momentum_returns: pd.Series,
+        current_date: datetime
+    ) -> Dict:
+        """
+        Compute the VIX-independent inputs to the combined adjustment.
+
+        Everything except the VIX level is a function of the price/return
+        history, so scenarios that only vary VIX can compute this once and
+        call calculate_adjustment_from_features for each level.
+
+        Args:
+            spy_prices: SPY price series
+            spy_returns: SPY returns series
+            momentum_returns: Momentum strategy returns
+            current_date: Current date
+
+        Returns:
+            Dictionary of market features for calculate_adjustment_from_features
+        """
+        trend, regime_vol = self._market_trend(spy_prices, current_date)
+        drawdown, mom_drawdown, recent_vol = self._crash_features(
+            spy_returns, momentum_returns, current_date
+        )
+        return {
+            'volatility_scalar': self.calculate_volatility_scalar(spy_returns, current_date),
+            'market_trend': trend,
+            'regime_volatility': regime_vol,
+            'market_drawdown': drawdown,
+            'momentum_drawdown': mom_drawdown,
+            'recent_volatility': recent_vol,
+        }
+
+    def calculate_adjustment_from_features(
+        self,
+        features: Dict,
+        vix_level: float,
+        enable_hedging: bool = False
+    ) -> Dict:
+        """
+        Combine precomputed market features with a VIX level.
+
+        Args:
+            features: Output of precompute_market_features
+            vix_level: Current VIX level
+            enable_hedging: Whether to enable short hedging
+
+        Returns:
+            Same dictionary as calculate_combined_adjustment
+        """
         # 1. Volatility scaling
-        vol_scalar = self.calculate_volatility_scalar(spy_returns, current_date)
+        vol_scalar = features['volatility_scalar']
         
         # 2. Market regime
-        regime = self.detect_market_regime(spy_prices, vix_level, current_date)
+        regime = self._classify_regime(
+            features['market_trend'], vix_level, features['regime_volatility']
+        )
         regime_mult = self.get_regime_exposure_multiplier(regime)
         
         # 3. Crash risk
-        is_crash_risk, crash_score = self.detect_crash_risk(
-            spy_returns, vix_level, momentum_returns, current_date
+        is_crash_risk, crash_score = self._score_crash_risk(
+            features['market_drawdown'], vix_level,
+            features['momentum_drawdown'], features['recent_volatility']
         )
         crash_adj = self.get_crash_risk_adjustment(crash_score)
         
@@ -480,6 +620,150 @@ class VolatilityProtection:
             'recommendation': recommendation
         }
 
+    def calculate_combined_adjustment_batch(
+        self,
+        spy_prices: pd.Series,
+        spy_returns: pd.Series,
+        vix: pd.Series,
+        strategy_returns: Optional[pd.Series] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate combined adjustments for every date at once.
+
+        Produces the same exposures as calling calculate_combined_adjustment
+        day by day with the history up to each date, but computes the rolling
+        windows in bulk instead of re-slicing the series on every call.
+
+        The momentum drawdown crash signal is path dependent: it is tracked on
+        the protected strategy itself (strategy_returns scaled by the exposure
+        already applied), through the prior session. That part runs as one
+        sequential pass over plain floats. If strategy_returns is None the
+        signal is skipped.
+
+        Until lookback_days of history exist the exposure is left at 1.0.
+
+        Args:
+            spy_prices: SPY price series
+            spy_returns: SPY returns series (same index as spy_prices)
+            vix: VIX levels aligned with spy_prices
+            strategy_returns: Unprotected strategy returns aligned with spy_prices
+
+        Returns:
+            DataFrame indexed like spy_prices with columns volatility_scalar,
+            regime, regime_multiplier, crash_risk, crash_risk_score,
+            crash_adjustment, rebalancing_frequency and final_exposure
+        """
+        index = spy_prices.index
+        n = len(index)
+        vix = np.asarray(vix, dtype=np.float64)
+        prices = spy_prices.to_numpy(dtype=np.float64, copy=False)
+
+        # 1. Volatility scaling (window ends the day before each date)
+        realized_vol = (
+            _rolling_std(spy_returns, self.lookback_days).shift(1).to_numpy() * np.sqrt(252)
+        )
+        vol_scalar = np.clip(
+            self.target_volatility / np.maximum(realized_vol, self.MIN_REALIZED_VOL),
+            *self.VOL_SCALAR_BOUNDS
+        )
+
+        # 2. Market regime
+        ma_200 = spy_prices.rolling(window=200).mean().to_numpy()
+        trend_up = prices > ma_200 * self.TREND_UP_RATIO
+        trend_down = prices < ma_200 * self.TREND_DOWN_RATIO
+        regime = np.select(
+            [
+                vix > self.vix_threshold_panic,
+                (vix > self.vix_threshold_high) & trend_down,
+                vix > self.vix_threshold_high,
+                trend_up & (vix < self.BULL_VIX_MAX),
+                trend_down,
+            ],
+            ["panic", "bear", "volatile", "bull", "bear"],
+            default="normal"
+        )
+        regime_mult = np.select(
+            [regime == state for state in self.REGIME_MULTIPLIERS],
+            list(self.REGIME_MULTIPLIERS.values()),
+            default=1.00
+        )
+
+        # 3. Crash risk signals that depend only on market data
+        spy_cumulative = (1 + spy_returns).cumprod()
+        recent_high = spy_cumulative.rolling(60, min_periods=1).max().to_numpy()
+        spy_cumulative = spy_cumulative.to_numpy()
+        drawdown = (spy_cumulative - recent_high) / recent_high
+        recent_vol = _rolling_std(spy_returns, 21).to_numpy() * np.sqrt(252)
+
+        # Summed in the same order as _score_crash_risk (drawdown, VIX,
+        # momentum drawdown, vol) so threshold checks see identical floats
+        market_score = (
+            _steps_below_array(drawdown, self.CRASH_DRAWDOWN_STEPS)
+            + _steps_above_array(vix, self.CRASH_VIX_STEPS)
+        )
+        vol_points = _steps_above_array(recent_vol, self.CRASH_VOL_STEPS)
+
+        base_exposure = np.minimum(vol_scalar, regime_mult)
+        warmup = min(self.lookback_days, n)
+
+        if strategy_returns is None:
+            risk_score = market_score + vol_points
+            crash_score = np.minimum(risk_score, 1.0)
+            crash_adj = self._crash_adjustment_array(crash_score)
+            final_exposure = np.minimum(base_exposure, crash_adj)
+        else:
+            # Momentum drawdown uses the protected strategy's own cumulative
+            # value, so each exposure depends on the ones before it
+            raw_returns = strategy_returns.to_numpy(dtype=np.float64, copy=False).tolist()
+            base_list = base_exposure.tolist()
+            score_list = market_score.tolist()
+            vol_list = vol_points.tolist()
+            final_exposure = np.ones(n)
+            mom_cumulative = []
+            value = 1.0
+            for i in range(n):
+                mom_points = 0.0
+                if i >= warmup:
+                    mom_recent_high = max(mom_cumulative[max(0, i - 60):i])
+                    mom_drawdown = (mom_cumulative[i - 1] - mom_recent_high) / mom_recent_high
+                    mom_points = _step_below(mom_drawdown, self.CRASH_MOM_DRAWDOWN_STEPS)
+                score_list[i] = score_list[i] + mom_points + vol_list[i]
+                if i >= warmup:
+                    score = min(score_list[i], 1.0)
+                    final_exposure[i] = min(base_list[i], self.get_crash_risk_adjustment(score))
+                value *= 1 + raw_returns[i] * final_exposure[i]
+                mom_cumulative.append(value)
+            risk_score = np.asarray(score_list)
+            crash_score = np.minimum(risk_score, 1.0)
+            crash_adj = self._crash_adjustment_array(crash_score)
+
+        final_exposure[:warmup] = 1.0
+
+        # 4. Rebalancing frequency
+        rebal_freq = np.select(
+            [
+                (crash_score > self.DAILY_REBALANCE_CRASH_SCORE) | (vix > self.DAILY_REBALANCE_VIX),
+                np.isin(regime, ["panic", "volatile"]) | (vix > self.WEEKLY_REBALANCE_VIX),
+            ],
+            ["daily", "weekly"],
+            default="monthly"
+        )
+
+        return pd.DataFrame({
+            'volatility_scalar': vol_scalar,
+            'regime': regime,
+            'regime_multiplier': regime_mult,
+            'crash_risk': risk_score > self.CRASH_RISK_THRESHOLD,
+            'crash_risk_score': crash_score,
+            'crash_adjustment': crash_adj,
+            'rebalancing_frequency': rebal_freq,
+            'final_exposure': final_exposure,
+        }, index=index)
+
+    def _crash_adjustment_array(self, risk_score: np.ndarray) -> np.ndarray:
+        """Vectorized get_crash_risk_adjustment"""
+        return _steps_above_array(risk_score, self.CRASH_ADJUSTMENT_TIERS, default=1.00)
+
 
 # ============================================================================
 # EXAMPLE USAGE
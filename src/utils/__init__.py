@@ -3,9 +3,13 @@ from .justification import (
     add_ranking_explanations,
     generate_portfolio_summary
 )
+from .returns import fast_pct_change
+from .csv_writer import write_csv
 
 __all__ = [
     "generate_stock_justification",
     "add_ranking_explanations",
-    "generate_portfolio_summary"
+    "generate_portfolio_summary",
+    "fast_pct_change",
+    "write_csv"
 ]
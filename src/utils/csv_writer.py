@@ -0,0 +1,37 @@
+"""
+CSV Writer
+
+Writes DataFrames with pyarrow's multithreaded CSV writer when available,
+falling back to pandas.to_csv.
+"""
+
+from pathlib import Path
+from typing import Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+
+def write_csv(df: pd.DataFrame, path: Union[str, Path]) -> None:
+    """
+    Write a DataFrame to CSV without the index.
+
+    Args:
+        df: DataFrame to write
+        path: Output file path
+    """
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pacsv.write_csv(table, str(path), write_options=pacsv.WriteOptions(include_header=True))
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Mixed-type object columns etc. - let pandas handle them
+            pass
+
+    df.to_csv(path, index=False)
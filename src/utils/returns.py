@@ -0,0 +1,56 @@
+"""
+Return Calculation Helpers
+
+Array-level kernels for turning price series into simple returns.
+Uses numba when available and falls back to plain NumPy otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _pct_change_numpy(prices: np.ndarray) -> np.ndarray:
+    prices = np.asarray(prices, dtype=np.float64)
+    returns = np.zeros(prices.shape[0], dtype=np.float32)
+    if prices.shape[0] > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw = np.diff(prices) / prices[:-1]
+        returns[1:] = np.where(np.isfinite(raw), raw, 0.0)
+    return returns
+
+
+if njit is not None:
+    # No fastmath: it assumes no NaN/inf, which would break the check below
+    @njit(cache=True)
+    def _pct_change_numba(prices):
+        n = prices.shape[0]
+        returns = np.zeros(n, dtype=np.float32)
+        for i in range(1, n):
+            prev = prices[i - 1]
+            ret = (prices[i] - prev) / prev if prev != 0.0 else 0.0
+            # NaN != NaN; also drops +/-inf from zero or missing prices
+            if ret == ret and abs(ret) != np.inf:
+                returns[i] = ret
+        return returns
+
+
+def fast_pct_change(prices: np.ndarray) -> np.ndarray:
+    """
+    Simple returns of a 1-D price array as float32.
+
+    Equivalent to ``pd.Series(prices).pct_change().fillna(0)`` with
+    non-finite values (from zero or missing prices) replaced by 0.
+
+    Args:
+        prices: 1-D array of prices
+
+    Returns:
+        float32 array of returns, same length as prices (first element 0)
+    """
+    if njit is not None:
+        return _pct_change_numba(np.ascontiguousarray(prices, dtype=np.float64))
+    return _pct_change_numpy(prices)
@@ -4,6 +4,7 @@ Robinhood Export Utility
 Exports portfolio recommendations in a format optimized for manual trading on Robinhood.
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -59,10 +60,11 @@ def export_for_robinhood(
         selected_stocks['shares_to_buy'] = None
         selected_stocks['actual_cost'] = None
     else:
-        # Calculate shares to buy (rounded down to avoid overspending)
-        selected_stocks['shares_to_buy'] = (
+        # Calculate shares to buy (rounded down to avoid overspending);
+        # nullable Int64 keeps missing prices as <NA> without a per-row apply
+        selected_stocks['shares_to_buy'] = np.floor(
             selected_stocks['dollar_amount'] / selected_stocks['current_price']
-        ).apply(lambda x: int(x) if pd.notna(x) else None)
+        ).astype('Int64')
 
         # Calculate actual cost
         selected_stocks['actual_cost'] = (
@@ -332,18 +334,25 @@ def calculate_rebalancing_trades(
         target_portfolio['weight'] / target_portfolio['weight'].sum()
     )
 
-    # Get stock sets
-    target_stocks = set(target_portfolio['symbol'].values)
-    current_stocks = set(current_holdings['symbol'].values)
+    # Get stock sets (pd.Index set-ops: C-level, sorted, de-duplicated)
+    target_stocks = pd.Index(target_portfolio['symbol']).unique()
+    current_stocks = pd.Index(current_holdings['symbol']).unique()
 
     # Stocks to sell (in current but not in target)
-    to_sell = current_stocks - target_stocks
+    to_sell = current_stocks.difference(target_stocks)
 
     # Stocks to buy (in target but not in current)
-    to_buy = target_stocks - current_stocks
+    to_buy = target_stocks.difference(current_stocks)
 
     # Stocks to hold (in both)
-    to_hold = current_stocks & target_stocks
+    to_hold = current_stocks.intersection(target_stocks)
+
+    # Index both frames by symbol once so per-symbol lookups are hash hits
+    # rather than a boolean scan of the whole frame (first row wins on duplicates)
+    current_by_symbol = current_holdings.drop_duplicates('symbol').set_index('symbol')
+    target_unique = target_portfolio.drop_duplicates('symbol')
+    target_rank = pd.Series(target_unique.index, index=target_unique['symbol'])
+    target_by_symbol = target_unique.set_index('symbol')
 
     # Create trades list
     trades = []
@@ -353,7 +362,7 @@ def calculate_rebalancing_trades(
 
     # Add sells
     for symbol in to_sell:
-        current_row = current_holdings[current_holdings['symbol'] == symbol].iloc[0]
+        current_row = current_by_symbol.loc[symbol]
         sell_value = current_row['current_value']
         total_sell_proceeds += sell_value
 
@@ -375,8 +384,8 @@ def calculate_rebalancing_trades(
     rebalance_buys = []
 
     for symbol in to_hold:
-        current_row = current_holdings[current_holdings['symbol'] == symbol].iloc[0]
-        target_row = target_portfolio[target_portfolio['symbol'] == symbol].iloc[0]
+        current_row = current_by_symbol.loc[symbol]
+        target_row = target_by_symbol.loc[symbol]
 
         current_weight = current_row['current_weight']
         target_weight = target_row['target_weight']
@@ -414,7 +423,7 @@ def calculate_rebalancing_trades(
 
     # Add new buys
     for symbol in to_buy:
-        target_row = target_portfolio[target_portfolio['symbol'] == symbol].iloc[0]
+        target_row = target_by_symbol.loc[symbol]
         target_weight = target_row['target_weight']
         target_value = target_weight * total_portfolio_value
 
@@ -427,7 +436,7 @@ def calculate_rebalancing_trades(
             'Target_Weight_%': target_weight * 100,
             'Amount_to_Buy_$': target_value,
             'Reason': f'New entry to top {num_stocks}',
-            'Rank': int(target_row.name) + 1  # Portfolio rank
+            'Rank': int(target_rank[symbol]) + 1  # Portfolio rank
         })
 
     # Combine all trades